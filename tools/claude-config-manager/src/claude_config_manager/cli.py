@@ -3,9 +3,53 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
+if TYPE_CHECKING:
+    from .core import ConfigManager
+    from .core.batch import TargetResult
+    from .core.models import ProfileConfig
+    from .core.planner import Plan
+
+
+def _skill_store(ctx: click.Context):
+    """The skill store selected with --store, or None to copy skills."""
+    from .core.copier import CopyEngine
+    from .core.skill_store import SkillStore
+
+    mode = ctx.obj["store"]
+    if mode == "off":
+        return None
+    if "skill_store" not in ctx.obj:
+        ctx.obj["skill_store"] = SkillStore(
+            link_mode=mode, engine=CopyEngine(ctx.obj["workers"], "auto")
+        )
+    return ctx.obj["skill_store"]
+
+
+def _target_config(ctx: click.Context, target: Path) -> ConfigManager:
+    """An import target configured with the global copy and store options."""
+    from .core import ConfigManager
+
+    return ConfigManager(
+        target,
+        workers=ctx.obj["workers"],
+        copy_strategy=ctx.obj["copy_strategy"],
+        skill_store=_skill_store(ctx),
+    )
+
+
+def _check_profile(ctx: click.Context, param: click.Parameter, value: str | None) -> str | None:
+    """Reject profile names that are not in the catalog."""
+    from .core import ProfileManager
+
+    if value is not None and ProfileManager.shared().get_profile(value) is None:
+        names = ", ".join(ProfileManager.shared().list_profiles())
+        raise click.BadParameter(f"unknown profile '{value}' (available: {names})")
+    return value
+
 
 @click.group(invoke_without_command=True)
 @click.option(
@@ -15,11 +59,44 @@ import click
     default=None,
     help="Source configuration directory (default: current directory)",
 )
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="CCM_WORKERS",
+    help="Number of concurrent file copies (default: based on CPU count)",
+)
+@click.option(
+    "--copy-strategy",
+    type=click.Choice(["auto", "hardlink", "copy"]),
+    default="auto",
+    envvar="CCM_COPY_STRATEGY",
+    help="How files are copied: auto (reflink, copy_file_range, copy), "
+    "hardlink (read-only skill trees) or copy",
+)
+@click.option(
+    "--store",
+    type=click.Choice(["off", "hardlink", "symlink"]),
+    default="off",
+    envvar="CCM_STORE",
+    help="Link imported skills from the global skill store as hard links or "
+    "symlinks instead of copying them (see 'ccm store')",
+)
 @click.pass_context
-def main(ctx: click.Context, source: Path | None) -> None:
+def main(
+    ctx: click.Context,
+    source: Path | None,
+    workers: int | None,
+    copy_strategy: str,
+    store: str,
+) -> None:
     """Claude Config Manager - TUI tool for managing Claude Code configurations."""
     ctx.ensure_object(dict)
     ctx.obj["source"] = source or Path.cwd()
+    ctx.obj["workers"] = workers
+    ctx.obj["copy_strategy"] = copy_strategy
+    ctx.obj["store"] = store
 
     if ctx.invoked_subcommand is None:
         # Launch TUI if no subcommand
@@ -34,13 +111,28 @@ def main(ctx: click.Context, source: Path | None) -> None:
     "--target",
     "-t",
     type=click.Path(file_okay=False, path_type=Path),
-    required=True,
+    default=None,
     help="Target directory for new project",
 )
+@click.option(
+    "--manifest",
+    "-m",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="YAML or JSON manifest listing many projects to create",
+)
+@click.option(
+    "--parallel",
+    "-P",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of projects created concurrently with --manifest",
+)
 @click.option(
     "--profile",
     "-p",
-    type=click.Choice(["full", "frontend", "backend", "algorithm"]),
+    callback=_check_profile,
     default="full",
     help="Configuration profile to use",
 )
@@ -49,14 +141,34 @@ def main(ctx: click.Context, source: Path | None) -> None:
     default=False,
     help="Initialize git repository",
 )
+@click.option(
+    "--commit",
+    is_flag=True,
+    help="Also commit the generated files (implies --git)",
+)
 @click.pass_context
-def create(ctx: click.Context, target: Path, profile: str, git: bool) -> None:
-    """Create a new project with Claude Code configuration."""
+def create(
+    ctx: click.Context,
+    target: Path | None,
+    manifest: Path | None,
+    parallel: int,
+    profile: str,
+    git: bool,
+    commit: bool,
+) -> None:
+    """Create a new project, or every project of a --manifest."""
     from .core import ConfigManager, ProfileManager
 
+    if (target is None) == (manifest is None):
+        raise click.UsageError("Use either --target or --manifest")
+
     source = ctx.obj["source"]
-    config_manager = ConfigManager(source)
-    profile_manager = ProfileManager()
+    config_manager = ConfigManager(source, workers=ctx.obj["workers"])
+    profile_manager = ProfileManager.shared()
+
+    if manifest is not None:
+        _create_from_manifest(ctx, config_manager, manifest, parallel)
+        return
 
     click.echo(f"Creating new project at {target} with profile '{profile}'...")
 
@@ -66,6 +178,9 @@ def create(ctx: click.Context, target: Path, profile: str, git: bool) -> None:
             source=config_manager,
             profile_name=profile,
             init_git=git,
+            copy_strategy=ctx.obj["copy_strategy"],
+            commit=commit,
+            skill_store=_skill_store(ctx),
         )
         click.echo(click.style("✓ Project created successfully!", fg="green"))
     except Exception as e:
@@ -73,18 +188,81 @@ def create(ctx: click.Context, target: Path, profile: str, git: bool) -> None:
         raise click.Abort()
 
 
+def _create_from_manifest(
+    ctx: click.Context, source_config: ConfigManager, manifest: Path, parallel: int
+) -> None:
+    """Create every project listed in a manifest and print a result table."""
+    from .core import ProfileManager
+    from .core.scaffold import read_manifest, scaffold_projects
+
+    try:
+        specs = read_manifest(manifest)
+    except (ValueError, RuntimeError, OSError) as e:
+        click.echo(click.style(f"✗ {e}", fg="red"))
+        raise click.Abort()
+    if not specs:
+        click.echo("Manifest lists no projects.")
+        return
+    unknown = sorted({s.profile for s in specs} - set(ProfileManager.shared().list_profiles()))
+    if unknown:
+        click.echo(click.style(f"✗ Unknown profiles in manifest: {', '.join(unknown)}", fg="red"))
+        raise click.Abort()
+
+    click.echo(f"Creating {len(specs)} projects ({parallel} at a time)...\n")
+    click.echo(RESULT_HEADER)
+    try:
+        result = scaffold_projects(
+            source_config,
+            specs,
+            ProfileManager.shared(),
+            parallel=parallel,
+            workers=ctx.obj["workers"],
+            copy_strategy=ctx.obj["copy_strategy"],
+            skill_store=_skill_store(ctx),
+            on_result=_report_target,
+        )
+    except ValueError as e:
+        click.echo(click.style(f"✗ {e}", fg="red"))
+        raise click.Abort()
+
+    click.echo(f"\n{result.summary('created')}")
+    if result.failed:
+        click.echo(click.style(f"✗ {len(result.failed)} projects failed", fg="red"))
+        ctx.exit(1)
+    click.echo(click.style("✓ Projects created successfully!", fg="green"))
+
+
 @main.command()
 @click.option(
     "--target",
     "-t",
     type=click.Path(exists=True, file_okay=False, path_type=Path),
-    required=True,
+    default=None,
     help="Target project directory",
 )
+@click.option(
+    "--targets-from",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="File listing target directories or glob patterns, one per line",
+)
+@click.option(
+    "--targets-glob",
+    multiple=True,
+    help="Glob pattern of target directories (repeatable, '**' supported)",
+)
+@click.option(
+    "--parallel",
+    "-P",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of targets imported concurrently in a batch",
+)
 @click.option(
     "--profile",
     "-p",
-    type=click.Choice(["full", "frontend", "backend", "algorithm"]),
+    callback=_check_profile,
     default="full",
     help="Configuration profile to use",
 )
@@ -94,23 +272,73 @@ def create(ctx: click.Context, target: Path, profile: str, git: bool) -> None:
     default="overwrite",
     help="Merge strategy for existing configuration",
 )
+@click.option(
+    "--plan",
+    "plan_only",
+    is_flag=True,
+    help="Only print the operations an import would perform",
+)
 @click.pass_context
 def import_config(
-    ctx: click.Context, target: Path, profile: str, strategy: str
+    ctx: click.Context,
+    target: Path | None,
+    targets_from: Path | None,
+    targets_glob: tuple[str, ...],
+    parallel: int,
+    profile: str,
+    strategy: str,
+    plan_only: bool,
 ) -> None:
-    """Import configuration to an existing project."""
+    """Import configuration to an existing project, or to many with --targets-*."""
     from .core import ConfigManager, ProfileManager
 
+    batch = targets_from is not None or bool(targets_glob)
+    if batch == (target is not None):
+        raise click.UsageError("Use either --target or --targets-from/--targets-glob")
+
     source = ctx.obj["source"]
     source_config = ConfigManager(source)
-    target_config = ConfigManager(target)
-    profile_manager = ProfileManager()
+    profile_manager = ProfileManager.shared()
 
     profile_info = profile_manager.get_profile(profile)
     if not profile_info:
         click.echo(click.style(f"Unknown profile: {profile}", fg="red"))
         raise click.Abort()
 
+    if batch:
+        _import_batch(
+            ctx,
+            source_config,
+            profile_info,
+            targets_from,
+            targets_glob,
+            parallel,
+            profile,
+            strategy,
+            plan_only,
+        )
+        return
+
+    target_config = _target_config(ctx, target)
+    try:
+        plan = target_config.plan_merge(
+            source_config,
+            strategy=strategy,
+            mcp_servers=profile_info.mcpServers,
+            skills=profile_info.skills,
+        )
+    except Exception as e:
+        click.echo(click.style(f"✗ Import failed: {e}", fg="red"))
+        raise click.Abort()
+
+    if plan_only:
+        _print_plan(plan)
+        return
+
+    if not plan:
+        click.echo(click.style(f"✓ {target} is already up to date", fg="green"))
+        return
+
     # Check if target has existing config
     if target_config.has_config():
         click.echo(f"Target project already has configuration at {target}")
@@ -121,53 +349,196 @@ def import_config(
     click.echo(f"Importing '{profile}' configuration to {target}...")
 
     try:
-        target_config.merge_config(
-            source=source_config,
-            strategy=strategy,
-            mcp_servers=profile_info.mcpServers,
-            skills=profile_info.skills,
-        )
+        stats = target_config.apply_plan(plan)
+        click.echo(f"  {stats.summary()}")
         click.echo(click.style("✓ Configuration imported successfully!", fg="green"))
     except Exception as e:
         click.echo(click.style(f"✗ Import failed: {e}", fg="red"))
         raise click.Abort()
 
 
+def _import_batch(
+    ctx: click.Context,
+    source_config: ConfigManager,
+    profile_info: ProfileConfig,
+    targets_from: Path | None,
+    targets_glob: tuple[str, ...],
+    parallel: int,
+    profile: str,
+    strategy: str,
+    plan_only: bool,
+) -> None:
+    """Import a profile into every listed target and print a result table."""
+    from .core import ConfigManager
+    from .core.batch import import_batch, read_targets
+    from .core.planner import ResolvedSource
+
+    targets = read_targets(targets_from, targets_glob)
+    if not targets:
+        click.echo(click.style("No target directories found", fg="red"))
+        raise click.Abort()
+
+    resolved = ResolvedSource.resolve(
+        source_config, profile_info.mcpServers, profile_info.skills or None
+    )
+    if plan_only:
+        for target in targets:
+            _print_plan(_target_config(ctx, target).plan_merge(resolved, strategy=strategy))
+        return
+
+    existing = [t for t in targets if ConfigManager(t).has_config()]
+    if existing:
+        click.echo(f"{len(existing)} of {len(targets)} targets already have configuration")
+        click.echo(f"Strategy: {strategy} (backups will be created)")
+        if not click.confirm("Continue?"):
+            raise click.Abort()
+
+    click.echo(
+        f"Importing '{profile}' configuration to {len(targets)} targets "
+        f"({parallel} at a time)...\n"
+    )
+    click.echo(RESULT_HEADER)
+    result = import_batch(
+        resolved,
+        targets,
+        strategy=strategy,
+        parallel=parallel,
+        workers=ctx.obj["workers"],
+        copy_strategy=ctx.obj["copy_strategy"],
+        skill_store=_skill_store(ctx),
+        on_result=_report_target,
+    )
+
+    click.echo(f"\n{result.summary()}")
+    if result.failed:
+        click.echo(click.style(f"✗ {len(result.failed)} targets failed", fg="red"))
+        ctx.exit(1)
+    click.echo(click.style("✓ Configuration imported successfully!", fg="green"))
+
+
+RESULT_HEADER = f"  {'STATUS':<7} {'COPIED':>7} {'REMOVED':>8} {'SAME':>6} {'TIME':>7}  TARGET"
+
+
+def _report_target(result: TargetResult) -> None:
+    """Print one row of a batch result table (see RESULT_HEADER)."""
+    if result.ok:
+        status = click.style(f"{'ok':<7}", fg="green")
+        s = result.stats
+        counts = f"{s.files_copied:>7} {s.files_deleted:>8} {s.files_unchanged:>6}"
+    else:
+        status = click.style(f"{'failed':<7}", fg="red")
+        counts = f"{'-':>7} {'-':>8} {'-':>6}"
+    click.echo(f"  {status} {counts} {result.seconds:>6.2f}s  {result.target}")
+    if not result.ok:
+        click.echo(click.style(f"          {result.error}", fg="red"))
+
+
+def _print_plan(plan: Plan) -> None:
+    """Print the operations of an import plan."""
+    click.echo(f"{plan.target}: {plan.summary()}")
+    for op in plan.operations:
+        color = {"add": "green", "replace": "yellow", "delete": "red"}.get(op.action)
+        click.echo(click.style(f"  {op.describe()}", fg=color))
+    if plan.bytes_to_copy:
+        click.echo(f"  {_format_size(plan.bytes_to_copy)} to copy")
+
+
 @main.command()
 @click.option(
     "--output",
     "-o",
-    type=click.Path(dir_okay=False, path_type=Path),
+    type=click.Path(dir_okay=False, allow_dash=True, path_type=Path),
     default=None,
-    help="Output file path",
+    help="Output file path ('-' streams to stdout)",
 )
 @click.option(
     "--profile",
     "-p",
-    type=click.Choice(["full", "frontend", "backend", "algorithm"]),
+    callback=_check_profile,
     default=None,
     help="Filter to specific profile",
 )
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["json", "bundle"]),
+    default=None,
+    help="json (summary only) or bundle (.ccmb with skill files); "
+    "inferred from the output suffix",
+)
+@click.option(
+    "--no-compress",
+    is_flag=True,
+    help="Store bundle contents uncompressed",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(["none", "gzip", "zstd"]),
+    default="gzip",
+    help="Compression of a stream written to stdout (zstd needs 'zstandard')",
+)
+@click.option(
+    "--base",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Previous export or bundle; write only the changes since it (as a bundle)",
+)
 @click.pass_context
-def export(ctx: click.Context, output: Path | None, profile: str | None) -> None:
-    """Export configuration to a single file."""
+def export(
+    ctx: click.Context,
+    output: Path | None,
+    profile: str | None,
+    fmt: str | None,
+    no_compress: bool,
+    compression: str,
+    base: Path | None,
+) -> None:
+    """Export configuration to a single file, or stream it with -o -."""
     from .core import ConfigManager, ProfileManager
+    from .core.bundle import BUNDLE_SUFFIX
 
     source = ctx.obj["source"]
     config_manager = ConfigManager(source)
 
-    output = output or source / "claude-config-export.json"
-
     mcp_servers = None
     skills = None
 
     if profile:
-        profile_manager = ProfileManager()
+        profile_manager = ProfileManager.shared()
         profile_info = profile_manager.get_profile(profile)
         if profile_info:
             mcp_servers = profile_info.mcpServers
             skills = profile_info.skills
 
+    if output == Path("-") and base is not None:
+        click.echo(click.style("✗ Delta exports cannot be streamed", fg="red"), err=True)
+        raise click.Abort()
+    if output == Path("-"):
+        # Stdout carries the data; keep status messages on stderr
+        try:
+            config_manager.export_stream(
+                click.open_file("-", "wb"),
+                profile_name=profile,
+                mcp_servers=mcp_servers,
+                skills=skills,
+                compression=compression,
+            )
+        except Exception as e:
+            click.echo(click.style(f"✗ Export failed: {e}", fg="red"), err=True)
+            raise click.Abort()
+        return
+
+    if fmt is None:
+        fmt = "bundle" if output and output.suffix == BUNDLE_SUFFIX else "json"
+    if base is not None:
+        fmt = "bundle"
+    if output is None:
+        output = source / ("claude-config-delta" if base else "claude-config-export.json")
+    if fmt == "bundle":
+        output = output.with_suffix(BUNDLE_SUFFIX)
+    elif output.suffix == BUNDLE_SUFFIX:
+        output = output.with_suffix(".json")
+
     click.echo(f"Exporting configuration to {output}...")
 
     try:
@@ -176,6 +547,8 @@ def export(ctx: click.Context, output: Path | None, profile: str | None) -> None
             profile_name=profile,
             mcp_servers=mcp_servers,
             skills=skills,
+            compress=not no_compress,
+            base=base,
         )
         click.echo(click.style(f"✓ Exported to {output}", fg="green"))
     except Exception as e:
@@ -183,20 +556,117 @@ def export(ctx: click.Context, output: Path | None, profile: str | None) -> None
         raise click.Abort()
 
 
+@main.command(name="import")
+@click.argument(
+    "file",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True, path_type=Path),
+)
+@click.option(
+    "--target",
+    "-t",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Target project directory (default: --source)",
+)
+@click.option(
+    "--profile",
+    "-p",
+    callback=_check_profile,
+    default=None,
+    help="Only import the profile's servers and skills",
+)
+@click.option(
+    "--strategy",
+    type=click.Choice(["overwrite", "merge"]),
+    default="overwrite",
+    help="Merge strategy for existing configuration",
+)
+@click.pass_context
+def import_file(
+    ctx: click.Context,
+    file: Path,
+    target: Path | None,
+    profile: str | None,
+    strategy: str,
+) -> None:
+    """Import configuration from an exported file, bundle or stream ('-' reads stdin)."""
+    from .core import ConfigManager, ProfileManager
+
+    target = target or ctx.obj["source"]
+    config_manager = ConfigManager(
+        target, workers=ctx.obj["workers"], copy_strategy=ctx.obj["copy_strategy"]
+    )
+
+    mcp_servers = None
+    skills = None
+    if profile:
+        profile_info = ProfileManager.shared().get_profile(profile)
+        if not profile_info:
+            click.echo(click.style(f"Unknown profile: {profile}", fg="red"))
+            raise click.Abort()
+        mcp_servers = profile_info.mcpServers
+        skills = profile_info.skills
+
+    click.echo(f"Importing {file} to {target}...")
+
+    try:
+        if file == Path("-"):
+            stats = config_manager.import_stream(
+                click.open_file("-", "rb"),
+                strategy=strategy,
+                mcp_servers=mcp_servers,
+                skills=skills,
+            )
+        else:
+            stats = config_manager.import_config(
+                file, strategy=strategy, mcp_servers=mcp_servers, skills=skills
+            )
+        click.echo(f"  {stats.summary()}")
+        click.echo(click.style("✓ Configuration imported successfully!", fg="green"))
+    except Exception as e:
+        click.echo(click.style(f"✗ Import failed: {e}", fg="red"))
+        raise click.Abort()
+
+
 @main.command()
+@click.option(
+    "--all",
+    "root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Validate every project (.mcp.json or .claude/) below this directory",
+)
+@click.option(
+    "--processes",
+    "-P",
+    type=click.IntRange(min=1),
+    default=None,
+    help="With --all, projects validated concurrently (default: CPU count)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Re-run every check instead of reusing results whose inputs are unchanged",
+)
 @click.pass_context
-def validate(ctx: click.Context) -> None:
-    """Validate project configuration integrity."""
+def validate(
+    ctx: click.Context, root: Path | None, processes: int | None, no_cache: bool
+) -> None:
+    """Validate project configuration integrity, or of every project with --all."""
     from .core import ConfigManager, ProfileManager, Validator
 
+    if root is not None:
+        _validate_all(ctx, root, processes, not no_cache)
+        return
+
     source = ctx.obj["source"]
     config_manager = ConfigManager(source)
-    profile_manager = ProfileManager()
+    profile_manager = ProfileManager.shared()
     validator = Validator(config_manager, profile_manager)
 
     click.echo(f"Validating configuration at {source}...\n")
 
-    report = validator.validate_all()
+    report = validator.validate_all(use_cache=not no_cache)
 
     for result in report.results:
         status = "✓" if result.passed else "✗"
@@ -221,6 +691,120 @@ def validate(ctx: click.Context) -> None:
         )
 
 
+def _validate_all(
+    ctx: click.Context, root: Path, processes: int | None, use_cache: bool
+) -> None:
+    """Validate every project below root, printing each as it finishes."""
+    from .core.fleet import find_projects
+    from .core.validator import ValidationReport, validate_projects
+
+    projects = find_projects(root, ctx.obj["workers"])
+    if not projects:
+        click.echo(f"No projects found below {root}")
+        return
+    click.echo(f"Validating {len(projects)} projects below {root}...\n")
+
+    def report(item: ValidationReport) -> None:
+        if item.passed:
+            click.echo(f"  {click.style('✓', fg='green')} {item.project_path}")
+            return
+        click.echo(
+            f"  {click.style('✗', fg='red')} {item.project_path} "
+            f"({item.error_count} failed)"
+        )
+        for result in item.results:
+            if not result.passed:
+                click.echo(click.style(f"      {result.category}: {result.message}", fg="yellow"))
+
+    batch = validate_projects(projects, processes, on_report=report, use_cache=use_cache)
+
+    click.echo(f"\n{batch.summary()}")
+    if batch.failed:
+        click.echo(click.style(f"✗ {len(batch.failed)} projects failed validation", fg="red"))
+        ctx.exit(1)
+    click.echo(click.style("✓ All projects passed!", fg="green"))
+
+
+@main.command()
+@click.argument("servers", nargs=-1)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Servers started at the same time",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=30.0,
+    show_default=True,
+    help="Seconds allowed per server for startup, initialize and tools/list",
+)
+@click.option("--tools", "show_tools", is_flag=True, help="List each server's tools")
+@click.pass_context
+def probe(
+    ctx: click.Context,
+    servers: tuple[str, ...],
+    concurrency: int,
+    timeout: float,
+    show_tools: bool,
+) -> None:
+    """
+    Start MCP servers and check they complete the MCP handshake.
+
+    Every server in .mcp.json (or only SERVERS) is launched concurrently
+    and sent initialize and tools/list over stdio. Exits with status 1 if
+    any server fails.
+    """
+    from .core import ConfigManager
+    from .core.mcp_probe import ProbeResult
+    from .core.mcp_probe import probe as probe_servers
+
+    source = ctx.obj["source"]
+    configured = ConfigManager(source).read_mcp_config().mcpServers
+    unknown = [name for name in servers if name not in configured]
+    if unknown:
+        raise click.BadParameter(f"not in .mcp.json: {', '.join(unknown)}", param_hint="SERVERS")
+    selected = {name: configured[name] for name in servers or configured}
+    if not selected:
+        click.echo(f"No MCP servers configured at {source}")
+        return
+    click.echo(f"Probing {len(selected)} MCP servers (concurrency {concurrency})...\n")
+
+    def ms(value: float | None) -> str:
+        return f"{value:>7.0f}ms" if value is not None else f"{'-':>9}"
+
+    def report(result: ProbeResult) -> None:
+        if result.skipped:
+            click.echo(f"  {click.style('-', fg='yellow')} {result.name}: {result.error}")
+            return
+        timings = f"spawn {ms(result.spawn_ms)}  init {ms(result.initialize_ms)}"
+        if not result.ok:
+            click.echo(f"  {click.style('✗', fg='red')} {result.name}  {timings}")
+            click.echo(click.style(f"      {result.error}", fg="red"))
+            for line in result.stderr:
+                click.echo(click.style(f"      | {line}", fg="yellow"))
+            return
+        server = f"  [{result.server_info}]" if result.server_info else ""
+        click.echo(
+            f"  {click.style('✓', fg='green')} {result.name}  {timings}  "
+            f"tools/list {ms(result.tools_ms)}  {len(result.tools)} tools{server}"
+        )
+        if show_tools and result.tools:
+            click.echo(f"      {', '.join(result.tools)}")
+
+    results = probe_servers(selected, concurrency, timeout, cwd=source, on_result=report)
+
+    failed = [r for r in results if not r.ok and not r.skipped]
+    skipped = sum(1 for r in results if r.skipped)
+    passed = len(results) - len(failed) - skipped
+    click.echo(f"\n{passed} passed, {len(failed)} failed, {skipped} skipped")
+    if failed:
+        ctx.exit(1)
+
+
 @main.command()
 @click.pass_context
 def info(ctx: click.Context) -> None:
@@ -255,6 +839,440 @@ def info(ctx: click.Context) -> None:
         click.echo(f"  • {hook}")
 
 
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count for display."""
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    size = num_bytes / 1024
+    for unit in ("KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@main.command()
+@click.argument("root", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--db",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Index database (default: ~/.claude-config-manager/fleet.db)",
+)
+@click.pass_context
+def scan(ctx: click.Context, root: Path, db: Path | None) -> None:
+    """Index every project (.mcp.json or .claude/) below ROOT for 'ccm query'."""
+    from .core.fleet import FleetIndex
+
+    click.echo(f"Scanning {root}...")
+    with FleetIndex(db) as index:
+        stats = index.scan(root, workers=ctx.obj["workers"])
+        click.echo(f"  {stats.summary()}")
+        click.echo(click.style(f"✓ {index.count()} projects indexed", fg="green"))
+
+
+@main.command()
+@click.option("--server", "servers", multiple=True, help="Configures this MCP server")
+@click.option("--without-server", "missing_servers", multiple=True, help="Lacks this server")
+@click.option("--env", "env", multiple=True, help="References this env var")
+@click.option("--without-env", "missing_env", multiple=True, help="Lacks this env var")
+@click.option("--skill", "skills", multiple=True, help="Has this skill installed")
+@click.option("--without-skill", "missing_skills", multiple=True, help="Lacks this skill")
+@click.option(
+    "--under",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Only projects below this directory",
+)
+@click.option("--count", is_flag=True, help="Only print the number of matches")
+@click.option("--servers-summary", is_flag=True, help="Show server usage across projects")
+@click.option("--sql", default=None, help="Run a read-only SQL query against the index")
+@click.option(
+    "--db",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Index database (default: ~/.claude-config-manager/fleet.db)",
+)
+def query(
+    servers: tuple[str, ...],
+    missing_servers: tuple[str, ...],
+    env: tuple[str, ...],
+    missing_env: tuple[str, ...],
+    skills: tuple[str, ...],
+    missing_skills: tuple[str, ...],
+    under: Path | None,
+    count: bool,
+    servers_summary: bool,
+    sql: str | None,
+    db: Path | None,
+) -> None:
+    """
+    Query the project index built by 'ccm scan'.
+
+    Conditions are combined with AND, e.g. projects that configure mysql
+    without REDIS_HOST: ccm query --server mysql --without-env REDIS_HOST
+    """
+    import sqlite3
+    import time
+
+    from .core.fleet import FleetIndex
+
+    start = time.perf_counter()
+    with FleetIndex(db) as index:
+        if sql:
+            try:
+                columns, rows = index.execute(sql)
+            except sqlite3.Error as e:
+                click.echo(click.style(f"✗ Query failed: {e}", fg="red"))
+                raise click.Abort()
+            click.echo("\t".join(columns))
+            for row in rows:
+                click.echo("\t".join("" if v is None else str(v) for v in row))
+        elif servers_summary:
+            click.echo(f"  {'SERVER':<30} {'PROJECTS':>8} {'VARIANTS':>8}")
+            for name, projects, variants in index.server_usage():
+                click.echo(f"  {name:<30} {projects:>8} {variants:>8}")
+        else:
+            matches = index.query(
+                servers=list(servers),
+                missing_servers=list(missing_servers),
+                env=list(env),
+                missing_env=list(missing_env),
+                skills=list(skills),
+                missing_skills=list(missing_skills),
+                under=under,
+            )
+            if count:
+                click.echo(len(matches))
+            else:
+                for path in matches:
+                    click.echo(path)
+            click.echo(
+                click.style(
+                    f"{len(matches)} of {index.count()} projects "
+                    f"({(time.perf_counter() - start) * 1000:.1f} ms)",
+                    dim=True,
+                ),
+                err=True,
+            )
+
+
+@main.command()
+@click.argument(
+    "targets", nargs=-1, type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "--profile",
+    "-p",
+    callback=_check_profile,
+    default="full",
+    help="Profile the targets are expected to match",
+)
+@click.option("--fleet", is_flag=True, help="Check every project in the 'ccm scan' index")
+@click.option(
+    "--under",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="With --fleet, only projects below this directory",
+)
+@click.option(
+    "--db",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Index database (default: ~/.claude-config-manager/fleet.db)",
+)
+@click.pass_context
+def drift(
+    ctx: click.Context,
+    targets: tuple[Path, ...],
+    profile: str,
+    fleet: bool,
+    under: Path | None,
+    db: Path | None,
+) -> None:
+    """
+    Report projects whose servers or skills differ from a profile of --source.
+
+    Compares Merkle fingerprints, so only diverging subtrees are inspected
+    and unchanged files are never re-read (hashes are cached per project).
+    """
+    from .core import ConfigManager, ProfileManager
+
+    if fleet:
+        from .core.fleet import FleetIndex
+
+        with FleetIndex(db) as index:
+            targets = tuple(Path(p) for p in index.query(under=under))
+    if not targets and not fleet:
+        raise click.UsageError("Give target projects or use --fleet")
+
+    profile_info = ProfileManager.shared().get_profile(profile)
+    if not profile_info:
+        click.echo(click.style(f"Unknown profile: {profile}", fg="red"))
+        raise click.Abort()
+
+    source = ctx.obj["source"]
+    source_config = ConfigManager(source, workers=ctx.obj["workers"])
+    skills = profile_info.skills or source_config.list_skills()
+    expected = source_config.merkle(profile_info.mcpServers or None, skills)
+    targets = tuple(t for t in targets if t.resolve() != source.resolve())
+
+    def check(target: Path) -> list[tuple[str, str]]:
+        # All of the target's servers and skills, so extras of either are reported
+        return expected.diff(ConfigManager(target, workers=1).merkle())
+
+    symbols = {"changed": "~", "missing": "-", "extra": "+"}
+    drifted = 0
+    for target, result in zip(targets, source_config.copier.map(_catching(check), targets)):
+        if isinstance(result, Exception):
+            drifted += 1
+            click.echo(click.style(f"✗ {target}: {result}", fg="red"))
+        elif result:
+            drifted += 1
+            click.echo(click.style(f"✗ {target}", fg="yellow"))
+            for path, kind in result:
+                click.echo(f"    {symbols[kind]} {path}")
+        elif not fleet:
+            click.echo(click.style(f"✓ {target} matches '{profile}'", fg="green"))
+    click.echo(f"{len(targets) - drifted} of {len(targets)} projects match '{profile}'")
+    if drifted:
+        ctx.exit(1)
+
+
+def _catching(fn):
+    """Wrap fn so that exceptions are returned instead of raised."""
+
+    def wrapper(item):
+        try:
+            return fn(item)
+        except Exception as e:
+            return e
+
+    return wrapper
+
+
+@main.group()
+def profile() -> None:
+    """Configuration profiles."""
+    pass
+
+
+@profile.command("list")
+def profile_list() -> None:
+    """List profiles with their effective server and skill counts."""
+    from .core import ProfileManager
+
+    profile_manager = ProfileManager.shared()
+    for name in profile_manager.list_profiles():
+        summary = profile_manager.get_profile_summary(name)
+        extends = f" (extends {', '.join(summary['extends'])})" if summary["extends"] else ""
+        click.echo(
+            f"  {name:<20} {summary['mcp_count']:>3} servers {summary['skill_count']:>3} skills"
+            f"  {summary['description']}{extends}"
+        )
+
+
+@profile.command("show")
+@click.argument("name")
+@click.option(
+    "--resolved",
+    is_flag=True,
+    help="Show the effective sets after inheritance and skill dependencies",
+)
+def profile_show(name: str, resolved: bool) -> None:
+    """Show a profile as declared, or with --resolved as it is applied."""
+    from .core import ProfileManager
+
+    profile_manager = ProfileManager.shared()
+    if resolved:
+        info = profile_manager.get_profile(name)
+    else:
+        info = profile_manager.get_declared_profile(name)
+    if info is None:
+        click.echo(click.style(f"Unknown profile: {name}", fg="red"))
+        raise click.Abort()
+
+    click.echo(click.style(f"{name}: {info.name}", bold=True))
+    click.echo(f"  {info.description}")
+    sections = [
+        ("Extends", info.extends),
+        ("MCP servers", info.mcpServers),
+        ("Skills", info.skills),
+        ("Required env vars", info.requiredEnvVars),
+    ]
+    if not resolved:
+        sections += [
+            ("Removed MCP servers", info.removeMcpServers),
+            ("Removed skills", info.removeSkills),
+        ]
+    for title, values in sections:
+        if values:
+            click.echo(click.style(f"\n{title} ({len(values)}):", fg="blue", bold=True))
+            for value in values:
+                click.echo(f"  • {value}")
+
+
+@main.group()
+def backups() -> None:
+    """Configuration backup snapshots."""
+    pass
+
+
+@backups.command("list")
+@click.pass_context
+def backups_list(ctx: click.Context) -> None:
+    """List backup snapshots with their on-disk sizes."""
+    from .core import ConfigManager
+
+    source = ctx.obj["source"]
+    store = ConfigManager(source).backup_store
+    usage = store.usage()
+
+    if not usage:
+        click.echo("No backup snapshots found.")
+        return
+
+    click.echo(f"Backup snapshots in {store.root}:\n")
+    click.echo(f"  {'ID':<24} {'Created':<20} {'Files':>6} {'Size':>10} {'Unique':>10}")
+    for item in usage:
+        snapshot = item.snapshot
+        click.echo(
+            f"  {snapshot.id:<24} "
+            f"{snapshot.created_at.strftime('%Y-%m-%d %H:%M:%S'):<20} "
+            f"{len(snapshot.files):>6} "
+            f"{_format_size(item.logical_size):>10} "
+            f"{_format_size(item.unique_size + item.manifest_size):>10}"
+        )
+
+    click.echo(f"\nStore size on disk: {_format_size(store.total_size())}")
+
+
+@backups.command("gc")
+@click.option(
+    "--keep",
+    "-k",
+    type=click.IntRange(min=0),
+    default=10,
+    show_default=True,
+    help="Number of newest snapshots to keep",
+)
+@click.option(
+    "--max-age-days",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Also keep snapshots younger than this many days",
+)
+@click.option("--dry-run", is_flag=True, help="Only report what would be removed")
+@click.option("--force", is_flag=True, help="Allow --keep 0, which can remove every snapshot")
+@click.pass_context
+def backups_gc(
+    ctx: click.Context, keep: int, max_age_days: int | None, dry_run: bool, force: bool
+) -> None:
+    """Remove old snapshots and unreferenced backup data."""
+    from .core import ConfigManager
+
+    if keep < 1 and not force:
+        raise click.BadParameter("must be at least 1 unless --force is given", param_hint="--keep")
+    source = ctx.obj["source"]
+    store = ConfigManager(source).backup_store
+    result = store.gc(
+        keep_last=keep, max_age_days=max_age_days, dry_run=dry_run, force=force
+    )
+
+    verb = "Would remove" if dry_run else "Removed"
+    for snapshot_id in result.removed_snapshots:
+        click.echo(f"  - {snapshot_id}")
+    click.echo(
+        click.style(
+            f"✓ {verb} {len(result.removed_snapshots)} snapshot(s), "
+            f"{result.removed_objects} object(s), "
+            f"{_format_size(result.freed_bytes)} freed",
+            fg="green",
+        )
+    )
+
+
+@backups.command("restore")
+@click.argument("snapshot_id")
+@click.pass_context
+def backups_restore(ctx: click.Context, snapshot_id: str) -> None:
+    """Restore configuration from a backup snapshot."""
+    from .core import ConfigManager
+
+    source = ctx.obj["source"]
+    config_manager = ConfigManager(source, workers=ctx.obj["workers"])
+
+    try:
+        snapshot = config_manager.backup_store.get(snapshot_id)
+        stats = config_manager.restore_from_backup(snapshot.manifest_path)
+        click.echo(f"  {stats.summary()}")
+        click.echo(click.style(f"✓ Restored snapshot '{snapshot_id}'", fg="green"))
+    except Exception as e:
+        click.echo(click.style(f"✗ Restore failed: {e}", fg="red"))
+        raise click.Abort()
+
+
+@main.group()
+def store() -> None:
+    """Global skill store shared by all projects (see --store)."""
+    pass
+
+
+@store.command("info")
+@click.pass_context
+def store_info(ctx: click.Context) -> None:
+    """Show the skill store's size and how many projects use it."""
+    from .core.skill_store import SkillStore
+
+    skill_store = SkillStore()
+    info = skill_store.info()
+    click.echo(f"Skill store at {skill_store.root}:\n")
+    click.echo(f"  Trees:    {info.trees}")
+    click.echo(f"  Files:    {info.objects}")
+    click.echo(f"  Projects: {info.projects}")
+    click.echo(f"  On disk:  {_format_size(info.disk_bytes)}")
+
+
+@store.command("gc")
+@click.option("--dry-run", is_flag=True, help="Only report what would be removed")
+@click.pass_context
+def store_gc(ctx: click.Context, dry_run: bool) -> None:
+    """Remove skill trees and files no project links any more."""
+    from .core.skill_store import SkillStore
+
+    result = SkillStore().gc(dry_run=dry_run)
+
+    verb = "Would remove" if dry_run else "Removed"
+    for tree in result.removed_trees:
+        click.echo(f"  - {tree[:12]}")
+    click.echo(
+        click.style(
+            f"✓ {verb} {len(result.removed_trees)} tree(s), "
+            f"{result.removed_objects} file(s), "
+            f"{_format_size(result.freed_bytes)} freed "
+            f"({result.dropped_refs} stale project reference(s))",
+            fg="green",
+        )
+    )
+
+
+@store.command("verify")
+@click.pass_context
+def store_verify(ctx: click.Context) -> None:
+    """Re-hash stored files and check every tree against its manifest."""
+    from .core.copier import CopyEngine
+    from .core.skill_store import SkillStore
+
+    result = SkillStore(engine=CopyEngine(ctx.obj["workers"], "auto")).verify()
+    for problem in result.problems:
+        click.echo(click.style(f"  ✗ {problem}", fg="red"))
+    summary = f"{result.objects} file(s), {result.trees} tree(s) checked"
+    if not result.ok:
+        click.echo(click.style(f"✗ {summary}: {len(result.problems)} problem(s)", fg="red"))
+        ctx.exit(1)
+    click.echo(click.style(f"✓ {summary}", fg="green"))
+
+
 @main.group()
 def git() -> None:
     """Git remote configuration management."""
@@ -325,11 +1343,13 @@ def git_remove(name: str) -> None:
 @click.option(
     "--profile",
     "-p",
-    type=click.Choice(["full", "frontend", "backend", "algorithm"]),
     default="full",
     help="Profile to pull",
 )
-def git_pull(name: str, target: Path | None, profile: str) -> None:
+@click.pass_context
+def git_pull(
+    ctx: click.Context, name: str, target: Path | None, profile: str
+) -> None:
     """Pull configuration from a remote repository."""
     from .core import ConfigManager, GitSync, ProfileManager
 
@@ -343,7 +1363,12 @@ def git_pull(name: str, target: Path | None, profile: str) -> None:
 
         # Apply to target
         source_config = ConfigManager(temp_dir)
-        target_config = ConfigManager(target)
+        target_config = ConfigManager(
+            target,
+            workers=ctx.obj["workers"],
+            copy_strategy=ctx.obj["copy_strategy"],
+            skill_store=_skill_store(ctx),
+        )
         profile_manager = ProfileManager(temp_dir / "config" / "profiles.json")
 
         profile_info = profile_manager.get_profile(profile)
@@ -376,7 +1401,7 @@ def git_push(ctx: click.Context, name: str, message: str) -> None:
     from .core import GitSync
 
     source = ctx.obj["source"]
-    git_sync = GitSync()
+    git_sync = GitSync(workers=ctx.obj["workers"])
 
     click.echo(f"Pushing configuration to '{name}'...")
 
@@ -388,5 +1413,585 @@ def git_push(ctx: click.Context, name: str, message: str) -> None:
         raise click.Abort()
 
 
+@main.group()
+def watch() -> None:
+    """Propagate source changes to registered targets as they happen."""
+    pass
+
+
+@watch.command("add")
+@click.argument("target", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--profile",
+    "-p",
+    callback=_check_profile,
+    default="full",
+    help="Profile whose servers and skills are propagated",
+)
+@click.option(
+    "--strategy",
+    type=click.Choice(["overwrite", "merge"]),
+    default="overwrite",
+    help="Merge strategy for the target's MCP configuration",
+)
+@click.pass_context
+def watch_add(ctx: click.Context, target: Path, profile: str, strategy: str) -> None:
+    """Register a target project to keep in sync with --source."""
+    from .core.watcher import WatchRegistry
+
+    try:
+        WatchRegistry().add_target(target, ctx.obj["source"], profile, strategy)
+        click.echo(click.style(f"✓ Watching for {target} ({profile})", fg="green"))
+    except ValueError as e:
+        click.echo(click.style(f"✗ {e}", fg="red"))
+        raise click.Abort()
+
+
+@watch.command("list")
+@click.pass_context
+def watch_list(ctx: click.Context) -> None:
+    """List targets registered for --source."""
+    from .core.watcher import WatchRegistry
+
+    targets = WatchRegistry().list_targets(ctx.obj["source"])
+    if not targets:
+        click.echo("No watch targets registered for this source.")
+        return
+
+    click.echo(click.style("Watch targets:", bold=True))
+    for t in targets:
+        click.echo(f"  {t.path}  ({t.profile}, {t.strategy})")
+
+
+@watch.command("remove")
+@click.argument("target", type=click.Path(path_type=Path))
+def watch_remove(target: Path) -> None:
+    """Unregister a target project."""
+    from .core.watcher import WatchRegistry
+
+    if WatchRegistry().remove_target(target):
+        click.echo(click.style(f"✓ Removed {target}", fg="green"))
+    else:
+        click.echo(click.style(f"Target not registered: {target}", fg="yellow"))
+
+
+@watch.command("run")
+@click.option("--poll", is_flag=True, help="Poll for changes instead of using inotify")
+@click.option(
+    "--debounce",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="Seconds without changes before a sync starts",
+)
+@click.pass_context
+def watch_run(ctx: click.Context, poll: bool, debounce: float) -> None:
+    """Watch --source and sync its registered targets until interrupted."""
+    import time
+
+    from .core import ConfigManager, ProfileManager
+    from .core.watcher import PollingDetector, WatchRegistry, Watcher
+
+    source = ctx.obj["source"]
+    targets = WatchRegistry().list_targets(source)
+    if not targets:
+        click.echo("No watch targets registered for this source (see 'ccm watch add').")
+        return
+
+    profile_manager = ProfileManager.shared()
+    profiles = {}
+    for name in profile_manager.list_profiles():
+        profile = profile_manager.get_profile(name)
+        profiles[name] = (profile.mcpServers, profile.skills)
+
+    watcher = Watcher(
+        ConfigManager(source, workers=ctx.obj["workers"]),
+        targets,
+        profiles,
+        debounce=debounce,
+        poll=poll,
+        copy_strategy=ctx.obj["copy_strategy"],
+        skill_store=_skill_store(ctx),
+    )
+
+    def report(changed, results) -> None:
+        stamp = time.strftime("%H:%M:%S")
+        if not results:
+            click.echo(f"[{stamp}] {len(changed)} changed, targets up to date")
+        for result in results:
+            if result.error:
+                click.echo(click.style(f"[{stamp}] ✗ {result.target}: {result.error}", fg="red"))
+            else:
+                click.echo(f"[{stamp}] {result.target}: {result.stats.summary()}")
+
+    report({"*"}, watcher.sync())
+    mode = "polling" if isinstance(watcher.detector, PollingDetector) else "inotify"
+    click.echo(f"Watching {source} for {len(targets)} targets ({mode}); Ctrl+C to stop")
+    try:
+        watcher.run(on_sync=report)
+    except KeyboardInterrupt:
+        click.echo("\nStopped.")
+
+
+@main.group()
+def bench() -> None:
+    """Performance benchmarks."""
+    pass
+
+
+@bench.command("copy")
+@click.option(
+    "--files",
+    "-n",
+    type=click.IntRange(min=1),
+    default=10000,
+    show_default=True,
+    help="Number of files in the generated tree",
+)
+@click.option(
+    "--size",
+    type=click.IntRange(min=0),
+    default=1024,
+    show_default=True,
+    help="Size of each file in bytes",
+)
+@click.option(
+    "--dir",
+    "work_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory to run in (default: system temp dir)",
+)
+@click.pass_context
+def bench_copy(
+    ctx: click.Context, files: int, size: int, work_dir: Path | None
+) -> None:
+    """Compare the parallel copy engine with shutil.copytree."""
+    import shutil
+    import tempfile
+    import time
+
+    from .core.copier import CopyEngine
+
+    if work_dir:
+        work_dir.mkdir(parents=True, exist_ok=True)
+    root = Path(tempfile.mkdtemp(prefix="ccm-bench-", dir=work_dir))
+    try:
+        src = root / "src"
+        payload = b"x" * size
+        for i in range(files):
+            sub = src / f"skill-{i // 100:03d}"
+            if i % 100 == 0:
+                sub.mkdir(parents=True)
+            (sub / f"file-{i:05d}.md").write_bytes(payload)
+
+        click.echo(f"Copying {files} files of {size} bytes in {root}\n")
+
+        start = time.perf_counter()
+        shutil.copytree(src, root / "copytree")
+        baseline = time.perf_counter() - start
+        click.echo(f"  shutil.copytree: {baseline:.3f}s")
+
+        engine = CopyEngine(ctx.obj["workers"], ctx.obj["copy_strategy"])
+        stats = engine.copy_tree(src, root / "engine")
+        click.echo(f"  CopyEngine ({engine.workers} workers): {stats.seconds:.3f}s")
+        click.echo(f"    {stats.summary()}")
+
+        speedup = baseline / stats.seconds if stats.seconds > 0 else 0.0
+        click.echo(click.style(f"\nSpeedup: {speedup:.2f}x", fg="green", bold=True))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+@bench.command("create")
+@click.option(
+    "--projects",
+    "-n",
+    type=click.IntRange(min=1),
+    default=200,
+    show_default=True,
+    help="Number of projects to scaffold",
+)
+@click.option(
+    "--files",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Files per skill in the generated source",
+)
+@click.option("--git/--no-git", default=True, show_default=True, help="Initialize repositories")
+@click.option("--commit", is_flag=True, help="Also make an initial commit")
+@click.option(
+    "--parallel",
+    "-P",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Projects created concurrently",
+)
+@click.option(
+    "--dir",
+    "work_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory to run in (default: system temp dir)",
+)
+@click.pass_context
+def bench_create(
+    ctx: click.Context,
+    projects: int,
+    files: int,
+    git: bool,
+    commit: bool,
+    parallel: int,
+    work_dir: Path | None,
+) -> None:
+    """
+    Time scaffolding many projects from a manifest against one-by-one creation.
+
+    With --store, skills are linked from a skill store created in the
+    benchmark directory.
+    """
+    import shutil
+    import tempfile
+    import time
+
+    from .core import ConfigManager, MCPConfig, ProfileManager
+    from .core.backup_store import disk_size
+    from .core.copier import CopyEngine
+    from .core.manifest import iter_files
+    from .core.models import MCPServer
+    from .core.scaffold import ProjectSpec, scaffold_projects
+    from .core.skill_store import SkillStore
+
+    profile_manager = ProfileManager.shared()
+    profile = profile_manager.get_profile("full")
+    if work_dir:
+        work_dir.mkdir(parents=True, exist_ok=True)
+    root = Path(tempfile.mkdtemp(prefix="ccm-bench-", dir=work_dir))
+    try:
+        src = root / "src"
+        MCPConfig(
+            mcpServers={name: MCPServer(command="npx", args=[name]) for name in profile.mcpServers}
+        ).to_file(src / ".mcp.json")
+        for skill in profile.skills:
+            skill_dir = src / ".claude" / "skills" / skill
+            skill_dir.mkdir(parents=True)
+            for i in range(files):
+                (skill_dir / f"part-{i:03d}.md").write_bytes(b"x" * 1024)
+        source = ConfigManager(src, workers=ctx.obj["workers"])
+        skill_store = None
+        if ctx.obj["store"] != "off":
+            skill_store = SkillStore(
+                root / "store", ctx.obj["store"], CopyEngine(ctx.obj["workers"], "auto")
+            )
+        click.echo(
+            f"Scaffolding {projects} projects of {len(profile.skills)} skills x {files} files "
+            f"(git: {git}, commit: {commit}, store: {ctx.obj['store']}) in {root}\n"
+        )
+
+        sample = max(1, projects // 10)
+        start = time.perf_counter()
+        for i in range(sample):
+            profile_manager.create_project(
+                root / "single" / f"project-{i:04d}",
+                source,
+                profile_name="full",
+                init_git=git,
+                copy_strategy=ctx.obj["copy_strategy"],
+                commit=commit,
+                skill_store=skill_store,
+            )
+        single = (time.perf_counter() - start) / sample
+        click.echo(f"  one by one ({sample} sampled): {single * 1000:8.1f} ms/project")
+
+        specs = [
+            ProjectSpec(root / "manifest" / f"project-{i:04d}", "full", git, commit)
+            for i in range(projects)
+        ]
+        result = scaffold_projects(
+            source,
+            specs,
+            profile_manager,
+            parallel=parallel,
+            workers=ctx.obj["workers"],
+            copy_strategy=ctx.obj["copy_strategy"],
+            skill_store=skill_store,
+        )
+        if result.failed:
+            click.echo(click.style(f"  {result.failed[0].target}: {result.failed[0].error}", fg="red"))
+        per_project = result.seconds / projects
+        click.echo(f"  manifest ({parallel} at a time):  {per_project * 1000:8.1f} ms/project")
+        click.echo(f"    {result.summary('created')}")
+
+        inodes = {}
+        for directory in (root / "manifest", root / "store"):
+            for _, _, st in iter_files(directory):
+                inodes[(st.st_dev, st.st_ino)] = disk_size(st)
+        click.echo(f"    disk use (projects + store): {_format_size(sum(inodes.values()))}")
+
+        speedup = single / per_project if per_project > 0 else 0.0
+        click.echo(click.style(f"\nSpeedup: {speedup:.2f}x", fg="green", bold=True))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+@bench.command("load")
+@click.option(
+    "--servers",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of MCP servers in the generated config",
+)
+@click.option(
+    "--iterations",
+    "-n",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Number of timed iterations",
+)
+def bench_load(servers: int, iterations: int) -> None:
+    """Time MCPConfig.from_file/to_file on a large generated config."""
+    import shutil
+    import tempfile
+    import time
+
+    from .core import MCPConfig, jsonio
+    from .core.models import MCPServer
+
+    config = MCPConfig(
+        mcpServers={
+            f"server-{i:04d}": MCPServer(
+                command="npx",
+                args=["-y", f"@scope/server-{i}@latest", "--port", str(9000 + i)],
+                env={"API_KEY": "${API_KEY}", "LOG_LEVEL": "info"},
+                autoApprove=["read", "list"],
+            )
+            for i in range(servers)
+        }
+    )
+
+    root = Path(tempfile.mkdtemp(prefix="ccm-bench-"))
+    try:
+        path = root / ".mcp.json"
+
+        def timed(fn) -> float:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            return (time.perf_counter() - start) / iterations * 1000
+
+        def fresh_write() -> None:
+            path.unlink(missing_ok=True)
+            config.to_file(path)
+
+        write_ms = timed(fresh_write)
+        noop_ms = timed(lambda: config.to_file(path))
+
+        def cold_load() -> None:
+            jsonio.clear_cache()
+            MCPConfig.from_file(path)
+
+        cold_ms = timed(cold_load)
+        warm_ms = timed(lambda: MCPConfig.from_file(path))
+
+        click.echo(
+            f"{servers} servers, {path.stat().st_size / 1024:.0f} KB, "
+            f"JSON backend: {jsonio.BACKEND}\n"
+        )
+        click.echo(f"  to_file:            {write_ms:8.3f} ms")
+        click.echo(f"  to_file (no-op):    {noop_ms:8.3f} ms")
+        click.echo(f"  from_file (parse):  {cold_ms:8.3f} ms")
+        click.echo(f"  from_file (cached): {warm_ms:8.3f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+@bench.command("servers")
+@click.argument("servers", nargs=-1)
+@click.option(
+    "--profile",
+    "-p",
+    callback=_check_profile,
+    default=None,
+    help="Only the servers of this profile",
+)
+@click.option(
+    "--iterations",
+    "-n",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Cold starts per server",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Unrecorded starts first (fills npx/uvx caches)",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Servers started at the same time",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=30.0,
+    show_default=True,
+    help="Seconds allowed per start",
+)
+@click.option(
+    "--save",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the results to a JSON file (e.g. to use as a baseline)",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Results saved by an earlier run to compare against",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    help="Relative increase over the baseline reported as a regression",
+)
+@click.pass_context
+def bench_servers(
+    ctx: click.Context,
+    servers: tuple[str, ...],
+    profile: str | None,
+    iterations: int,
+    warmup: int,
+    concurrency: int,
+    timeout: float,
+    save: Path | None,
+    baseline: Path | None,
+    threshold: float,
+) -> None:
+    """
+    Measure cold-start latency and memory of the MCP servers in .mcp.json.
+
+    Each server (or only SERVERS) is started ITERATIONS times and timed
+    until it answers initialize and tools/list; p50/p95/p99 and peak RSS
+    are reported from slowest to fastest. With --baseline, exits with
+    status 1 if any server regressed.
+    """
+    import sys
+
+    from .core import ConfigManager, ProfileManager
+    from .core.server_bench import ServerBenchmark, compare
+    from .core.server_bench import bench_servers as run_bench
+
+    source = ctx.obj["source"]
+    configured = ConfigManager(source).read_mcp_config().mcpServers
+    names = list(servers or configured)
+    if profile is not None:
+        wanted = ProfileManager.shared().get_profile(profile).mcpServers
+        missing = [name for name in wanted if name not in configured]
+        if missing:
+            click.echo(click.style(f"Not in .mcp.json, skipped: {', '.join(missing)}", fg="yellow"))
+        names = [name for name in names if name in wanted]
+    unknown = [name for name in names if name not in configured]
+    if unknown:
+        raise click.BadParameter(f"not in .mcp.json: {', '.join(unknown)}", param_hint="SERVERS")
+    if not names:
+        click.echo("No MCP servers to benchmark.")
+        return
+
+    reference = None
+    if baseline is not None:
+        try:
+            reference = ServerBenchmark.load(baseline)
+        except (OSError, ValueError) as e:
+            raise click.BadParameter(str(e), param_hint="--baseline")
+
+    click.echo(
+        f"Starting {len(names)} servers {iterations} times "
+        f"(warm-up {warmup}, concurrency {concurrency})...\n"
+    )
+
+    def progress(round_no: int, results: list) -> None:
+        if not sys.stdout.isatty():
+            return
+        failed = sum(1 for r in results if not r.ok and not r.skipped)
+        note = click.style(f", {failed} failed", fg="red") if failed else ""
+        click.echo(f"\r  round {round_no}/{iterations}{note}   ", nl=round_no == iterations)
+
+    result = run_bench(
+        {name: configured[name] for name in names},
+        iterations=iterations,
+        concurrency=concurrency,
+        timeout=timeout,
+        warmup=warmup,
+        cwd=source,
+        on_round=progress,
+    )
+    result.profile = profile
+
+    def row(label: str, values: dict[str, float]) -> str:
+        cells = "  ".join(f"{key} {values[key]:8.1f}ms" for key in values) or "-"
+        return f"      {label:<11} {cells}"
+
+    for stats in result.ranked():
+        if stats.runs and stats.failures == stats.runs:
+            click.echo(f"\n  {click.style('✗', fg='red')} {stats.name}: all {stats.runs} starts failed")
+        else:
+            rss = f", peak RSS {_format_size(stats.peak_rss_kb * 1024)}" if stats.peak_rss_kb else ""
+            failures = (
+                click.style(f", {stats.failures} failed", fg="red") if stats.failures else ""
+            )
+            click.echo(
+                f"\n  {click.style(stats.name, bold=True)}: "
+                f"{stats.runs - stats.failures}/{stats.runs} ok{failures}, "
+                f"{stats.tool_count} tools{rss}"
+            )
+            for metric, label in (
+                ("spawn", "spawn"),
+                ("initialize", "initialize"),
+                ("tools", "tools/list"),
+                ("total", "total"),
+            ):
+                click.echo(row(label, stats.percentiles(metric)))
+        for error in stats.errors[:3]:
+            click.echo(click.style(f"      {error}", fg="yellow"))
+
+    click.echo(f"\nCompleted in {result.seconds:.1f}s")
+    if save is not None:
+        result.save(save)
+        click.echo(f"Results saved to {save}")
+
+    if reference is not None:
+        regressions = compare(result, reference, threshold)
+        if not regressions:
+            click.echo(click.style(f"✓ No regressions against {baseline}", fg="green"))
+            return
+        click.echo(click.style(f"✗ {len(regressions)} regressions against {baseline}:", fg="red"))
+        for reg in regressions:
+            if reg.metric == "peak RSS":
+                values = (
+                    f"{_format_size(int(reg.baseline * 1024))} -> "
+                    f"{_format_size(int(reg.current * 1024))}"
+                )
+            elif reg.metric == "failures":
+                values = f"{reg.baseline:.0%} -> {reg.current:.0%} of starts"
+            else:
+                values = f"{reg.baseline:.1f}ms -> {reg.current:.1f}ms"
+            change = f" (+{reg.change:.0%})" if reg.metric != "failures" else ""
+            click.echo(f"  {reg.server} {reg.metric}: {values}{change}")
+        ctx.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -1,20 +1,50 @@
-"""Core modules for configuration management."""
-
-from .config_manager import ConfigManager
-from .git_sync import GitSync
-from .models import ExportedConfig, ExportMetadata, MCPConfig, ProfileConfig
-from .profile_manager import ProfileManager
-from .validator import ValidationReport, ValidationResult, Validator
-
-__all__ = [
-    "ConfigManager",
-    "ProfileManager",
-    "GitSync",
-    "Validator",
-    "ValidationResult",
-    "ValidationReport",
-    "MCPConfig",
-    "ProfileConfig",
-    "ExportedConfig",
-    "ExportMetadata",
-]
+"""
+Core modules for configuration management.
+
+Exports are imported on first access, so commands only pay for the
+modules they use (GitPython, for instance, is loaded only by git
+operations).
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .backup_store import BackupStore, Snapshot
+    from .config_manager import ConfigManager
+    from .git_sync import GitSync
+    from .models import ExportedConfig, ExportMetadata, MCPConfig, ProfileConfig
+    from .profile_manager import ProfileManager
+    from .validator import ValidationReport, ValidationResult, Validator
+
+_EXPORTS = {
+    "BackupStore": "backup_store",
+    "Snapshot": "backup_store",
+    "ConfigManager": "config_manager",
+    "ProfileManager": "profile_manager",
+    "GitSync": "git_sync",
+    "Validator": "validator",
+    "ValidationResult": "validator",
+    "ValidationReport": "validator",
+    "MCPConfig": "models",
+    "ProfileConfig": "models",
+    "ExportedConfig": "models",
+    "ExportMetadata": "models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,374 @@
+"""Content-addressed, deduplicating store for configuration backups."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from . import jsonio
+from .copier import CopyEngine
+from .locking import store_lock
+from .manifest import FileEntry, hash_file, iter_files
+
+MANIFEST_VERSION = 1
+
+
+def disk_size(st: os.stat_result) -> int:
+    """Return the bytes a file actually occupies on disk."""
+    blocks = getattr(st, "st_blocks", None)
+    if blocks is None:
+        return st.st_size
+    return blocks * 512
+
+
+@dataclass
+class Snapshot:
+    """A single backup snapshot described by its manifest."""
+
+    id: str
+    created_at: datetime
+    files: dict[str, FileEntry] = field(default_factory=dict)
+    manifest_path: Path | None = None
+
+    @property
+    def logical_size(self) -> int:
+        """Total size of the files captured by this snapshot."""
+        return sum(e.size for e in self.files.values())
+
+    def to_dict(self) -> dict:
+        """Serialize snapshot to manifest structure."""
+        return {
+            "version": MANIFEST_VERSION,
+            "id": self.id,
+            "created_at": self.created_at.isoformat(),
+            "files": {path: e.to_dict() for path, e in sorted(self.files.items())},
+        }
+
+    @classmethod
+    def from_file(cls, path: Path) -> Snapshot:
+        """Load snapshot from a manifest file."""
+        data = jsonio.read_json(path)
+        return cls(
+            id=data["id"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            files={p: FileEntry.from_dict(p, e) for p, e in data["files"].items()},
+            manifest_path=path,
+        )
+
+
+@dataclass
+class SnapshotUsage:
+    """Disk usage of a snapshot."""
+
+    snapshot: Snapshot
+    logical_size: int
+    unique_size: int
+    manifest_size: int
+
+
+@dataclass
+class GCResult:
+    """Result of a garbage collection run."""
+
+    removed_snapshots: list[str] = field(default_factory=list)
+    removed_objects: int = 0
+    freed_bytes: int = 0
+
+
+class BackupStore:
+    """
+    Stores backups as content-addressed blobs plus one manifest per snapshot.
+
+    Layout::
+
+        <root>/objects/ab/cdef...   one blob per unique file content
+        <root>/snapshots/<id>.json  manifest: relative path -> hash, size, mode
+
+    A new snapshot only writes blobs for content not already in the store.
+    Files whose size and mtime match the previous snapshot reuse its hash
+    without being read again. Hashing and blob writes run on the copy
+    engine's thread pool. Creating snapshots and gc hold a lock file in
+    the root, so concurrent ccm processes can share a store.
+    """
+
+    def __init__(self, root: Path, engine: CopyEngine | None = None):
+        """Initialize store rooted at the given directory."""
+        self.root = root
+        self.engine = engine or CopyEngine()
+        self.objects_dir = root / "objects"
+        self.snapshots_dir = root / "snapshots"
+
+    def object_path(self, digest: str) -> Path:
+        """Return the blob path for a content hash."""
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def has_object(self, digest: str) -> bool:
+        """Check whether a blob for the given hash exists."""
+        return self.object_path(digest).exists()
+
+    def put_file(self, path: Path) -> str:
+        """Add a file's content to the store and return its hash."""
+        digest = hash_file(path)
+        target = self.object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+            os.close(fd)
+            try:
+                self.engine.copy_bytes(path, tmp)
+                os.replace(tmp, target)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        return digest
+
+    def create_snapshot(
+        self,
+        sources: list[tuple[str, Path]],
+        snapshot_id: str | None = None,
+    ) -> Snapshot:
+        """
+        Capture files and directories into a new snapshot.
+
+        Args:
+            sources: (relative name, path) pairs; directories are walked
+            snapshot_id: Explicit snapshot id (default: timestamp)
+
+        Returns:
+            The new snapshot, or the latest one if nothing changed and no
+            explicit id was requested.
+        """
+        with store_lock(self.root):
+            previous = self.latest()
+            cache = previous.files if previous else {}
+
+            walked: list[tuple[str, Path, os.stat_result]] = []
+            for name, path in sources:
+                if path.is_dir():
+                    walked.extend(iter_files(path, f"{name}/"))
+                elif path.is_file():
+                    walked.append((name, path, path.stat()))
+
+            # Hard-linked files (see the 'hardlink' copy strategy) share an
+            # inode; hash each inode only once.
+            inodes: dict[tuple[int, int], str] = {}
+            for rel, _, st in walked:
+                cached = cache.get(rel)
+                if cached is not None and _unchanged(cached, st):
+                    inodes.setdefault((st.st_dev, st.st_ino), cached.hash)
+
+            unique: dict[tuple[int, int], Path] = {}
+            for _, path, st in walked:
+                unique.setdefault((st.st_dev, st.st_ino), path)
+            hashes = dict(
+                zip(
+                    unique,
+                    self.engine.map(
+                        lambda item: self._capture(item[1], inodes.get(item[0])),
+                        unique.items(),
+                    ),
+                )
+            )
+            files = {
+                rel: FileEntry(
+                    path=rel,
+                    size=st.st_size,
+                    mtime_ns=st.st_mtime_ns,
+                    mode=st.st_mode & 0o7777,
+                    hash=hashes[(st.st_dev, st.st_ino)],
+                )
+                for rel, _, st in walked
+            }
+
+            if snapshot_id is None and previous and _same_content(previous.files, files):
+                return previous
+
+            now = datetime.now()
+            snapshot = Snapshot(
+                id=self._unique_id(snapshot_id or now.strftime("%Y%m%d_%H%M%S")),
+                created_at=now,
+                files=files,
+            )
+            self._write_manifest(snapshot)
+            return snapshot
+
+    def _capture(self, path: Path, cached_hash: str | None) -> str:
+        """Store one file, reusing the cached hash when it is unchanged."""
+        if cached_hash is not None and self.has_object(cached_hash):
+            return cached_hash
+        return self.put_file(path)
+
+    def _unique_id(self, base: str) -> str:
+        """Return a snapshot id that does not collide with existing ones."""
+        candidate = base
+        counter = 1
+        while (self.snapshots_dir / f"{candidate}.json").exists():
+            candidate = f"{base}-{counter}"
+            counter += 1
+        return candidate
+
+    def _write_manifest(self, snapshot: Snapshot) -> None:
+        """Atomically write a snapshot manifest."""
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshots_dir / f"{snapshot.id}.json"
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(jsonio.dumps(snapshot.to_dict()))
+        os.replace(tmp, path)
+        snapshot.manifest_path = path
+
+    def list_snapshots(self) -> list[Snapshot]:
+        """List snapshots, oldest first."""
+        if not self.snapshots_dir.exists():
+            return []
+        snapshots = [
+            Snapshot.from_file(p)
+            for p in self.snapshots_dir.glob("*.json")
+            if not p.name.startswith(".")
+        ]
+        return sorted(snapshots, key=lambda s: (s.created_at, s.id))
+
+    def latest(self) -> Snapshot | None:
+        """Return the most recent snapshot, if any."""
+        snapshots = self.list_snapshots()
+        return snapshots[-1] if snapshots else None
+
+    def get(self, snapshot_id: str) -> Snapshot:
+        """Load a snapshot by id."""
+        path = self.snapshots_dir / f"{snapshot_id}.json"
+        if not path.exists():
+            raise ValueError(f"Backup snapshot '{snapshot_id}' not found")
+        return Snapshot.from_file(path)
+
+    def usage(self) -> list[SnapshotUsage]:
+        """
+        Compute on-disk usage per snapshot.
+
+        The unique size is the space occupied by blobs referenced only by
+        that snapshot, i.e. what removing it would free.
+        """
+        snapshots = self.list_snapshots()
+        refcount: dict[str, int] = {}
+        for snapshot in snapshots:
+            for digest in {e.hash for e in snapshot.files.values()}:
+                refcount[digest] = refcount.get(digest, 0) + 1
+
+        result = []
+        for snapshot in snapshots:
+            unique = 0
+            for digest in {e.hash for e in snapshot.files.values()}:
+                if refcount[digest] == 1:
+                    blob = self.object_path(digest)
+                    if blob.exists():
+                        unique += disk_size(blob.stat())
+            manifest_size = (
+                disk_size(snapshot.manifest_path.stat()) if snapshot.manifest_path else 0
+            )
+            result.append(
+                SnapshotUsage(
+                    snapshot=snapshot,
+                    logical_size=snapshot.logical_size,
+                    unique_size=unique,
+                    manifest_size=manifest_size,
+                )
+            )
+        return result
+
+    def total_size(self) -> int:
+        """Total bytes the store occupies on disk."""
+        if not self.root.exists():
+            return 0
+        return sum(disk_size(st) for _, _, st in iter_files(self.root))
+
+    def gc(
+        self,
+        keep_last: int | None = None,
+        max_age_days: int | None = None,
+        dry_run: bool = False,
+        force: bool = False,
+    ) -> GCResult:
+        """
+        Remove snapshots outside the retention policy and unreferenced blobs.
+
+        A snapshot is kept if it is among the newest ``keep_last`` snapshots
+        or younger than ``max_age_days``. With neither set, all snapshots are
+        kept and only orphaned blobs are removed. Holds the store lock, so a
+        concurrent create_snapshot() never loses the blobs it reuses or
+        writes before its manifest refers to them.
+
+        Raises:
+            ValueError: If keep_last is below 1 without ``force``
+        """
+        if keep_last is not None and keep_last < 1 and not force:
+            raise ValueError("keep_last must be at least 1 (use force to allow removing all)")
+        with store_lock(self.root):
+            result = GCResult()
+            snapshots = self.list_snapshots()
+
+            keep: list[Snapshot] = []
+            if keep_last is None and max_age_days is None:
+                keep = snapshots
+            else:
+                cutoff = (
+                    datetime.now() - timedelta(days=max_age_days)
+                    if max_age_days is not None
+                    else None
+                )
+                newest = set()
+                if keep_last:
+                    newest = {s.id for s in snapshots[-keep_last:]}
+                for snapshot in snapshots:
+                    if snapshot.id in newest or (cutoff and snapshot.created_at >= cutoff):
+                        keep.append(snapshot)
+                    else:
+                        result.removed_snapshots.append(snapshot.id)
+                        if not dry_run and snapshot.manifest_path:
+                            snapshot.manifest_path.unlink(missing_ok=True)
+
+            referenced = {e.hash for s in keep for e in s.files.values()}
+            if self.objects_dir.exists():
+                for rel, blob, st in iter_files(self.objects_dir):
+                    if blob.name.startswith("."):
+                        continue  # In-flight .tmp- file of a concurrent snapshot
+                    digest = rel.replace("/", "")
+                    if digest in referenced:
+                        continue
+                    result.removed_objects += 1
+                    result.freed_bytes += disk_size(st)
+                    if not dry_run:
+                        blob.unlink(missing_ok=True)
+            return result
+
+    def materialize(self, entry: FileEntry, dest: Path) -> None:
+        """
+        Write a stored file to dest, restoring its mode and mtime.
+
+        The file is written under a temporary name and renamed into place,
+        so a hard-linked destination is replaced rather than modified.
+        """
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".ccm-tmp-{dest.name}")
+        try:
+            self.engine.copy_bytes(self.object_path(entry.hash), tmp)
+            os.chmod(tmp, entry.mode)
+            os.utime(tmp, ns=(entry.mtime_ns, entry.mtime_ns))
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def _unchanged(entry: FileEntry, st: os.stat_result) -> bool:
+    """Check a manifest entry still matches a file's size and mtime."""
+    return entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns
+
+
+def _same_content(a: dict[str, FileEntry], b: dict[str, FileEntry]) -> bool:
+    """Check two manifests describe identical content and modes."""
+    if a.keys() != b.keys():
+        return False
+    return all(
+        a[p].hash == b[p].hash and a[p].mode == b[p].mode for p in a
+    )
@@ -0,0 +1,196 @@
+"""Import one source configuration into many target projects in parallel."""
+
+from __future__ import annotations
+
+import glob
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .config_manager import ConfigManager
+from .copier import DEFAULT_WORKERS
+from .planner import ResolvedSource
+from .skill_store import SkillStore
+from .tree_sync import SyncStats
+
+DEFAULT_PARALLEL = 4
+
+
+@dataclass
+class TargetResult:
+    """Outcome of importing into one target."""
+
+    target: Path
+    stats: SyncStats | None = None
+    error: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the import succeeded."""
+        return self.error is None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch import."""
+
+    results: list[TargetResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> list[TargetResult]:
+        """Targets imported successfully."""
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> list[TargetResult]:
+        """Targets whose import failed."""
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def totals(self) -> SyncStats:
+        """File statistics summed over successful targets."""
+        total = SyncStats()
+        for result in self.succeeded:
+            total += result.stats
+        total.seconds = self.seconds
+        return total
+
+    def summary(self, action: str = "imported") -> str:
+        """Generate summary string."""
+        totals = self.totals
+        rate = len(self.results) / self.seconds if self.seconds > 0 else 0.0
+        return (
+            f"{len(self.succeeded)}/{len(self.results)} targets {action}, "
+            f"{len(self.failed)} failed in {self.seconds:.2f}s "
+            f"({rate:.1f} targets/s, {totals.files_copied} files / "
+            f"{totals.bytes_copied / 1024 / 1024:.1f} MB copied, "
+            f"{totals.throughput / 1024 / 1024:.1f} MB/s)"
+        )
+
+
+def read_targets(
+    targets_file: Path | None = None, patterns: Iterable[str] = ()
+) -> list[Path]:
+    """
+    Collect target project directories.
+
+    Args:
+        targets_file: File with one directory or glob pattern per line
+            (blank lines and ``#`` comments ignored)
+        patterns: Additional glob patterns (``**`` is supported)
+
+    Returns:
+        Existing directories, deduplicated, in the order given
+    """
+    entries = list(patterns)
+    if targets_file is not None:
+        with open(targets_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    entries.append(line)
+
+    targets: list[Path] = []
+    seen = set()
+    for entry in entries:
+        expanded = os.path.expanduser(entry)
+        if glob.has_magic(expanded):
+            matches = sorted(glob.glob(expanded, recursive=True))
+        else:
+            matches = [expanded]
+        for match in matches:
+            path = Path(match).resolve()
+            if path.is_dir() and path not in seen:
+                seen.add(path)
+                targets.append(path)
+    return targets
+
+
+def import_batch(
+    source: ResolvedSource,
+    targets: list[Path],
+    strategy: str = "overwrite",
+    parallel: int = DEFAULT_PARALLEL,
+    workers: int | None = None,
+    copy_strategy: str = "auto",
+    skill_store: SkillStore | None = None,
+    on_result: Callable[[TargetResult], None] | None = None,
+) -> BatchResult:
+    """
+    Merge a resolved source into every target, several targets at a time.
+
+    Targets run on a thread pool of ``parallel`` threads; the copy workers
+    are divided between them so the total number of concurrent copies
+    stays near ``workers``. A failing target is recorded and does not
+    affect the others.
+
+    Args:
+        source: Source resolved once with ResolvedSource.resolve()
+        targets: Target project directories
+        strategy: 'overwrite' or 'merge'
+        parallel: Number of targets imported concurrently
+        workers: Total number of concurrent file copies
+        copy_strategy: Copy strategy for every target
+        skill_store: Store to link skills from instead of copying them
+        on_result: Called with each result as soon as its target finishes
+    """
+
+    def apply(target: Path, target_workers: int) -> SyncStats:
+        manager = ConfigManager(
+            target,
+            workers=target_workers,
+            copy_strategy=copy_strategy,
+            skill_store=skill_store,
+        )
+        return manager.merge_config(source, strategy=strategy)
+
+    return run_batch(targets, apply, parallel, workers, on_result)
+
+
+def run_batch(
+    targets: list[Path],
+    apply: Callable[[Path, int], SyncStats],
+    parallel: int = DEFAULT_PARALLEL,
+    workers: int | None = None,
+    on_result: Callable[[TargetResult], None] | None = None,
+) -> BatchResult:
+    """
+    Call ``apply(target, workers)`` for every target on a thread pool.
+
+    Runs ``parallel`` targets at a time and gives each an equal share of
+    ``workers`` copy workers. Exceptions are recorded as failed results.
+
+    Returns:
+        Results in the order of ``targets``
+    """
+    start = time.perf_counter()
+    parallel = max(1, min(parallel, len(targets) or 1))
+    per_target = max(1, (workers or DEFAULT_WORKERS) // parallel)
+
+    def run(target: Path) -> TargetResult:
+        target_start = time.perf_counter()
+        try:
+            result = TargetResult(target, stats=apply(target, per_target))
+        except Exception as e:
+            result = TargetResult(target, error=str(e) or type(e).__name__)
+        result.seconds = time.perf_counter() - target_start
+        return result
+
+    batch = BatchResult()
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        futures = [pool.submit(run, target) for target in targets]
+        for future in as_completed(futures):
+            result = future.result()
+            batch.results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    order = {target: i for i, target in enumerate(targets)}
+    batch.results.sort(key=lambda r: order[r.target])
+    batch.seconds = time.perf_counter() - start
+    return batch
@@ -0,0 +1,259 @@
+"""Self-contained binary bundle format (.ccmb) for exported configurations."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import struct
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from . import jsonio
+from .manifest import CHUNK_SIZE, hash_file
+
+BUNDLE_SUFFIX = ".ccmb"
+MAGIC = b"CCMB\x00\x01\x00\x00"
+FOOTER_MAGIC = b"CCMBEND\x00"
+FOOTER = struct.Struct("<QQ8s")
+FORMAT_VERSION = 1
+
+# Only keep the compressed form of a blob if it saves at least this much
+MIN_COMPRESSION_RATIO = 0.9
+
+
+def is_bundle(path: Path) -> bool:
+    """Check whether a file is a .ccmb bundle."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+@dataclass(frozen=True)
+class BundleFile:
+    """A file stored in a bundle."""
+
+    path: str
+    hash: str
+    size: int
+    mode: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class BlobLocation:
+    """Where a blob's bytes live inside the bundle."""
+
+    offset: int
+    length: int
+    codec: str
+
+
+class BundleWriter:
+    """
+    Writes a bundle: header, deduplicated blobs, JSON index, fixed footer.
+
+    Layout::
+
+        MAGIC (8 bytes)
+        blob data ...                  raw or zlib-compressed, back to back
+        index (JSON)                   manifest, files and blob offsets
+        footer (24 bytes)              index offset, index length, magic
+
+    Identical file contents are stored once. The bundle is written to a
+    temporary file and renamed into place by close().
+    """
+
+    def __init__(self, path: Path, compress: bool = True):
+        """Open a new bundle for writing."""
+        self.path = path
+        self.compress = compress
+        self._tmp = path.with_name(f".{path.name}.tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fp: BinaryIO = open(self._tmp, "wb")
+        self._fp.write(MAGIC)
+        self._offset = len(MAGIC)
+        self.files: dict[str, BundleFile] = {}
+        self.blobs: dict[str, BlobLocation] = {}
+
+    def __enter__(self) -> BundleWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+
+    def add_file(self, rel: str, path: Path) -> BundleFile:
+        """Add a file from disk under a relative path."""
+        st = os.stat(path)
+        digest = hash_file(path)
+        if digest not in self.blobs:
+            self._write_blob(digest, path, st.st_size)
+        entry = BundleFile(
+            path=rel,
+            hash=digest,
+            size=st.st_size,
+            mode=st.st_mode & 0o7777,
+            mtime_ns=st.st_mtime_ns,
+        )
+        self.files[rel] = entry
+        return entry
+
+    def _write_blob(self, digest: str, path: Path, size: int) -> None:
+        """Stream one blob into the bundle, compressing it when that pays off."""
+        start = self._offset
+        if self.compress and size:
+            encoder = zlib.compressobj(6)
+            with open(path, "rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    self._fp.write(encoder.compress(chunk))
+            self._fp.write(encoder.flush())
+            length = self._fp.tell() - start
+            if length < size * MIN_COMPRESSION_RATIO:
+                self.blobs[digest] = BlobLocation(start, length, "zlib")
+                self._offset += length
+                return
+            self._fp.seek(start)
+            self._fp.truncate()
+
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, self._fp, CHUNK_SIZE)
+        length = self._fp.tell() - start
+        self.blobs[digest] = BlobLocation(start, length, "raw")
+        self._offset += length
+
+    def close(self, manifest: dict[str, Any]) -> None:
+        """Write the index and footer and move the bundle into place."""
+        index = {
+            "format": FORMAT_VERSION,
+            **manifest,
+            "files": {
+                rel: [f.hash, f.size, f.mode, f.mtime_ns]
+                for rel, f in sorted(self.files.items())
+            },
+            "blobs": {
+                digest: [b.offset, b.length, b.codec]
+                for digest, b in self.blobs.items()
+            },
+        }
+        data = jsonio.dumps(index)
+        self._fp.write(data)
+        self._fp.write(FOOTER.pack(self._offset, len(data), FOOTER_MAGIC))
+        self._fp.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        """Discard a partially written bundle."""
+        self._fp.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class BundleReader:
+    """
+    Reads a bundle through a memory map.
+
+    Only the footer and index are parsed on open; file contents are read
+    from the mapping on demand, so extracting a few skills touches only
+    their blobs.
+    """
+
+    def __init__(self, path: Path):
+        """Open and map a bundle."""
+        self.path = path
+        self._fp = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # empty file
+            self._fp.close()
+            raise ValueError(f"Not a configuration bundle: {path}") from e
+
+        if self._mm[: len(MAGIC)] != MAGIC or len(self._mm) < len(MAGIC) + FOOTER.size:
+            self.close()
+            raise ValueError(f"Not a configuration bundle: {path}")
+        offset, length, magic = FOOTER.unpack(self._mm[-FOOTER.size :])
+        if magic != FOOTER_MAGIC:
+            self.close()
+            raise ValueError(f"Truncated configuration bundle: {path}")
+
+        self.index: dict[str, Any] = jsonio.loads(self._mm[offset : offset + length])
+        if self.index.get("format") != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported bundle format: {self.index.get('format')}")
+
+        self.files: dict[str, BundleFile] = {
+            rel: BundleFile(rel, *values) for rel, values in self.index["files"].items()
+        }
+        self.blobs: dict[str, BlobLocation] = {
+            digest: BlobLocation(*values) for digest, values in self.index["blobs"].items()
+        }
+
+    def __enter__(self) -> BundleReader:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the bundle."""
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._fp.close()
+
+    @property
+    def manifest(self) -> dict[str, Any]:
+        """Index fields other than the file and blob tables."""
+        return {k: v for k, v in self.index.items() if k not in ("files", "blobs")}
+
+    def iter_chunks(self, digest: str) -> Iterator[bytes]:
+        """Yield the decoded content of a blob in chunks."""
+        loc = self.blobs[digest]
+        view = memoryview(self._mm)[loc.offset : loc.offset + loc.length]
+        try:
+            if loc.codec == "raw":
+                for start in range(0, loc.length, CHUNK_SIZE):
+                    yield bytes(view[start : start + CHUNK_SIZE])
+            elif loc.codec == "zlib":
+                decoder = zlib.decompressobj()
+                for start in range(0, loc.length, CHUNK_SIZE):
+                    chunk = decoder.decompress(view[start : start + CHUNK_SIZE])
+                    if chunk:
+                        yield chunk
+                tail = decoder.flush()
+                if tail:
+                    yield tail
+            else:
+                raise ValueError(f"Unknown blob codec: {loc.codec}")
+        finally:
+            view.release()
+
+    def read(self, rel: str) -> bytes:
+        """Return the content of a stored file."""
+        return b"".join(self.iter_chunks(self.files[rel].hash))
+
+    def extract(self, rel: str, dest: Path) -> int:
+        """
+        Write a stored file to dest with its mode and mtime.
+
+        The file is written under a temporary name and renamed into place.
+        Returns the number of bytes written.
+        """
+        entry = self.files[rel]
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".ccm-tmp-{dest.name}")
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in self.iter_chunks(entry.hash):
+                    f.write(chunk)
+            os.chmod(tmp, entry.mode)
+            os.utime(tmp, ns=(entry.mtime_ns, entry.mtime_ns))
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return entry.size
@@ -3,29 +3,67 @@
 from __future__ import annotations
 
 import json
+import os
 import shutil
-from datetime import datetime
+import time
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import TYPE_CHECKING
-
-from .models import ExportedConfig, ExportMetadata, MCPConfig
-
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from . import jsonio
+from .backup_store import BackupStore, Snapshot
+from .bundle import BUNDLE_SUFFIX, BundleFile, BundleReader, BundleWriter, is_bundle
+from .copier import CopyEngine
+from .fingerprint import Fingerprint, MerkleNode, group_files, value_hash
+from .hash_cache import HashCache
+from .manifest import iter_files
+from .planner import ADD, DELETE, LINK, REPLACE, TOUCH, Plan, ResolvedSource, plan_merge
+from .restore import RestoreSource, restore_files
+from .restore import recover as recover_restore
+from .skill_store import SkillStore, detach, is_store_link
+from .snapshot import ProjectSnapshot
+from .stream import StreamFile, StreamReader, StreamWriter, is_stream
+from .tree_sync import SyncStats, prune_empty_dirs
+
+# Models are imported where they are used: pydantic is slow to import and
+# commands answered from caches (e.g. a cached validate) never need it
 if TYPE_CHECKING:
-    pass
+    from .models import ExportedConfig, MCPConfig
 
 
 class ConfigManager:
     """Manages Claude Code configuration files."""
 
-    def __init__(self, project_path: Path | None = None):
-        """Initialize with optional project path."""
+    def __init__(
+        self,
+        project_path: Path | None = None,
+        workers: int | None = None,
+        copy_strategy: str = "auto",
+        skill_store: SkillStore | None = None,
+    ):
+        """
+        Initialize with optional project path.
+
+        Args:
+            project_path: Project root (default: current directory)
+            workers: Number of concurrent file copies
+            copy_strategy: 'auto' (reflink, copy_file_range, then copy),
+                'hardlink' (for read-only skill trees) or 'copy'
+            skill_store: Global store that merged skills are linked from
+                (None = copy skills into the project)
+        """
         self.project_path = project_path or Path.cwd()
+        self.copier = CopyEngine(workers, copy_strategy)
+        self.skill_store = skill_store
         self.mcp_config_path = self.project_path / ".mcp.json"
         self.claude_dir = self.project_path / ".claude"
         self.skills_dir = self.claude_dir / "skills"
         self.hooks_dir = self.claude_dir / "hooks"
         self.output_styles_dir = self.claude_dir / "output-styles"
         self.env_example_path = self.project_path / ".env.example"
+        self.backup_root = self.project_path / ".backup-claude"
+        self.state_path = self.claude_dir / ".ccm-state.json"
+        self._snapshot: ProjectSnapshot | None = None
 
     def has_config(self) -> bool:
         """Check if project has Claude Code configuration."""
@@ -33,202 +71,878 @@ class ConfigManager:
 
     def read_mcp_config(self) -> MCPConfig:
         """Read MCP configuration from project."""
+        from .models import MCPConfig
+
         return MCPConfig.from_file(self.mcp_config_path)
 
-    def write_mcp_config(self, config: MCPConfig) -> None:
-        """Write MCP configuration to project."""
-        config.to_file(self.mcp_config_path)
+    def write_mcp_config(self, config: MCPConfig) -> bool:
+        """
+        Write MCP configuration to project, unless it is unchanged on disk.
+
+        Returns:
+            Whether .mcp.json was written
+        """
+        written = config.to_file(self.mcp_config_path)
+        if written:
+            self.invalidate_snapshot()
+        return written
+
+    def read_state(self) -> dict:
+        """Read tool state recorded in the project (e.g. copy strategy)."""
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def update_state(self, **values) -> bool:
+        """
+        Record tool state in the project, writing only on change.
+
+        Returns:
+            Whether the state file was written
+        """
+        state = self.read_state()
+        if all(state.get(k) == v for k, v in values.items()):
+            return False
+        state.update(values)
+        data = (json.dumps(state, indent=2, sort_keys=True) + "\n").encode("utf-8")
+        written = jsonio.write_if_changed(self.state_path, data)
+        if written:
+            self.invalidate_snapshot()
+        return written
+
+    @property
+    def copy_strategy(self) -> str:
+        """Copy strategy recorded for this project's installed files."""
+        return self.read_state().get("copy_strategy", "copy")
+
+    def snapshot(self) -> ProjectSnapshot:
+        """
+        Return a scan of the project's configuration layout.
+
+        The scan is cached and redone only when a scanned directory's mtime
+        changes or the cache is invalidated by a write through this manager.
+        """
+        if self._snapshot is None or self._snapshot.is_stale():
+            self._snapshot = ProjectSnapshot.scan(self.project_path)
+        return self._snapshot
+
+    def invalidate_snapshot(self) -> None:
+        """Drop the cached layout scan after modifying files."""
+        self._snapshot = None
 
     def list_skills(self) -> list[str]:
         """List all installed skills."""
-        if not self.skills_dir.exists():
-            return []
-        return [
-            d.name
-            for d in self.skills_dir.iterdir()
-            if d.is_dir() and not d.name.startswith(".")
-        ]
+        return self.snapshot().skills()
 
     def list_hooks(self) -> list[str]:
         """List all hooks."""
-        if not self.hooks_dir.exists():
-            return []
-        return [f.name for f in self.hooks_dir.iterdir() if f.is_file()]
+        return self.snapshot().hooks()
 
     def list_output_styles(self) -> list[str]:
         """List all output styles."""
-        if not self.output_styles_dir.exists():
-            return []
-        return [f.name for f in self.output_styles_dir.iterdir() if f.is_file()]
+        return self.snapshot().output_styles()
 
-    def backup(self, suffix: str | None = None) -> Path:
-        """Create backup of current configuration."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        suffix = suffix or timestamp
-        backup_dir = self.project_path / f".backup-claude-{suffix}"
-        backup_dir.mkdir(parents=True, exist_ok=True)
-
-        # Backup .mcp.json
-        if self.mcp_config_path.exists():
-            shutil.copy2(self.mcp_config_path, backup_dir / ".mcp.json")
-
-        # Backup .claude directory
-        if self.claude_dir.exists():
-            shutil.copytree(
-                self.claude_dir,
-                backup_dir / ".claude",
-                dirs_exist_ok=True,
-            )
+    @property
+    def backup_store(self) -> BackupStore:
+        """Content-addressed store holding this project's backups."""
+        return BackupStore(self.backup_root, self.copier)
 
-        # Backup .env.example
-        if self.env_example_path.exists():
-            shutil.copy2(self.env_example_path, backup_dir / ".env.example")
-
-        return backup_dir
-
-    def restore_from_backup(self, backup_dir: Path) -> None:
-        """Restore configuration from backup."""
-        mcp_backup = backup_dir / ".mcp.json"
-        claude_backup = backup_dir / ".claude"
-        env_backup = backup_dir / ".env.example"
-
-        if mcp_backup.exists():
-            shutil.copy2(mcp_backup, self.mcp_config_path)
+    def backup(self, suffix: str | None = None) -> Path:
+        """
+        Create backup of current configuration.
 
-        if claude_backup.exists():
-            if self.claude_dir.exists():
-                shutil.rmtree(self.claude_dir)
-            shutil.copytree(claude_backup, self.claude_dir)
+        Only file contents not already present in the backup store are
+        written. Returns the path of the snapshot manifest.
+        """
+        recover_restore(self.project_path)
+        snapshot = self.backup_store.create_snapshot(
+            [
+                (".mcp.json", self.mcp_config_path),
+                (".claude", self.claude_dir),
+                (".env.example", self.env_example_path),
+            ],
+            snapshot_id=suffix,
+        )
+        return snapshot.manifest_path
 
-        if env_backup.exists():
-            shutil.copy2(env_backup, self.env_example_path)
+    def restore_from_backup(self, backup: Path) -> SyncStats:
+        """
+        Restore configuration from backup.
+
+        Accepts a snapshot manifest written by backup() or a legacy
+        ``.backup-claude-<timestamp>`` directory. Only files that differ
+        from the live project are copied; they are staged first and
+        swapped in with atomic renames behind a journal, so an interrupted
+        restore is completed on the next run instead of leaving the
+        project half-restored. Readers running during the restore are not
+        isolated from it (see restore_files()).
+        """
+        self._detach_store_links()
+        store = self.backup_store
+        latest = store.latest()
+        known = latest.files if latest else {}
+
+        if backup.is_file():
+            snapshot = Snapshot.from_file(backup)
+            sources = {
+                rel: RestoreSource(
+                    path=store.object_path(entry.hash),
+                    size=entry.size,
+                    mode=entry.mode,
+                    mtime_ns=entry.mtime_ns,
+                    hash=entry.hash,
+                )
+                for rel, entry in snapshot.files.items()
+            }
+        else:
+            sources = {}
+            for name in (".mcp.json", ".claude", ".env.example"):
+                path = backup / name
+                if path.is_dir():
+                    walked = iter_files(path, f"{name}/")
+                elif path.is_file():
+                    walked = [(name, path, path.stat())]
+                else:
+                    continue
+                for rel, abs_path, st in walked:
+                    sources[rel] = RestoreSource(
+                        path=abs_path,
+                        size=st.st_size,
+                        mode=st.st_mode & 0o7777,
+                        mtime_ns=st.st_mtime_ns,
+                    )
+
+        scopes = [".claude/"] if any(r.startswith(".claude/") for r in sources) else []
+        stats = restore_files(self.project_path, sources, scopes, self.copier, known)
+        self.invalidate_snapshot()
+        return stats
 
     def merge_config(
         self,
-        source: ConfigManager,
+        source: ConfigManager | ResolvedSource,
         strategy: str = "overwrite",
         mcp_servers: list[str] | None = None,
         skills: list[str] | None = None,
-    ) -> None:
+    ) -> SyncStats:
         """
         Merge configuration from source into this project.
 
+        Plans the changes first (see plan_merge()) and applies exactly those
+        operations, so re-applying an up-to-date configuration neither
+        writes a file nor takes a backup.
+
         Args:
-            source: Source configuration manager
+            source: Source configuration manager, or a source already
+                resolved with ResolvedSource.resolve() (the selection
+                arguments are then ignored)
             strategy: 'overwrite' (backup and replace) or 'merge' (combine)
             mcp_servers: Specific MCP servers to include (None = all)
             skills: Specific skills to include (None = all)
+
+        Returns:
+            Statistics about the files copied and removed
         """
-        # Always backup first
-        self.backup()
+        return self.apply_plan(self.plan_merge(source, strategy, mcp_servers, skills))
 
-        # Handle MCP config
-        source_mcp = source.read_mcp_config()
-        if mcp_servers:
-            source_mcp = source_mcp.filter_servers(mcp_servers)
+    def plan_merge(
+        self,
+        source: ConfigManager | ResolvedSource,
+        strategy: str = "overwrite",
+        mcp_servers: list[str] | None = None,
+        skills: list[str] | None = None,
+    ) -> Plan:
+        """Compute the operations merge_config() would perform, without writing."""
+        if not isinstance(source, ResolvedSource):
+            source = ResolvedSource.resolve(source, mcp_servers, skills or None)
+        return plan_merge(self, source, strategy)
 
-        if strategy == "merge" and self.mcp_config_path.exists():
-            current_mcp = self.read_mcp_config()
-            merged_mcp = current_mcp.merge(source_mcp)
-            self.write_mcp_config(merged_mcp)
+    def apply_plan(self, plan: Plan) -> SyncStats:
+        """
+        Execute a plan computed for this project.
+
+        Takes a backup first unless the plan is empty or the project has
+        no configuration yet. Files are copied with the project's copy
+        engine; LINK operations store the skill in the skill store and
+        link it into the project.
+        """
+        start = time.perf_counter()
+        stats = SyncStats()
+        if not plan:
+            return stats
+
+        # A brand-new project has nothing worth a snapshot
+        if self.has_config() or self.env_example_path.exists():
+            self.backup()
+
+        copies: list[tuple[Path, Path]] = []
+        deletes: list[str] = []
+        linked: dict[str, str] = {}
+        for op in plan.operations:
+            dest = self.project_path / op.path
+            if op.path == ".mcp.json":
+                self.write_mcp_config(plan.mcp_config)
+            elif op.action in (ADD, REPLACE):
+                if dest.is_dir() and not dest.is_symlink():
+                    shutil.rmtree(dest)
+                copies.append((op.source, dest))
+            elif op.action == TOUCH:
+                if dest.stat().st_nlink > 1:
+                    # Hard-linked (e.g. from the skill store): metadata is
+                    # shared with the other links, so write a copy instead
+                    copies.append((op.source, dest))
+                    continue
+                shutil.copystat(op.source, dest)
+                stats.files_unchanged += 1
+            elif op.action == DELETE:
+                dest.unlink(missing_ok=True)
+                deletes.append(op.path)
+            elif op.action == LINK:
+                tree = self.skill_store.add_tree(plan.links[op.path])
+                stats.files_linked += self.skill_store.link(tree, dest)
+                linked[dest.name] = tree
+
+        if copies:
+            copied = self.copier.copy_files(copies)
+            stats.files_copied = copied.files
+            stats.bytes_copied = copied.bytes
+            self.update_state(copy_strategy=self.copier.strategy)
+        if linked:
+            self.skill_store.register(self.project_path, linked)
+            self.update_state(skill_store=self.skill_store.link_mode)
+        prune_empty_dirs(self.project_path, {str(Path(rel).parent) for rel in deletes})
+        stats.files_deleted = len(deletes)
+
+        self.invalidate_snapshot()
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def export_config(
+        self,
+        output_path: Path,
+        profile_name: str | None = None,
+        mcp_servers: list[str] | None = None,
+        skills: list[str] | None = None,
+        compress: bool = True,
+        base: Path | None = None,
+    ) -> ExportedConfig:
+        """
+        Export configuration to a single file.
+
+        A ``.ccmb`` output path produces a self-contained bundle that also
+        carries the contents of the selected skills, hooks and output
+        styles; any other path produces a JSON summary.
+
+        With ``base`` (a previous JSON export or bundle) a delta bundle is
+        written instead; see export_delta().
+        """
+        exported = self._build_export(profile_name, mcp_servers, skills)
+
+        if base is not None:
+            if output_path.suffix != BUNDLE_SUFFIX:
+                raise ValueError(f"Delta exports must be written to a {BUNDLE_SUFFIX} file")
+            self.export_delta(output_path, base, exported, compress=compress)
+        elif output_path.suffix == BUNDLE_SUFFIX:
+            with BundleWriter(output_path, compress=compress) as writer:
+                for rel, path in self._export_files(exported.skills):
+                    writer.add_file(rel, path)
+                writer.close({"kind": "full", **exported.model_dump(mode="json")})
         else:
-            self.write_mcp_config(source_mcp)
+            exported.to_file(output_path)
+        return exported
+
+    def export_delta(
+        self,
+        output_path: Path,
+        base_path: Path,
+        exported: ExportedConfig,
+        compress: bool = True,
+    ) -> Fingerprint:
+        """
+        Write a delta bundle holding only what changed since a base export.
 
-        # Handle skills
-        source_skills = skills or source.list_skills()
-        self.skills_dir.mkdir(parents=True, exist_ok=True)
+        The delta records the added/changed/removed MCP servers and env
+        keys, the changed skill, hook and output style files, and the
+        fingerprint of the base. Skill files can only be compared against
+        a bundle base; a JSON base covers servers and env keys only.
 
-        for skill in source_skills:
-            source_skill_dir = source.skills_dir / skill
-            if source_skill_dir.exists():
-                target_skill_dir = self.skills_dir / skill
-                if target_skill_dir.exists():
-                    shutil.rmtree(target_skill_dir)
-                shutil.copytree(source_skill_dir, target_skill_dir)
+        Returns the base fingerprint.
+        """
+        base, base_files = _load_base(base_path)
+        base_servers = base.mcp_config.get("mcpServers", {})
+        current_servers = exported.mcp_config.get("mcpServers", {})
+
+        prefixes = []
+        current_files: dict[str, str] = {}
+        if base_files is not None:
+            prefixes = _file_prefixes(base.skills, base_files)
+            new_prefixes = [
+                f".claude/skills/{skill}/"
+                for skill in exported.skills
+                if f".claude/skills/{skill}/" not in prefixes
+            ]
+            current_files = self._file_hashes(prefixes + new_prefixes)
+        base_fp = Fingerprint.build(
+            base_servers,
+            base.env_template,
+            group_files(base_files or {}, prefixes),
+        )
 
-        # Copy hooks if not exists
-        if source.hooks_dir.exists() and not self.hooks_dir.exists():
-            shutil.copytree(source.hooks_dir, self.hooks_dir)
+        manifest = {
+            "kind": "delta",
+            "metadata": exported.metadata.model_dump(mode="json"),
+            "base": {
+                "root": base_fp.root,
+                "groups": base_fp.group_roots(),
+                "servers": sorted(base_servers),
+                "env": sorted(base.env_template),
+            },
+            "servers": _diff_values(base_servers, current_servers),
+            "env": _diff_values(base.env_template, exported.env_template),
+            "remove": sorted(set(base_files or {}) - set(current_files)),
+        }
+        with BundleWriter(output_path, compress=compress) as writer:
+            for rel, digest in sorted(current_files.items()):
+                if (base_files or {}).get(rel) != digest:
+                    writer.add_file(rel, self.project_path / rel)
+            writer.close(manifest)
+        return base_fp
+
+    def fingerprint(
+        self,
+        servers: list[str] | None = None,
+        env_keys: list[str] | None = None,
+        prefixes: list[str] | None = None,
+    ) -> Fingerprint:
+        """
+        Fingerprint the project's current configuration.
 
-        # Copy output styles if not exists
-        if source.output_styles_dir.exists() and not self.output_styles_dir.exists():
-            shutil.copytree(source.output_styles_dir, self.output_styles_dir)
+        Args:
+            servers: Only include these MCP servers (None = all)
+            env_keys: Only include these .env.example keys (None = all)
+            prefixes: File directories to include, e.g. ``.claude/skills/foo/``
+        """
+        current_servers = {
+            name: server.model_dump(exclude_none=True)
+            for name, server in self.read_mcp_config().mcpServers.items()
+            if servers is None or name in servers
+        }
+        env = {
+            key: value
+            for key, value in self._read_env_example().items()
+            if env_keys is None or key in env_keys
+        }
+        prefixes = prefixes or []
+        return Fingerprint.build(
+            current_servers, env, group_files(self._file_hashes(prefixes), prefixes)
+        )
 
-        # Copy .env.example if not exists
-        if source.env_example_path.exists() and not self.env_example_path.exists():
-            shutil.copy2(source.env_example_path, self.env_example_path)
+    def merkle(
+        self,
+        servers: list[str] | None = None,
+        skills: list[str] | None = None,
+    ) -> MerkleNode:
+        """
+        Build the Merkle tree of the project's servers and skills.
 
-    def export_config(
+        Leaves are ``servers/<name>`` (canonical config hash) and
+        ``skills/<skill>/<path>`` (content hash, served from the hash cache
+        while the file's size and mtime are unchanged). The ``servers`` and
+        ``skills`` nodes exist even in a project without either.
+
+        Args:
+            servers: Only include these MCP servers (None = all)
+            skills: Only include these skills (None = all installed)
+        """
+        items = {
+            f"servers/{name}": value_hash(server.model_dump(exclude_none=True))
+            for name, server in self.read_mcp_config().mcpServers.items()
+            if servers is None or name in servers
+        }
+        skills = self.list_skills() if skills is None else skills
+        prefixes = [f".claude/skills/{skill}/" for skill in skills if (self.skills_dir / skill).is_dir()]
+        for rel, digest in self._file_hashes(prefixes).items():
+            items[rel.removeprefix(".claude/")] = digest
+        return MerkleNode.from_items(items, dirs=("servers", "skills"))
+
+    def _file_hashes(self, prefixes: list[str]) -> dict[str, str]:
+        """Hash the files below the given relative directory prefixes, using the hash cache."""
+        cache = HashCache(self.project_path)
+        files = self._scan_prefixes(prefixes)
+        digests = self.copier.map(lambda rel: cache.hash(rel, files[rel]), list(files))
+        cache.save()
+        return dict(zip(files, digests))
+
+    def export_stream(
         self,
-        output_path: Path,
+        fp: BinaryIO,
         profile_name: str | None = None,
         mcp_servers: list[str] | None = None,
         skills: list[str] | None = None,
+        compression: str = "gzip",
+    ) -> ExportedConfig:
+        """
+        Write configuration and file contents as a stream (e.g. to stdout).
+
+        Files are read and written one chunk at a time, so memory use does
+        not depend on the size of the exported skills.
+        """
+        exported = self._build_export(profile_name, mcp_servers, skills)
+        writer = StreamWriter(fp, compression=compression)
+        writer.write_manifest(exported.model_dump(mode="json"))
+        for rel, path in self._export_files(exported.skills):
+            writer.add_file(rel, path)
+        writer.close()
+        return exported
+
+    def _build_export(
+        self,
+        profile_name: str | None,
+        mcp_servers: list[str] | None,
+        skills: list[str] | None,
     ) -> ExportedConfig:
-        """Export configuration to a single file."""
+        """Collect the exported configuration summary."""
+        from .models import ExportedConfig, ExportMetadata
+
         mcp_config = self.read_mcp_config()
         if mcp_servers:
             mcp_config = mcp_config.filter_servers(mcp_servers)
 
-        selected_skills = skills or self.list_skills()
-
-        # Read env template
-        env_template = {}
-        if self.env_example_path.exists():
-            with open(self.env_example_path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#") and "=" in line:
-                        key, value = line.split("=", 1)
-                        env_template[key.strip()] = value.strip()
-
-        exported = ExportedConfig(
+        return ExportedConfig(
             metadata=ExportMetadata(
                 profile=profile_name,
                 source_path=str(self.project_path),
             ),
             mcp_config=mcp_config.model_dump(exclude_none=True),
-            skills=selected_skills,
-            env_template=env_template,
+            skills=skills or self.list_skills(),
+            env_template=self._read_env_example(),
             hooks=self.list_hooks(),
             output_styles=self.list_output_styles(),
         )
 
-        exported.to_file(output_path)
-        return exported
+    def _export_files(self, skills: list[str]) -> Iterator[tuple[str, Path]]:
+        """Yield (relative path, absolute path) of files carried by a bundle."""
+        for skill in skills:
+            for rel, path, _ in iter_files(
+                self.skills_dir / skill, f".claude/skills/{skill}/"
+            ):
+                yield rel, path
+        for directory in (self.hooks_dir, self.output_styles_dir):
+            for rel, path, _ in iter_files(directory, f".claude/{directory.name}/"):
+                yield rel, path
+
+    def import_config(
+        self,
+        config_path: Path,
+        strategy: str = "overwrite",
+        mcp_servers: list[str] | None = None,
+        skills: list[str] | None = None,
+    ) -> SyncStats:
+        """
+        Import configuration from exported file.
 
-    def import_config(self, config_path: Path, strategy: str = "overwrite") -> None:
-        """Import configuration from exported file."""
-        exported = ExportedConfig.from_file(config_path)
+        Bundles (``.ccmb``) and saved streams also restore skill, hook and
+        output style files; only the selected skills are read. Delta
+        bundles are applied as a whole (see _apply_delta) and ignore the
+        strategy and filters.
 
-        # Backup first
-        self.backup()
+        Args:
+            config_path: Exported JSON file or bundle
+            strategy: 'overwrite' (backup and replace) or 'merge' (combine)
+            mcp_servers: Specific MCP servers to include (None = all)
+            skills: Specific skills to include (None = all in the export)
+
+        Raises:
+            ValueError: If the export holds a path outside the project or an
+                invalid skill name
+        """
+        from .models import ExportedConfig
+
+        if is_bundle(config_path):
+            with BundleReader(config_path) as reader:
+                if reader.manifest.get("kind") == "delta":
+                    return self._apply_delta(reader)
+                exported = ExportedConfig.model_validate(reader.manifest)
+                selected = skills or exported.skills
+                guard = _ImportPaths(self)
+                guard.check_skills(selected)
+                guard.check_all(reader.files)
+                self._apply_exported(exported, strategy, mcp_servers)
+                stats = self._extract_bundle(reader, selected)
+        elif is_stream(config_path):
+            with open(config_path, "rb") as f:
+                return self.import_stream(f, strategy, mcp_servers, skills)
+        else:
+            exported = ExportedConfig.from_file(config_path)
+            self._apply_exported(exported, strategy, mcp_servers)
+            stats = SyncStats()
+
+        self.invalidate_snapshot()
+        return stats
+
+    def _apply_exported(
+        self,
+        exported: ExportedConfig,
+        strategy: str,
+        mcp_servers: list[str] | None,
+    ) -> None:
+        """Back up, then write the MCP config and env template of an export."""
+        from .models import MCPConfig
+
+        # Backup first; a brand-new project has nothing worth a snapshot
+        if self.has_config() or self.env_example_path.exists():
+            self.backup()
+        self._detach_store_links()
 
         # Write MCP config
         mcp_config = MCPConfig.model_validate(exported.mcp_config)
-        if strategy == "merge" and self.mcp_config_path.exists():
-            current = self.read_mcp_config()
+        if mcp_servers:
+            mcp_config = mcp_config.filter_servers(mcp_servers)
+        current = self.read_mcp_config() if self.mcp_config_path.exists() else None
+        if strategy == "merge" and current is not None:
             mcp_config = current.merge(mcp_config)
-        self.write_mcp_config(mcp_config)
+        if mcp_config != current:
+            self.write_mcp_config(mcp_config)
 
         # Update .env.example
         if exported.env_template:
             self._update_env_example(exported.env_template)
 
-    def _update_env_example(self, template: dict[str, str]) -> None:
-        """Update .env.example with template values."""
-        existing = {}
-        if self.env_example_path.exists():
-            with open(self.env_example_path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#") and "=" in line:
-                        key, value = line.split("=", 1)
-                        existing[key.strip()] = value.strip()
+    def import_stream(
+        self,
+        fp: BinaryIO,
+        strategy: str = "overwrite",
+        mcp_servers: list[str] | None = None,
+        skills: list[str] | None = None,
+    ) -> SyncStats:
+        """
+        Import configuration from a stream written by export_stream().
+
+        Files are applied as their records arrive; content of files that
+        are not selected or already up to date is skipped unread.
+
+        Raises:
+            ValueError: If the stream holds an invalid skill name, or a path
+                outside the project (files before it have already been applied)
+        """
+        from .models import ExportedConfig
+
+        start = time.perf_counter()
+        reader = StreamReader(fp)
+        exported = ExportedConfig.model_validate(reader.manifest)
+        selected = skills or exported.skills
+        guard = _ImportPaths(self)
+        guard.check_skills(selected)
+        self._apply_exported(exported, strategy, mcp_servers)
+
+        stats = SyncStats()
+        prefixes = self._import_prefixes(selected)
+        target = self._scan_prefixes(prefixes)
+        seen = set()
+        for entry in reader:
+            guard.check(entry.path)
+            if not any(entry.path.startswith(prefix) for prefix in prefixes):
+                continue
+            seen.add(entry.path)
+            if _is_current(target.get(entry.path), entry):
+                stats.files_unchanged += 1
+                continue
+            stats.bytes_copied += reader.extract(entry, self.project_path / entry.path)
+            stats.files_copied += 1
+
+        self._finish_import(stats, target, seen, start)
+        return stats
+
+    def _import_prefixes(self, skills: list[str]) -> list[str]:
+        """Relative path prefixes an import may write: skills plus missing hooks/styles."""
+        prefixes = [f".claude/skills/{skill}/" for skill in skills]
+        for directory in (self.hooks_dir, self.output_styles_dir):
+            if not directory.exists():
+                prefixes.append(f".claude/{directory.name}/")
+        return prefixes
+
+    def _scan_prefixes(self, prefixes: list[str]) -> dict[str, os.stat_result]:
+        """Stat the files currently present below the given prefixes."""
+        target = {}
+        for prefix in prefixes:
+            name = prefix.rstrip("/")
+            for rel, _, st in iter_files(self.project_path / name, prefix):
+                target[rel] = st
+        return target
+
+    def _finish_import(
+        self,
+        stats: SyncStats,
+        target: dict[str, os.stat_result],
+        imported: set[str],
+        start: float,
+    ) -> None:
+        """Remove stale files below the imported prefixes and record timing."""
+        stale = [rel for rel in target if rel not in imported]
+        for rel in stale:
+            (self.project_path / rel).unlink(missing_ok=True)
+        prune_empty_dirs(self.project_path, {str(Path(rel).parent) for rel in stale})
+        stats.files_deleted = len(stale)
+
+        if stats.files_copied:
+            self.update_state(copy_strategy="copy")
+        self.invalidate_snapshot()
+        stats.seconds = time.perf_counter() - start
+
+    def _apply_delta(self, reader: BundleReader) -> SyncStats:
+        """
+        Apply a delta bundle if the project still matches its base.
+
+        Raises:
+            BaseMismatchError: If the project's fingerprint differs from the
+                delta's base; nothing is modified in that case.
+            ValueError: If the delta writes or removes a path outside the
+                project; nothing is modified in that case.
+        """
+        start = time.perf_counter()
+        manifest = reader.manifest
+        guard = _ImportPaths(self)
+        guard.check_all(reader.files)
+        guard.check_all(manifest["remove"])
+        base = manifest["base"]
+        prefixes = [f"{group}/" for group in base["groups"] if group.startswith(".claude/")]
+        current = self.fingerprint(base["servers"], base["env"], prefixes)
+        if current.root != base["root"]:
+            raise BaseMismatchError(current.differing_groups(base["groups"]))
+
+        self.backup()
+        self._detach_store_links()
+
+        mcp_config = self.read_mcp_config()
+        servers = _apply_diff(
+            {name: s.model_dump(exclude_none=True) for name, s in mcp_config.mcpServers.items()},
+            manifest["servers"],
+        )
+        from .models import MCPConfig
+
+        updated = MCPConfig.model_validate({"mcpServers": servers})
+        if updated != mcp_config:
+            self.write_mcp_config(updated)
+
+        env = self._read_env_example()
+        updated_env = _apply_diff(env, manifest["env"])
+        if updated_env != env:
+            self._write_env_example(updated_env)
+
+        stats = SyncStats()
+        writes = sorted(reader.files)
+        sizes = self.copier.map(
+            lambda rel: reader.extract(rel, self.project_path / rel), writes
+        )
+        stats.files_copied = len(writes)
+        stats.bytes_copied = sum(sizes)
+        for rel in manifest["remove"]:
+            (self.project_path / rel).unlink(missing_ok=True)
+        prune_empty_dirs(
+            self.project_path, {str(Path(rel).parent) for rel in manifest["remove"]}
+        )
+        stats.files_deleted = len(manifest["remove"])
+
+        if stats.files_copied:
+            self.update_state(copy_strategy="copy")
+        self.invalidate_snapshot()
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def _extract_bundle(self, reader: BundleReader, skills: list[str]) -> SyncStats:
+        """
+        Bring selected skills (and missing hooks/output styles) in line with a bundle.
+
+        Files whose size and mtime already match are skipped; stale files
+        inside an imported skill are removed.
+        """
+        start = time.perf_counter()
+        stats = SyncStats()
+        prefixes = self._import_prefixes(skills)
+        wanted = {
+            rel
+            for rel in reader.files
+            if any(rel.startswith(prefix) for prefix in prefixes)
+        }
+        target = self._scan_prefixes(prefixes)
+
+        writes = []
+        for rel in sorted(wanted):
+            if _is_current(target.get(rel), reader.files[rel]):
+                stats.files_unchanged += 1
+            else:
+                writes.append(rel)
+
+        sizes = self.copier.map(
+            lambda rel: reader.extract(rel, self.project_path / rel), writes
+        )
+        stats.files_copied = len(writes)
+        stats.bytes_copied = sum(sizes)
+
+        self._finish_import(stats, target, wanted, start)
+        return stats
+
+    def _detach_store_links(self) -> None:
+        """Turn skills symlinked from a skill store into directories that can be written."""
+        if not self.skills_dir.is_dir():
+            return
+        for entry in os.scandir(self.skills_dir):
+            path = Path(entry.path)
+            if is_store_link(path):
+                detach(path)
+                self.invalidate_snapshot()
+
+    def _read_env_example(self) -> dict[str, str]:
+        """Parse KEY=VALUE lines of .env.example."""
+        return read_env_file(self.env_example_path)
+
+    def _update_env_example(self, template: dict[str, str]) -> bool:
+        """Update .env.example with template values; returns whether it was written."""
+        existing = self._read_env_example()
 
         merged = {**existing, **template}
 
-        with open(self.env_example_path, "w", encoding="utf-8") as f:
-            f.write("# Claude Code Configuration Environment Variables\n\n")
-            for key, value in sorted(merged.items()):
-                f.write(f"{key}={value}\n")
+        return self._write_env_example(merged)
+
+    def _write_env_example(self, values: dict[str, str]) -> bool:
+        """Write .env.example with the given values, sorted by key, unless unchanged."""
+        lines = ["# Claude Code Configuration Environment Variables\n\n"]
+        lines += [f"{key}={value}\n" for key, value in sorted(values.items())]
+        return jsonio.write_if_changed(self.env_example_path, "".join(lines).encode("utf-8"))
+
+
+def read_env_file(path: Path) -> dict[str, str]:
+    """Parse KEY=VALUE lines of an env file (missing file = empty)."""
+    values = {}
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip()
+    return values
+
+
+class BaseMismatchError(ValueError):
+    """A delta's base does not match the project it is applied to."""
+
+    def __init__(self, groups: list[str]):
+        self.groups = groups
+        super().__init__(
+            "Project does not match the delta's base "
+            f"(differs in: {', '.join(groups) or 'unknown'}); nothing was changed"
+        )
+
+
+class _ImportPaths:
+    """
+    Guard against imports writing outside a project.
+
+    Paths and skill names come from the export being imported and are not
+    trusted: each path must be relative, free of ``.`` and ``..``
+    components, and its directory must resolve inside the project, so
+    neither traversal nor a symlinked directory can redirect a write or
+    a removal.
+    """
+
+    def __init__(self, config: ConfigManager):
+        self.config = config
+        self.root = config.project_path.resolve()
+        self._dirs: dict[str, bool] = {}
+
+    def check(self, rel: str) -> str:
+        """
+        Validate a project-relative path and return it.
+
+        Raises:
+            ValueError: If the path is absolute, not normalized or leads outside the project
+        """
+        parts = rel.replace(os.sep, "/").split("/")
+        if os.path.isabs(rel) or os.path.splitdrive(rel)[0] or any(
+            part in ("", ".", "..") for part in parts
+        ):
+            raise ValueError(f"Unsafe path in import: {rel!r}")
+        parent = "/".join(parts[:-1])
+        if (
+            len(parts) > 3
+            and parts[:2] == [".claude", "skills"]
+            and is_store_link(self.config.skills_dir / parts[2])
+        ):
+            parent = ".claude/skills"  # Store links are detached before anything is written
+        inside = self._dirs.get(parent)
+        if inside is None:
+            inside = self._dirs[parent] = (
+                (self.config.project_path / parent).resolve().is_relative_to(self.root)
+            )
+        if not inside:
+            raise ValueError(f"Import path {rel!r} resolves outside {self.config.project_path}")
+        return rel
+
+    def check_all(self, rels: Iterable[str]) -> None:
+        """Validate every path (see check())."""
+        for rel in rels:
+            self.check(rel)
+
+    def check_skills(self, names: Iterable[str]) -> None:
+        """
+        Validate skill names, each of which must be a single path component.
+
+        Raises:
+            ValueError: On the first invalid name
+        """
+        for name in names:
+            if name in ("", ".", "..") or "/" in name or os.sep in name:
+                raise ValueError(f"Invalid skill name in import: {name!r}")
+
+
+def _load_base(path: Path) -> tuple[ExportedConfig, dict[str, str] | None]:
+    """Load a base export and, for bundles, its file hashes."""
+    from .models import ExportedConfig
+
+    if is_bundle(path):
+        with BundleReader(path) as reader:
+            if reader.manifest.get("kind") == "delta":
+                raise ValueError(f"Base must be a full export, not a delta: {path}")
+            exported = ExportedConfig.model_validate(reader.manifest)
+            return exported, {rel: f.hash for rel, f in reader.files.items()}
+    return ExportedConfig.from_file(path), None
+
+
+def _file_prefixes(skills: list[str], files: dict[str, str]) -> list[str]:
+    """File directories covered by a base bundle."""
+    prefixes = [f".claude/skills/{skill}/" for skill in skills]
+    for name in ("hooks", "output-styles"):
+        prefix = f".claude/{name}/"
+        if any(rel.startswith(prefix) for rel in files):
+            prefixes.append(prefix)
+    return prefixes
+
+
+def _diff_values(base: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """Changed/added values and removed keys between two mappings."""
+    return {
+        "set": {
+            key: value
+            for key, value in sorted(current.items())
+            if key not in base or value_hash(base[key]) != value_hash(value)
+        },
+        "remove": sorted(base.keys() - current.keys()),
+    }
+
+
+def _apply_diff(values: dict[str, Any], diff: dict[str, Any]) -> dict[str, Any]:
+    """Apply a diff produced by _diff_values."""
+    result = {key: value for key, value in values.items() if key not in diff["remove"]}
+    result.update(diff["set"])
+    return result
+
+
+def _is_current(st: os.stat_result | None, entry: BundleFile | StreamFile) -> bool:
+    """Check whether a target file already matches an imported file's metadata."""
+    return (
+        st is not None
+        and st.st_size == entry.size
+        and st.st_mtime_ns == entry.mtime_ns
+        and st.st_mode & 0o7777 == entry.mode
+    )
@@ -0,0 +1,324 @@
+"""Skill dependency graph: transitive closure, install order and cycles."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+SERVER = "server"
+SKILL = "skill"
+
+
+@dataclass(frozen=True)
+class MissingDependency:
+    """A server or skill required by a selection but not part of it."""
+
+    name: str
+    kind: str  # SERVER or SKILL
+    chain: tuple[str, ...]  # selected skill ... skill that requires it
+
+    def explain(self) -> str:
+        """Format as 'skill -> required skill -> dependency'."""
+        return " -> ".join((*self.chain, self.name))
+
+
+class DependencyGraph:
+    """
+    Dependencies of skills on MCP servers and on other skills.
+
+    Names are interned to integer IDs. The transitive closure of every
+    skill is computed once, in O(V + E) bitset unions over the strongly
+    connected components (so cycles are found in the same pass), and
+    memoized; queries then cost O(selection) regardless of catalog size.
+    """
+
+    def __init__(
+        self,
+        skills: list[str],
+        servers: list[str],
+        skill_servers: list[list[int]],
+        skill_requires: list[list[int]],
+        closures: tuple[list[int], list[int]] | None = None,
+    ):
+        """
+        Initialize from interned tables.
+
+        Args:
+            skills: Skill names by ID
+            servers: Server names by ID
+            skill_servers: Server IDs each skill depends on directly
+            skill_requires: Skill IDs each skill depends on directly
+            closures: Precomputed (skill closure, server closure) bitsets
+                per skill, as returned by closures(); computed lazily if None
+        """
+        self.skills = skills
+        self.servers = servers
+        self.skill_servers = skill_servers
+        self.skill_requires = skill_requires
+        self.skill_ids = {name: i for i, name in enumerate(skills)}
+        self.server_ids = {name: i for i, name in enumerate(servers)}
+        self._closures = closures
+        self._cycles: list[list[str]] | None = None
+
+    @classmethod
+    def from_mapping(
+        cls,
+        servers: dict[str, list[str]],
+        skills: dict[str, list[str]] | None = None,
+    ) -> DependencyGraph:
+        """
+        Build a graph from name mappings.
+
+        Args:
+            servers: Skill -> MCP servers it needs
+            skills: Skill -> skills it needs
+        """
+        skill_ids: dict[str, int] = {}
+        server_ids: dict[str, int] = {}
+        for skill in [*servers, *(skills or {})]:
+            skill_ids.setdefault(skill, len(skill_ids))
+        for needed in (skills or {}).values():
+            for skill in needed:
+                skill_ids.setdefault(skill, len(skill_ids))
+        skill_servers: list[list[int]] = [[] for _ in skill_ids]
+        skill_requires: list[list[int]] = [[] for _ in skill_ids]
+        for skill, needed in servers.items():
+            skill_servers[skill_ids[skill]] = [
+                server_ids.setdefault(name, len(server_ids)) for name in needed
+            ]
+        for skill, needed in (skills or {}).items():
+            skill_requires[skill_ids[skill]] = [skill_ids[name] for name in needed]
+        return cls(list(skill_ids), list(server_ids), skill_servers, skill_requires)
+
+    def closures(self) -> tuple[list[int], list[int]]:
+        """
+        Per-skill bitsets of all skills and all servers it transitively needs.
+
+        A skill's skill closure excludes the skill itself unless it is
+        part of a cycle.
+        """
+        if self._closures is None:
+            self._solve()
+        return self._closures
+
+    def cycles(self) -> list[list[str]]:
+        """Groups of skills that depend on each other in a cycle."""
+        if self._cycles is None:
+            self._solve()
+        return self._cycles
+
+    def _solve(self) -> None:
+        """Find strongly connected components and compute closures bottom-up."""
+        n = len(self.skills)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: list[int] = []
+        components: list[list[int]] = []  # dependencies before dependents
+        counter = 0
+
+        # Iterative Tarjan, so long chains don't hit the recursion limit
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                requires = self.skill_requires[node]
+                if edge < len(requires):
+                    work.append((node, edge + 1))
+                    child = requires[edge]
+                    if index[child] == -1:
+                        work.append((child, 0))
+                    elif on_stack[child]:
+                        low[node] = min(low[node], index[child])
+                    continue
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+        component_of = [0] * n
+        for c, members in enumerate(components):
+            for member in members:
+                component_of[member] = c
+
+        skill_closure = [0] * n
+        server_closure = [0] * n
+        reach_skills = [0] * len(components)
+        reach_servers = [0] * len(components)
+        cycles = []
+        for c, members in enumerate(components):
+            skills_mask = servers_mask = members_mask = 0
+            cyclic = len(members) > 1
+            for member in members:
+                members_mask |= 1 << member
+                for server in self.skill_servers[member]:
+                    servers_mask |= 1 << server
+                for child in self.skill_requires[member]:
+                    d = component_of[child]
+                    if d == c:
+                        cyclic = True
+                        continue
+                    skills_mask |= reach_skills[d] | (1 << child)
+                    servers_mask |= reach_servers[d]
+            if cyclic:
+                skills_mask |= members_mask
+                cycles.append(sorted(self.skills[m] for m in members))
+            reach_skills[c] = skills_mask
+            reach_servers[c] = servers_mask
+            for member in members:
+                skill_closure[member] = skills_mask
+                server_closure[member] = servers_mask
+
+        self._closures = (skill_closure, server_closure)
+        self._cycles = sorted(cycles)
+
+    def skill_mask(self, names: Iterable[str]) -> int:
+        """Bitset of known skills among names."""
+        mask = 0
+        for name in names:
+            i = self.skill_ids.get(name)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def server_mask(self, names: Iterable[str]) -> int:
+        """Bitset of known servers among names."""
+        mask = 0
+        for name in names:
+            i = self.server_ids.get(name)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def server_names(self, mask: int) -> list[str]:
+        """Server names of a bitset, in ID order."""
+        return [self.servers[i] for i in _bits(mask)]
+
+    def required_servers_mask(self, skills: Iterable[str]) -> int:
+        """Bitset of servers the given skills need, directly or through other skills."""
+        server_closure = self.closures()[1]
+        mask = 0
+        for skill in skills:
+            i = self.skill_ids.get(skill)
+            if i is not None:
+                mask |= server_closure[i]
+        return mask
+
+    def install_order(self, skills: Iterable[str]) -> list[str]:
+        """
+        The given skills plus every skill they need, dependencies first.
+
+        Independent skills keep their given order; members of a cycle are
+        emitted in the order they are reached.
+        """
+        order: list[str] = []
+        seen: set[str] = set()
+        for name in skills:
+            if name in seen:
+                continue
+            seen.add(name)
+            root = self.skill_ids.get(name)
+            if root is None:
+                order.append(name)
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                requires = self.skill_requires[node]
+                if edge < len(requires):
+                    work.append((node, edge + 1))
+                    child = self.skills[requires[edge]]
+                    if child not in seen:
+                        seen.add(child)
+                        work.append((requires[edge], 0))
+                else:
+                    order.append(self.skills[node])
+        return order
+
+    def required_servers(self, skills: Iterable[str]) -> list[str]:
+        """Servers needed by the given skills, in install order without duplicates."""
+        result: dict[str, None] = {}
+        for skill in self.install_order(skills):
+            i = self.skill_ids.get(skill)
+            if i is not None:
+                for server in self.skill_servers[i]:
+                    result.setdefault(self.servers[server], None)
+        return list(result)
+
+    def missing(
+        self, mcp_servers: Iterable[str], skills: Iterable[str]
+    ) -> list[MissingDependency]:
+        """
+        Servers and skills the selection needs but lacks, each with the chain requiring it.
+
+        Args:
+            mcp_servers: Selected (or installed) MCP servers
+            skills: Selected (or installed) skills
+        """
+        skills = list(skills)
+        skill_closure, server_closure = self.closures()
+        selected = self.skill_mask(skills)
+        needed_skills = needed_servers = 0
+        for i in _bits(selected):
+            needed_skills |= skill_closure[i]
+            needed_servers |= server_closure[i]
+        missing_skills = needed_skills & ~selected
+        missing_servers = needed_servers & ~self.server_mask(mcp_servers)
+        if not missing_skills and not missing_servers:
+            return []
+
+        # Breadth-first from the selection, so each chain is a shortest one
+        parent: dict[int, int | None] = {}
+        queue = []
+        for skill in skills:
+            i = self.skill_ids.get(skill)
+            if i is not None and i not in parent:
+                parent[i] = None
+                queue.append(i)
+        for node in queue:
+            for child in self.skill_requires[node]:
+                if child not in parent:
+                    parent[child] = node
+                    queue.append(child)
+
+        def chain(node: int) -> tuple[str, ...]:
+            names = []
+            current: int | None = node
+            while current is not None:
+                names.append(self.skills[current])
+                current = parent[current]
+            return tuple(reversed(names))
+
+        result = []
+        for node in queue:
+            if missing_skills >> node & 1 and parent[node] is not None:
+                result.append(MissingDependency(self.skills[node], SKILL, chain(parent[node])))
+                missing_skills &= ~(1 << node)
+            for server in self.skill_servers[node]:
+                if missing_servers >> server & 1:
+                    result.append(MissingDependency(self.servers[server], SERVER, chain(node)))
+                    missing_servers &= ~(1 << server)
+        return result
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Indices of the set bits of a mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,161 @@
+"""Content fingerprints of configuration state."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+SERVERS_GROUP = "servers"
+ENV_GROUP = "env"
+
+
+def canonical_json(obj: Any) -> bytes:
+    """Serialize with sorted keys and no whitespace, for stable hashing."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def value_hash(obj: Any) -> str:
+    """Hash a JSON-compatible value canonically."""
+    return hashlib.sha256(canonical_json(obj)).hexdigest()
+
+
+def tree_hash(items: dict[str, str]) -> str:
+    """Hash a set of (name, hash) pairs independently of their order."""
+    h = hashlib.sha256()
+    for name in sorted(items):
+        h.update(name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(items[name].encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+@dataclass
+class Fingerprint:
+    """
+    Hashes of configuration state, organized in groups.
+
+    Groups are ``servers`` (MCP server name -> canonical config hash),
+    ``env`` (.env.example key -> value hash) and one group per file
+    directory such as ``.claude/skills/foo`` (relative path -> content
+    hash). Each group has its own root and the overall root hashes the
+    group roots, so two fingerprints can be compared in one step and a
+    mismatch narrowed to the groups that differ.
+    """
+
+    groups: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        servers: dict[str, Any],
+        env: dict[str, str],
+        files: dict[str, dict[str, str]] | None = None,
+    ) -> Fingerprint:
+        """Build a fingerprint from server configs, env values and file hashes by group."""
+        groups = {
+            SERVERS_GROUP: {name: value_hash(config) for name, config in servers.items()},
+            ENV_GROUP: {key: value_hash(value) for key, value in env.items()},
+        }
+        groups.update(files or {})
+        return cls(groups=groups)
+
+    def group_roots(self) -> dict[str, str]:
+        """Return the root hash of every group."""
+        return {name: tree_hash(items) for name, items in self.groups.items()}
+
+    @property
+    def root(self) -> str:
+        """Root hash over all groups."""
+        return tree_hash(self.group_roots())
+
+    def differing_groups(self, roots: dict[str, str]) -> list[str]:
+        """List groups whose root differs from the given group roots."""
+        own = self.group_roots()
+        return sorted(
+            name for name in own.keys() | roots.keys() if own.get(name) != roots.get(name)
+        )
+
+
+@dataclass
+class MerkleNode:
+    """
+    Node of a Merkle tree over configuration items.
+
+    Leaves carry the hash of one item (an MCP server config, a file);
+    inner nodes hash the names and hashes of their children and may be
+    empty. Equal hashes mean equal subtrees, so diff() only descends where
+    hashes differ.
+    """
+
+    hash: str
+    children: dict[str, MerkleNode] = field(default_factory=dict)
+    leaf: bool = False
+
+    @classmethod
+    def from_items(cls, items: dict[str, str], dirs: tuple[str, ...] = ()) -> MerkleNode:
+        """
+        Build a tree from ``/``-separated item paths and their hashes.
+
+        ``dirs`` are top-level inner nodes created even when no item is below
+        them, so that diff() can name the items missing from an empty group.
+        """
+        nested: dict[str, Any] = {name: {} for name in dirs}
+        for path, digest in items.items():
+            node = nested
+            *parents, name = path.split("/")
+            for part in parents:
+                node = node.setdefault(part, {})
+            node[name] = digest
+        return cls._build(nested)
+
+    @classmethod
+    def _build(cls, nested: dict[str, Any]) -> MerkleNode:
+        children = {
+            name: cls(value, leaf=True) if isinstance(value, str) else cls._build(value)
+            for name, value in nested.items()
+        }
+        return cls(tree_hash({name: c.hash for name, c in children.items()}), children)
+
+    def diff(self, other: MerkleNode, prefix: str = "") -> list[tuple[str, str]]:
+        """
+        Compare with another tree (the actual state against this expected one).
+
+        Returns:
+            (path, kind) pairs where kind is 'changed', 'missing' (only in
+            this tree) or 'extra' (only in other), reported at the highest
+            level at which a subtree is missing or extra
+        """
+        if self.hash == other.hash:
+            return []
+        if self.leaf or other.leaf:
+            return [(prefix.rstrip("/"), "changed")]
+        result = []
+        for name in sorted(self.children.keys() | other.children.keys()):
+            mine = self.children.get(name)
+            theirs = other.children.get(name)
+            path = f"{prefix}{name}"
+            if theirs is None:
+                result.append((path, "missing"))
+            elif mine is None:
+                result.append((path, "extra"))
+            else:
+                result.extend(mine.diff(theirs, f"{path}/"))
+        return result
+
+
+def group_files(
+    files: dict[str, str], prefixes: list[str]
+) -> dict[str, dict[str, str]]:
+    """Split relative path -> hash into groups keyed by directory prefix."""
+    groups: dict[str, dict[str, str]] = {prefix.rstrip("/"): {} for prefix in prefixes}
+    for rel, digest in files.items():
+        for prefix in prefixes:
+            if rel.startswith(prefix):
+                groups[prefix.rstrip("/")][rel] = digest
+                break
+    return groups
@@ -0,0 +1,467 @@
+"""Index of many projects' configuration in a local SQLite database."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import jsonio
+from .config_manager import read_env_file
+from .copier import DEFAULT_WORKERS
+from .fingerprint import value_hash
+from .models import MCPConfig
+
+# Directories never descended into
+SKIP_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        ".backup-claude",
+        ".claude",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        ".mypy_cache",
+        ".pytest_cache",
+    }
+)
+
+# $VAR and ${VAR} references in server commands, arguments and env values
+ENV_REF = re.compile(r"\$\{?([A-Za-z_][A-Za-z0-9_]*)\}?")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    children TEXT NOT NULL,
+    is_project INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    signature TEXT NOT NULL,
+    error TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS servers (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    command TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    config TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS env_refs (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    server TEXT,
+    var TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skills (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hooks (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS servers_name ON servers(name, project_id);
+CREATE INDEX IF NOT EXISTS servers_project ON servers(project_id);
+CREATE INDEX IF NOT EXISTS env_refs_var ON env_refs(var, project_id);
+CREATE INDEX IF NOT EXISTS env_refs_project ON env_refs(project_id);
+CREATE INDEX IF NOT EXISTS skills_name ON skills(name, project_id);
+CREATE INDEX IF NOT EXISTS skills_project ON skills(project_id);
+CREATE INDEX IF NOT EXISTS hooks_project ON hooks(project_id);
+"""
+
+
+@dataclass
+class ScanStats:
+    """Counters and timing for a scan."""
+
+    dirs_visited: int = 0
+    dirs_listed: int = 0
+    projects_indexed: int = 0
+    projects_unchanged: int = 0
+    projects_removed: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """Generate summary string."""
+        return (
+            f"{self.dirs_visited} directories ({self.dirs_listed} listed), "
+            f"{self.projects_indexed} projects indexed, {self.projects_unchanged} unchanged, "
+            f"{self.projects_removed} removed in {self.seconds:.2f}s"
+        )
+
+
+@dataclass
+class ProjectRecord:
+    """Configuration extracted from one project."""
+
+    path: str
+    signature: str
+    servers: dict[str, dict] = field(default_factory=dict)
+    env_refs: set[tuple[str | None, str]] = field(default_factory=set)
+    skills: list[str] = field(default_factory=list)
+    hooks: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class _Visit:
+    """Result of visiting one directory during a scan."""
+
+    path: str
+    mtime_ns: int
+    children: list[str]
+    is_project: bool
+    listed: bool
+    record: ProjectRecord | None = None
+
+
+class FleetIndex:
+    """
+    SQLite index of the projects found below one or more root directories.
+
+    Scans walk the tree level by level, listing the directories of each
+    level on a thread pool. A directory whose mtime is unchanged since the
+    last scan is not listed again: its recorded subdirectories are reused.
+    A project is re-read only when the stat signature of its
+    configuration files (``.mcp.json``, ``.env.example``, the skills and
+    hooks directories) changed.
+    """
+
+    def __init__(self, db_path: Path | None = None):
+        """Open (or create) the index database."""
+        self.db_path = db_path or Path.home() / ".claude-config-manager" / "fleet.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def __enter__(self) -> FleetIndex:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def scan(self, root: Path, workers: int | None = None) -> ScanStats:
+        """
+        Discover projects below root and bring the index up to date.
+
+        Args:
+            root: Directory to scan
+            workers: Number of directories listed concurrently
+
+        Returns:
+            Statistics about the scan
+        """
+        start = time.perf_counter()
+        stats = ScanStats()
+        root_str = os.path.abspath(root)
+        prefix = root_str.rstrip(os.sep) + os.sep
+        previous = {
+            path: (mtime_ns, children, bool(is_project))
+            for path, mtime_ns, children, is_project in self.conn.execute(
+                "SELECT path, mtime_ns, children, is_project FROM dirs "
+                "WHERE path = ? OR substr(path, 1, ?) = ?",
+                (root_str, len(prefix), prefix),
+            )
+        }
+        signatures = dict(
+            self.conn.execute(
+                "SELECT path, signature FROM projects WHERE path = ? OR substr(path, 1, ?) = ?",
+                (root_str, len(prefix), prefix),
+            ).fetchall()
+        )
+
+        seen: set[str] = set()
+        projects: set[str] = set()
+        frontier = [root_str]
+        with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as pool:
+            while frontier:
+                visits = list(
+                    pool.map(
+                        lambda path: _visit(path, previous.get(path), signatures.get(path)),
+                        frontier,
+                    )
+                )
+                frontier = []
+                with self.conn:
+                    for visit in visits:
+                        if visit is None:
+                            continue
+                        seen.add(visit.path)
+                        stats.dirs_visited += 1
+                        stats.dirs_listed += visit.listed
+                        if visit.listed or visit.path not in previous:
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)",
+                                (
+                                    visit.path,
+                                    visit.mtime_ns,
+                                    json.dumps(visit.children),
+                                    int(visit.is_project),
+                                ),
+                            )
+                        if visit.is_project:
+                            projects.add(visit.path)
+                        if visit.record is not None:
+                            self._store(visit.record)
+                            stats.projects_indexed += 1
+                        elif visit.is_project:
+                            stats.projects_unchanged += 1
+                        frontier.extend(os.path.join(visit.path, c) for c in visit.children)
+
+        with self.conn:
+            for path in previous.keys() - seen:
+                self.conn.execute("DELETE FROM dirs WHERE path = ?", (path,))
+            stale = signatures.keys() - projects
+            for path in stale:
+                self.conn.execute("DELETE FROM projects WHERE path = ?", (path,))
+            stats.projects_removed = len(stale)
+
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def _store(self, record: ProjectRecord) -> None:
+        """Replace the indexed data of one project."""
+        self.conn.execute("DELETE FROM projects WHERE path = ?", (record.path,))
+        cur = self.conn.execute(
+            "INSERT INTO projects (path, signature, error, indexed_at) VALUES (?, ?, ?, ?)",
+            (record.path, record.signature, record.error, time.time()),
+        )
+        project_id = cur.lastrowid
+        self.conn.executemany(
+            "INSERT INTO servers VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    project_id,
+                    name,
+                    config.get("command", ""),
+                    value_hash(config),
+                    json.dumps(config, sort_keys=True),
+                )
+                for name, config in record.servers.items()
+            ],
+        )
+        self.conn.executemany(
+            "INSERT INTO env_refs VALUES (?, ?, ?)",
+            [(project_id, server, var) for server, var in sorted(record.env_refs, key=str)],
+        )
+        self.conn.executemany(
+            "INSERT INTO skills VALUES (?, ?)", [(project_id, s) for s in record.skills]
+        )
+        self.conn.executemany(
+            "INSERT INTO hooks VALUES (?, ?)", [(project_id, h) for h in record.hooks]
+        )
+
+    def query(
+        self,
+        servers: list[str] | None = None,
+        missing_servers: list[str] | None = None,
+        env: list[str] | None = None,
+        missing_env: list[str] | None = None,
+        skills: list[str] | None = None,
+        missing_skills: list[str] | None = None,
+        under: Path | None = None,
+    ) -> list[str]:
+        """
+        Find indexed projects matching all given conditions.
+
+        Args:
+            servers: Projects configuring every one of these MCP servers
+            missing_servers: ... and none of these
+            env: Projects referencing every one of these env vars
+                (in server settings or ``.env.example``)
+            missing_env: ... and none of these
+            skills: Projects with every one of these skills installed
+            missing_skills: ... and none of these
+            under: Only projects below this directory
+
+        Returns:
+            Matching project paths, sorted
+        """
+        clauses: list[str] = []
+        params: list[object] = []
+        for table, column, names, present in (
+            ("servers", "name", servers, True),
+            ("servers", "name", missing_servers, False),
+            ("env_refs", "var", env, True),
+            ("env_refs", "var", missing_env, False),
+            ("skills", "name", skills, True),
+            ("skills", "name", missing_skills, False),
+        ):
+            for name in names or []:
+                negate = "" if present else "NOT "
+                clauses.append(
+                    f"{negate}EXISTS (SELECT 1 FROM {table} t "
+                    f"WHERE t.project_id = p.id AND t.{column} = ?)"
+                )
+                params.append(name)
+        if under is not None:
+            prefix = os.path.abspath(under).rstrip(os.sep) + os.sep
+            clauses.append("(p.path = ? OR substr(p.path, 1, ?) = ?)")
+            params.extend([os.path.abspath(under), len(prefix), prefix])
+
+        sql = "SELECT p.path FROM projects p"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.path"
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def server_usage(self) -> list[tuple[str, int, int]]:
+        """Return (server name, project count, distinct config count), most used first."""
+        return self.conn.execute(
+            "SELECT name, COUNT(DISTINCT project_id), COUNT(DISTINCT hash) FROM servers "
+            "GROUP BY name ORDER BY 2 DESC, 1"
+        ).fetchall()
+
+    def execute(self, sql: str) -> tuple[list[str], list[tuple]]:
+        """Run a read-only SQL query; return column names and rows."""
+        self.conn.execute("PRAGMA query_only=ON")
+        try:
+            cur = self.conn.execute(sql)
+            columns = [d[0] for d in cur.description or []]
+            return columns, cur.fetchall()
+        finally:
+            self.conn.execute("PRAGMA query_only=OFF")
+
+    def count(self) -> int:
+        """Number of indexed projects."""
+        return self.conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+
+def find_projects(root: Path, workers: int | None = None) -> list[Path]:
+    """
+    List the projects (directories with ``.mcp.json`` or ``.claude/``) below root.
+
+    Walks the tree level by level like FleetIndex.scan(), listing the
+    directories of each level on a thread pool, but without an index.
+    """
+    projects: list[str] = []
+
+    def visit(path: str) -> list[str]:
+        children = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name in (".mcp.json", ".claude"):
+                        projects.append(path)
+                    if entry.name not in SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                        children.append(os.path.join(path, entry.name))
+        except OSError:
+            pass
+        return children
+
+    frontier = [os.path.abspath(root)]
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as pool:
+        while frontier:
+            frontier = [child for children in pool.map(visit, frontier) for child in children]
+    return [Path(p) for p in sorted(set(projects))]
+
+
+def _visit(
+    path: str,
+    previous: tuple[int, str, bool] | None,
+    signature: str | None,
+) -> _Visit | None:
+    """Visit one directory, listing it only if it changed since the last scan."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    if previous is not None and previous[0] == st.st_mtime_ns:
+        children = json.loads(previous[1])
+        is_project = previous[2]
+        listed = False
+    else:
+        children = []
+        is_project = False
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name in (".mcp.json", ".claude"):
+                        is_project = True
+                    if (
+                        entry.name not in SKIP_DIRS
+                        and entry.is_dir(follow_symlinks=False)
+                    ):
+                        children.append(entry.name)
+        except OSError:
+            return None
+        children.sort()
+        listed = True
+
+    record = None
+    if is_project:
+        current = _signature(path)
+        if current != signature:
+            record = _read_project(path, current)
+    return _Visit(path, st.st_mtime_ns, children, is_project, listed, record)
+
+
+def _signature(path: str) -> str:
+    """Stat signature of a project's configuration files."""
+    parts = []
+    for rel in (".mcp.json", ".env.example", ".claude", ".claude/skills", ".claude/hooks"):
+        try:
+            st = os.stat(os.path.join(path, rel))
+            parts.append(f"{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+def _read_project(path: str, signature: str) -> ProjectRecord:
+    """Extract the indexed configuration of one project."""
+    record = ProjectRecord(path=path, signature=signature)
+    mcp_path = Path(path) / ".mcp.json"
+    if mcp_path.exists():
+        try:
+            config = MCPConfig.model_validate(jsonio.read_json(mcp_path))
+        except Exception as e:
+            record.error = f".mcp.json: {e}".splitlines()[0]
+        else:
+            for name, server in config.mcpServers.items():
+                data = server.model_dump(exclude_none=True)
+                record.servers[name] = data
+                for var in server.env:
+                    record.env_refs.add((name, var))
+                for text in [server.command, *server.args, *server.env.values()]:
+                    for var in ENV_REF.findall(text):
+                        record.env_refs.add((name, var))
+    try:
+        for key in read_env_file(Path(path) / ".env.example"):
+            record.env_refs.add((None, key))
+    except (OSError, UnicodeDecodeError):
+        pass
+    record.skills = _list_names(os.path.join(path, ".claude", "skills"), dirs=True)
+    record.hooks = _list_names(os.path.join(path, ".claude", "hooks"), dirs=False)
+    return record
+
+
+def _list_names(path: str, dirs: bool) -> list[str]:
+    """List visible subdirectory (or file) names of a directory."""
+    try:
+        with os.scandir(path) as it:
+            return sorted(
+                e.name for e in it if not e.name.startswith(".") and e.is_dir() == dirs
+            )
+    except OSError:
+        return []
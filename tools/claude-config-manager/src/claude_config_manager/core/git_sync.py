@@ -11,6 +11,30 @@ from pathlib import Path
 from git import InvalidGitRepositoryError, Repo
 from git.exc import GitCommandError
 
+from .copier import CopyEngine
+
+
+GITIGNORE = ".env\n.backup-*\n.ccm-*\n__pycache__/\n*.pyc\nnode_modules/\n"
+
+
+def init_repository(path: Path, commit_message: str | None = None) -> Repo:
+    """
+    Initialize a git repository for a project, with a .gitignore.
+
+    Args:
+        path: Project directory
+        commit_message: Commit every non-ignored file with this message
+            (None = leave the repository without commits)
+    """
+    repo = Repo.init(path)
+    gitignore = path / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text(GITIGNORE)
+    if commit_message is not None:
+        repo.git.add(A=True)  # one call that honors .gitignore
+        repo.index.commit(commit_message)
+    return repo
+
 
 @dataclass
 class RemoteConfig:
@@ -26,9 +50,10 @@ class GitSync:
 
     REMOTES_FILE = ".claude-config-manager/remotes.json"
 
-    def __init__(self, base_path: Path | None = None):
+    def __init__(self, base_path: Path | None = None, workers: int | None = None):
         """Initialize with base path for storing remote configs."""
         self.base_path = base_path or Path.home()
+        self.copier = CopyEngine(workers)
         self.config_dir = self.base_path / ".claude-config-manager"
         self.remotes_path = self.config_dir / "remotes.json"
 
@@ -186,7 +211,7 @@ class GitSync:
             claude_dest = dest / ".claude"
             if claude_dest.exists():
                 shutil.rmtree(claude_dest)
-            shutil.copytree(claude_source, claude_dest)
+            self.copier.copy_tree(claude_source, claude_dest)
 
         # .env.example
         env_source = source / ".env.example"
@@ -0,0 +1,75 @@
+"""Persistent cache of file content hashes keyed by stat data."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from . import jsonio
+from .manifest import hash_file
+
+CACHE_DIR = ".claude/.ccm-cache"
+HASHES_FILE = "hashes.json"
+
+# Files modified this recently may change again within the same mtime tick,
+# so their hashes are not persisted.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class HashCache:
+    """
+    Content hashes of a project's files, reused while size and mtime match.
+
+    Stored in ``.claude/.ccm-cache/hashes.json`` (internal ``.ccm-*`` paths
+    are never copied, backed up or scanned). Safe to share between
+    threads; call save() to persist new entries.
+    """
+
+    def __init__(self, project_path: Path):
+        """Load the cache of a project, if any."""
+        self.project_path = project_path
+        self.path = project_path / CACHE_DIR / HASHES_FILE
+        self._entries: dict[str, list] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        try:
+            data = jsonio.read_json(self.path)
+            if data.get("version") == 1:
+                self._entries = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def hash(self, rel: str, st: os.stat_result | None = None) -> str:
+        """Return the content hash of a project file, computing it if needed."""
+        path = self.project_path / rel
+        st = st or os.stat(path)
+        cached = self._entries.get(rel)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        digest = hash_file(path)
+        with self._lock:
+            self._entries[rel] = [st.st_size, st.st_mtime_ns, digest]
+            self._dirty = True
+        return digest
+
+    def save(self) -> None:
+        """Persist the cache if it changed; entries for missing files are dropped."""
+        if not self._dirty or not self.path.parent.parent.is_dir():
+            return
+        cutoff = time.time_ns() - RACY_WINDOW_NS
+        with self._lock:
+            files = {
+                rel: entry
+                for rel, entry in sorted(self._entries.items())
+                if entry[1] < cutoff and (self.project_path / rel).exists()
+            }
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{HASHES_FILE}.tmp")
+            tmp.write_bytes(jsonio.dumps({"version": 1, "files": files}))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # A read-only project just doesn't get a persistent cache
@@ -0,0 +1,121 @@
+"""JSON parsing and serialization with memoized model loading.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both backends produce the same bytes for configuration data
+(2-space indent, UTF-8, no ASCII escaping).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+M = TypeVar("M", bound="BaseModel")
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+_cache: dict[tuple[type, str], tuple[int, int, BaseModel]] = {}
+_cache_lock = threading.Lock()
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON with a trailing newline."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2) + b"\n"
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; let the stdlib handle it
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Write data to a file unless it already holds exactly these bytes.
+
+    Unchanged files keep their mtime, so watchers, editors and git see
+    nothing. Changed files are replaced atomically via a temp file (which
+    keeps the mode of the file it replaces).
+
+    Returns:
+        Whether the file was written
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        st = None
+    if st is not None and st.st_size == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".ccm-tmp-{path.name}")
+    try:
+        tmp.write_bytes(data)
+        if st is not None:
+            os.chmod(tmp, st.st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    forget(path)
+    return True
+
+
+def read_json(path: Path) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def load_model(cls: type[M], path: Path) -> M:
+    """
+    Load and validate a model from a JSON file, memoized per file version.
+
+    Parsed models are cached by (path, mtime_ns, size), so repeated loads
+    of an unchanged file skip both parsing and validation. The returned
+    instance is shared between callers and must not be mutated.
+    """
+    key = (cls, os.path.abspath(path))
+    st = os.stat(path)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    model = cls.model_validate(read_json(path))
+    with _cache_lock:
+        _cache[key] = (st.st_mtime_ns, st.st_size, model)
+    return model
+
+
+def forget(path: Path) -> None:
+    """Drop cached models for a file that is being rewritten."""
+    target = os.path.abspath(path)
+    with _cache_lock:
+        for key in [k for k in _cache if k[1] == target]:
+            del _cache[key]
+
+
+def clear_cache() -> None:
+    """Drop all cached models."""
+    with _cache_lock:
+        _cache.clear()
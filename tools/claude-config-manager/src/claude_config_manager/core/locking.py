@@ -0,0 +1,37 @@
+"""Advisory locks that serialize writers of a shared store across processes."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+LOCK_NAME = ".lock"
+
+
+@contextmanager
+def store_lock(root: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a store directory for the duration of the block.
+
+    Uses flock() on ``<root>/.lock``, which the kernel releases when the
+    process exits, so a crashed holder never leaves the store locked. The
+    lock is per open file, so it also excludes other threads that take it.
+    Without fcntl (Windows) the block runs unlocked.
+    """
+    if fcntl is None:  # pragma: no cover
+        yield
+        return
+    root.mkdir(parents=True, exist_ok=True)
+    fd = os.open(root / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
@@ -0,0 +1,161 @@
+"""File manifests: content hashes and stat metadata for configuration trees."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+# Files and directories created by the tool itself (state, caches, temp
+# files) share this prefix and are excluded from manifests and copies.
+INTERNAL_PREFIX = ".ccm-"
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """Metadata for a single file in a manifest."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    mode: int
+    hash: str
+
+    def to_dict(self) -> dict:
+        """Serialize entry (without its path) for a manifest file."""
+        return {
+            "hash": self.hash,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "mode": self.mode,
+        }
+
+    @classmethod
+    def from_dict(cls, path: str, data: dict) -> FileEntry:
+        """Deserialize entry from a manifest file."""
+        return cls(
+            path=path,
+            size=data["size"],
+            mtime_ns=data.get("mtime_ns", 0),
+            mode=data.get("mode", 0o644),
+            hash=data["hash"],
+        )
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def iter_files(root: Path, prefix: str = "") -> Iterator[tuple[str, Path, os.stat_result]]:
+    """
+    Walk a directory tree with os.scandir.
+
+    Yields (relative posix path, absolute path, stat) for every regular
+    file below root. Symlinks are followed, matching shutil.copytree.
+    Internal ``.ccm-*`` entries are skipped.
+    """
+    try:
+        it = os.scandir(root)
+    except FileNotFoundError:
+        return
+    with it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.name.startswith(INTERNAL_PREFIX):
+            continue
+        rel = f"{prefix}{entry.name}"
+        if entry.is_dir():
+            yield from iter_files(Path(entry.path), f"{rel}/")
+        elif entry.is_file():
+            yield rel, Path(entry.path), entry.stat()
+
+
+class DirManifest:
+    """
+    Manifest of a directory tree: relative path, size, mtime_ns and hash.
+
+    Stat data is collected with a single scandir walk; content hashes are
+    computed lazily and memoized, so trees compared by size and mtime
+    alone are never read.
+    """
+
+    def __init__(self, root: Path):
+        """Scan the tree rooted at root."""
+        self.root = root
+        self.stats: dict[str, os.stat_result] = {
+            rel: st for rel, _, st in iter_files(root)
+        }
+        self._hashes: dict[str, str] = {}
+
+    @classmethod
+    def empty(cls, root: Path) -> DirManifest:
+        """Return a manifest with no entries (for a tree that will be replaced)."""
+        manifest = cls.__new__(cls)
+        manifest.root = root
+        manifest.stats = {}
+        manifest._hashes = {}
+        return manifest
+
+    def __contains__(self, rel: str) -> bool:
+        return rel in self.stats
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.stats)
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def path(self, rel: str) -> Path:
+        """Return the absolute path of an entry."""
+        return self.root / rel
+
+    def hash(self, rel: str) -> str:
+        """Return the content hash of an entry."""
+        digest = self._hashes.get(rel)
+        if digest is None:
+            digest = hash_file(self.path(rel))
+            self._hashes[rel] = digest
+        return digest
+
+    def entry(self, rel: str) -> FileEntry:
+        """Return the full manifest entry for a path."""
+        st = self.stats[rel]
+        return FileEntry(
+            path=rel,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            mode=st.st_mode & 0o7777,
+            hash=self.hash(rel),
+        )
+
+    def quick_match(self, rel: str, other: DirManifest) -> bool:
+        """Check an entry against another manifest by size, mtime and mode."""
+        a = self.stats[rel]
+        b = other.stats.get(rel)
+        return (
+            b is not None
+            and a.st_size == b.st_size
+            and a.st_mtime_ns == b.st_mtime_ns
+            and a.st_mode == b.st_mode
+        )
+
+    def same_content(self, rel: str, other: DirManifest) -> bool:
+        """Check an entry has the same content in another manifest."""
+        b = other.stats.get(rel)
+        if b is None or self.stats[rel].st_size != b.st_size:
+            return False
+        return self.hash(rel) == other.hash(rel)
@@ -0,0 +1,348 @@
+"""Probe MCP servers over stdio with a real JSON-RPC handshake."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import signal
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .. import __version__
+from .models import MCPServer
+
+PROTOCOL_VERSION = "2025-06-18"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 30.0
+
+# Transports that are not launched as a subprocess
+REMOTE_TYPES = frozenset({"http", "sse", "streamable-http"})
+
+# Largest JSON-RPC message accepted (tool lists with schemas can be big)
+MAX_MESSAGE = 16 * 1024 * 1024
+STDERR_LINES = 5
+
+# ${VAR} and ${VAR:-default}, as expanded by Claude Code in .mcp.json
+_ENV_REF = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}")
+
+
+class ProbeError(Exception):
+    """A server failed the handshake."""
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing one server."""
+
+    name: str
+    ok: bool = False
+    skipped: bool = False
+    spawn_ms: float | None = None  # until the process was started
+    initialize_ms: float | None = None  # from start to the initialize response
+    tools_ms: float | None = None  # tools/list, all pages
+    tools: list[str] = field(default_factory=list)
+    server_info: str = ""
+    protocol_version: str = ""
+    error: str | None = None
+    stderr: list[str] = field(default_factory=list)
+    peak_rss_kb: int | None = None  # server and its children; only with memory=True
+
+    @property
+    def total_ms(self) -> float | None:
+        """Time from launch until the tool list was received."""
+        if self.tools_ms is None:
+            return None
+        return (self.spawn_ms or 0.0) + (self.initialize_ms or 0.0) + self.tools_ms
+
+
+def expand_env(value: str, environ: dict[str, str]) -> str:
+    """Expand ``${VAR}`` and ``${VAR:-default}`` references."""
+    return _ENV_REF.sub(
+        lambda m: environ.get(m.group(1)) or (m.group(2) if m.group(2) is not None else ""),
+        value,
+    )
+
+
+def probe(
+    servers: dict[str, MCPServer],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    cwd: Path | None = None,
+    on_result: Callable[[ProbeResult], None] | None = None,
+    memory: bool = False,
+) -> list[ProbeResult]:
+    """
+    Launch servers concurrently and run the MCP handshake with each.
+
+    Each server is started as a subprocess and sent ``initialize``, the
+    ``notifications/initialized`` notification and ``tools/list`` over
+    newline-delimited JSON-RPC on stdin/stdout. At most ``concurrency``
+    servers run at once; each must finish within ``timeout`` seconds.
+    Remote (HTTP/SSE) servers are reported as skipped.
+
+    Args:
+        servers: Server name -> configuration
+        concurrency: Servers probed at the same time
+        timeout: Seconds allowed per server
+        cwd: Working directory of the servers (default: current directory)
+        on_result: Called with each result as soon as its server finishes
+        memory: Record the peak RSS of each server after tools/list (Linux only)
+
+    Returns:
+        Results in the order of ``servers``
+    """
+    return asyncio.run(probe_async(servers, concurrency, timeout, cwd, on_result, memory))
+
+
+async def probe_async(
+    servers: dict[str, MCPServer],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    cwd: Path | None = None,
+    on_result: Callable[[ProbeResult], None] | None = None,
+    memory: bool = False,
+) -> list[ProbeResult]:
+    """Asynchronous form of probe()."""
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(name: str, server: MCPServer) -> ProbeResult:
+        async with limit:
+            result = await probe_server(name, server, timeout, cwd, memory)
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    return list(await asyncio.gather(*(run(n, s) for n, s in servers.items())))
+
+
+async def probe_server(
+    name: str,
+    server: MCPServer,
+    timeout: float = DEFAULT_TIMEOUT,
+    cwd: Path | None = None,
+    memory: bool = False,
+) -> ProbeResult:
+    """Launch one server, run the handshake and shut it down."""
+    result = ProbeResult(name=name)
+    if server.type in REMOTE_TYPES:
+        result.skipped = True
+        result.error = f"{server.type} server (not launched)"
+        return result
+
+    environ = dict(os.environ)
+    env = {**environ, **{k: expand_env(v, environ) for k, v in server.env.items()}}
+    command = expand_env(server.command, env)
+    args = [expand_env(arg, env) for arg in server.args]
+
+    start = time.perf_counter()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            command,
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            cwd=cwd,
+            limit=MAX_MESSAGE,
+            start_new_session=hasattr(os, "killpg"),
+        )
+    except OSError as e:
+        result.error = f"cannot start {command}: {e.strerror or e}"
+        return result
+    started = time.perf_counter()
+    result.spawn_ms = (started - start) * 1000
+
+    stderr: deque[str] = deque(maxlen=STDERR_LINES)
+    drain = asyncio.ensure_future(_drain(proc.stderr, stderr))
+    try:
+        await asyncio.wait_for(_handshake(_Session(proc), result, started), timeout)
+        result.ok = True
+        if memory:
+            result.peak_rss_kb = peak_rss_kb(proc.pid)
+    except asyncio.TimeoutError:
+        result.error = f"timed out after {timeout:g}s waiting for {_phase(result)}"
+    except ProbeError as e:
+        result.error = f"{_phase(result)}: {e}"
+    finally:
+        await _shutdown(proc)
+        await asyncio.wait([drain], timeout=1)
+        drain.cancel()
+        result.stderr = list(stderr)
+    return result
+
+
+def peak_rss_kb(pid: int) -> int | None:
+    """
+    Peak resident memory of a process group, in KiB.
+
+    Sums VmHWM over every live process in the group led by ``pid``, so a
+    server started through a launcher such as npx is measured together
+    with the launcher. Returns None where /proc is unavailable.
+    """
+    total = 0
+    found = False
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # Fields after "(comm)": state, ppid, pgrp, ...
+                fields = f.read().rpartition(b")")[2].split()
+            if int(fields[2]) != pid:
+                continue
+            with open(f"/proc/{entry}/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"VmHWM:"):
+                        total += int(line.split()[1])
+                        found = True
+                        break
+        except (OSError, IndexError, ValueError):
+            continue  # Exited meanwhile, or a kernel thread
+    return total if found else None
+
+
+async def _handshake(session: _Session, result: ProbeResult, started: float) -> None:
+    """Run initialize and tools/list, recording timings and tools in ``result``."""
+    init = await session.request(
+        "initialize",
+        {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "claude-config-manager", "version": __version__},
+        },
+    )
+    initialized = time.perf_counter()
+    result.initialize_ms = (initialized - started) * 1000
+    info = init.get("serverInfo") or {}
+    result.server_info = " ".join(
+        str(part) for part in (info.get("name"), info.get("version")) if part
+    )
+    result.protocol_version = str(init.get("protocolVersion", ""))
+    await session.notify("notifications/initialized")
+
+    if "tools" in (init.get("capabilities") or {}):
+        cursor = None
+        while True:
+            page = await session.request("tools/list", {"cursor": cursor} if cursor else {})
+            result.tools.extend(tool.get("name", "?") for tool in page.get("tools", []))
+            cursor = page.get("nextCursor")
+            if not cursor:
+                break
+    result.tools_ms = (time.perf_counter() - initialized) * 1000
+
+
+def _phase(result: ProbeResult) -> str:
+    """The handshake step a failed probe was in."""
+    return "initialize" if result.initialize_ms is None else "tools/list"
+
+
+class _Session:
+    """Newline-delimited JSON-RPC 2.0 over a subprocess's stdin and stdout."""
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.next_id = 1
+
+    async def send(self, message: dict) -> None:
+        try:
+            self.proc.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise ProbeError(await self._exited()) from None
+
+    async def notify(self, method: str, params: dict | None = None) -> None:
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self.send(message)
+
+    async def request(self, method: str, params: dict) -> dict:
+        """Send a request and wait for its response, skipping other messages."""
+        request_id = self.next_id
+        self.next_id += 1
+        await self.send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        while True:
+            try:
+                line = await self.proc.stdout.readline()
+            except ValueError:
+                raise ProbeError(f"message larger than {MAX_MESSAGE} bytes") from None
+            if not line:
+                raise ProbeError(await self._exited())
+            try:
+                message = json.loads(line)
+            except ValueError:
+                raise ProbeError(f"not JSON-RPC on stdout: {line[:80]!r}") from None
+            if not isinstance(message, dict):
+                continue
+            if "method" in message:
+                if "id" in message:  # A server request (e.g. ping); we support none
+                    await self.send(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": message["id"],
+                            "error": {"code": -32601, "message": "Method not found"},
+                        }
+                    )
+                continue
+            if message.get("id") != request_id:
+                continue
+            if "error" in message:
+                error = message["error"] or {}
+                raise ProbeError(f"{error.get('message', 'error')} ({error.get('code')})")
+            return message.get("result") or {}
+
+    async def _exited(self) -> str:
+        try:
+            code = await asyncio.wait_for(self.proc.wait(), 1)
+        except asyncio.TimeoutError:
+            return "closed stdout"
+        return f"exited with status {code}"
+
+
+async def _drain(stream: asyncio.StreamReader, tail: deque[str]) -> None:
+    """Read a stream to its end, keeping its last lines."""
+    while True:
+        try:
+            line = await stream.readline()
+        except ValueError:
+            continue  # An overlong line; keep draining
+        if not line:
+            return
+        text = line.decode("utf-8", "replace").rstrip()
+        if text:
+            tail.append(text)
+
+
+async def _shutdown(proc: asyncio.subprocess.Process) -> None:
+    """Close stdin and stop the server (and its children), escalating to SIGKILL."""
+    if proc.stdin is not None and not proc.stdin.is_closing():
+        proc.stdin.close()
+    for sig in (None, signal.SIGTERM, getattr(signal, "SIGKILL", signal.SIGTERM)):
+        if sig is not None:
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(proc.pid, sig)
+                else:
+                    proc.send_signal(sig)
+            except ProcessLookupError:
+                pass
+        try:
+            await asyncio.wait_for(proc.wait(), 1 if sig is None else 2)
+            break
+        except asyncio.TimeoutError:
+            continue
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)  # Stray children (e.g. under npx)
+        except (ProcessLookupError, PermissionError):
+            pass
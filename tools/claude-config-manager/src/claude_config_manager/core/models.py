@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, Field
 
+from . import jsonio
+
 
 class MCPServer(BaseModel):
     """MCP server configuration."""
@@ -28,19 +29,26 @@ class MCPConfig(BaseModel):
 
     @classmethod
     def from_file(cls, path: Path) -> MCPConfig:
-        """Load configuration from file."""
+        """Load configuration from file (memoized while the file is unchanged)."""
         if not path.exists():
             return cls()
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
-        return cls.model_validate(data)
+        return jsonio.load_model(cls, path)
+
+    def to_bytes(self) -> bytes:
+        """Serialize canonically: servers and their env sorted by name, None fields omitted."""
+        servers = self.model_dump(exclude_none=True)["mcpServers"]
+        for server in servers.values():
+            server["env"] = dict(sorted(server["env"].items()))
+        return jsonio.dumps({"mcpServers": dict(sorted(servers.items()))})
+
+    def to_file(self, path: Path) -> bool:
+        """
+        Save configuration to file, unless it already has this content.
 
-    def to_file(self, path: Path) -> None:
-        """Save configuration to file."""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.model_dump(exclude_none=True), f, indent=2, ensure_ascii=False)
-            f.write("\n")
+        Returns:
+            Whether the file was written
+        """
+        return jsonio.write_if_changed(path, self.to_bytes())
 
     def filter_servers(self, names: list[str]) -> MCPConfig:
         """Filter to only include specified servers."""
@@ -55,19 +63,28 @@ class MCPConfig(BaseModel):
 
 
 class ProfileConfig(BaseModel):
-    """Profile configuration for a specific use case."""
+    """
+    Profile configuration for a specific use case.
+
+    A profile may extend other profiles: it gets their servers, skills and
+    env vars (in order), plus its own lists, minus its remove lists.
+    """
 
     name: str
     description: str
+    extends: list[str] = Field(default_factory=list)
     mcpServers: list[str] = Field(default_factory=list)
     skills: list[str] = Field(default_factory=list)
     requiredEnvVars: list[str] = Field(default_factory=list)
+    removeMcpServers: list[str] = Field(default_factory=list)
+    removeSkills: list[str] = Field(default_factory=list)
 
 
 class SkillDependencies(BaseModel):
-    """Skill to MCP server dependencies."""
+    """Skill dependencies on MCP servers (skills) and on other skills (requiredSkills)."""
 
     skills: dict[str, list[str]] = Field(default_factory=dict)
+    requiredSkills: dict[str, list[str]] = Field(default_factory=dict)
 
 
 class ProfilesFile(BaseModel):
@@ -80,10 +97,8 @@ class ProfilesFile(BaseModel):
 
     @classmethod
     def from_file(cls, path: Path) -> ProfilesFile:
-        """Load profiles from file."""
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
-        return cls.model_validate(data)
+        """Load profiles from file (memoized while the file is unchanged)."""
+        return jsonio.load_model(cls, path)
 
 
 class ExportMetadata(BaseModel):
@@ -106,22 +121,16 @@ class ExportedConfig(BaseModel):
     hooks: list[str] = Field(default_factory=list)
     output_styles: list[str] = Field(default_factory=list)
 
-    def to_file(self, path: Path) -> None:
-        """Save exported config to file."""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(
-                self.model_dump(mode="json"),
-                f,
-                indent=2,
-                ensure_ascii=False,
-                default=str,
-            )
-            f.write("\n")
+    def to_file(self, path: Path) -> bool:
+        """
+        Save exported config to file, unless it already has this content.
+
+        Returns:
+            Whether the file was written
+        """
+        return jsonio.write_if_changed(path, jsonio.dumps(self.model_dump(mode="json")))
 
     @classmethod
     def from_file(cls, path: Path) -> ExportedConfig:
-        """Load exported config from file."""
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
-        return cls.model_validate(data)
+        """Load exported config from file (memoized while the file is unchanged)."""
+        return jsonio.load_model(cls, path)
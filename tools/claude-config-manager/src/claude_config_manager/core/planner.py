@@ -0,0 +1,226 @@
+"""Plan the minimal set of operations that brings a project in line with a source."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .manifest import DirManifest
+
+if TYPE_CHECKING:
+    from .config_manager import ConfigManager
+    from .models import MCPConfig
+
+# Operation actions
+ADD = "add"
+REPLACE = "replace"
+DELETE = "delete"
+TOUCH = "touch"  # same content; only mode/mtime are refreshed
+LINK = "link"  # a skill directory is linked from the skill store
+
+_SYMBOLS = {ADD: "+", REPLACE: "~", DELETE: "-", TOUCH: "=", LINK: "@"}
+
+
+@dataclass
+class ResolvedSource:
+    """
+    Source configuration selected and scanned once.
+
+    Shared between targets of a batch import so the source ``.mcp.json``
+    is parsed and each source tree is walked (and each file hashed) at
+    most once, however many targets it is applied to.
+    """
+
+    mcp_config: MCPConfig
+    skills: dict[str, DirManifest]
+    hooks: DirManifest | None = None
+    output_styles: DirManifest | None = None
+    env_example: Path | None = None
+
+    @classmethod
+    def resolve(
+        cls,
+        source: ConfigManager,
+        mcp_servers: list[str] | None = None,
+        skills: list[str] | None = None,
+    ) -> ResolvedSource:
+        """
+        Read the selected servers and scan the selected skills of a source project.
+
+        Args:
+            source: Source project
+            mcp_servers: MCP servers to include (None or empty = all)
+            skills: Skills to include (None = all, empty = none)
+        """
+        mcp_config = source.read_mcp_config()
+        if mcp_servers:
+            mcp_config = mcp_config.filter_servers(mcp_servers)
+        return cls(
+            mcp_config=mcp_config,
+            skills={
+                skill: DirManifest(source.skills_dir / skill)
+                for skill in (source.list_skills() if skills is None else skills)
+                if (source.skills_dir / skill).exists()
+            },
+            hooks=DirManifest(source.hooks_dir) if source.hooks_dir.exists() else None,
+            output_styles=(
+                DirManifest(source.output_styles_dir)
+                if source.output_styles_dir.exists()
+                else None
+            ),
+            env_example=source.env_example_path if source.env_example_path.exists() else None,
+        )
+
+
+@dataclass(frozen=True)
+class Operation:
+    """One change to a file of the target project."""
+
+    action: str
+    path: str
+    source: Path | None = None
+    size: int = 0
+    detail: str = ""
+
+    def describe(self) -> str:
+        """Format as a one-line description."""
+        text = f"{_SYMBOLS[self.action]} {self.path}"
+        if self.detail:
+            text += f"  ({self.detail})"
+        return text
+
+
+@dataclass
+class Plan:
+    """Operations needed to apply a source to a target, in execution order."""
+
+    target: Path
+    operations: list[Operation] = field(default_factory=list)
+    mcp_config: MCPConfig | None = None
+    links: dict[str, DirManifest] = field(default_factory=dict)  # LINK path -> source tree
+
+    def __bool__(self) -> bool:
+        return bool(self.operations)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    @property
+    def bytes_to_copy(self) -> int:
+        """Total size of files that will be copied."""
+        return sum(op.size for op in self.operations if op.action in (ADD, REPLACE))
+
+    def counts(self) -> dict[str, int]:
+        """Number of operations per action."""
+        return dict(Counter(op.action for op in self.operations))
+
+    def summary(self) -> str:
+        """Generate summary string."""
+        if not self.operations:
+            return "up to date"
+        counts = self.counts()
+        parts = [f"{counts[action]} {action}" for action in _SYMBOLS if action in counts]
+        return f"{len(self.operations)} operations: " + ", ".join(parts)
+
+
+def plan_merge(
+    target: ConfigManager, source: ResolvedSource, strategy: str = "overwrite"
+) -> Plan:
+    """
+    Compute what merging source into target would change, without writing.
+
+    Mirrors ConfigManager.merge_config(): the MCP config is replaced (or
+    merged with 'merge'), selected skills are mirrored file by file, and
+    hooks, output styles and ``.env.example`` are only added when the
+    target has none. Files are compared by size and mtime, then by
+    content hash; identical files with different metadata get a TOUCH.
+
+    With a skill store, each skill is one LINK operation unless the
+    target already links the stored tree; without one, a skill that is
+    still linked from a store is unlinked and copied.
+    """
+    plan = Plan(target=target.project_path)
+
+    current = target.read_mcp_config() if target.mcp_config_path.exists() else None
+    desired = source.mcp_config
+    if strategy == "merge" and current is not None:
+        desired = current.merge(desired)
+    if desired != current:
+        plan.mcp_config = desired
+        plan.operations.append(
+            Operation(
+                ADD if current is None else REPLACE,
+                ".mcp.json",
+                detail=_server_changes(current, desired),
+            )
+        )
+
+    store = target.skill_store
+    trees = []
+    for skill, manifest in source.skills.items():
+        prefix = f".claude/skills/{skill}"
+        if store is not None:
+            tree = store.tree_id(manifest)
+            if not store.is_linked(tree, target.project_path / prefix):
+                plan.links[prefix] = manifest
+                plan.operations.append(
+                    Operation(LINK, prefix, manifest.root, detail=f"{store.link_mode} {tree[:12]}")
+                )
+            continue
+        trees.append((prefix, manifest))
+    if source.hooks is not None and not target.hooks_dir.exists():
+        trees.append((".claude/hooks", source.hooks))
+    if source.output_styles is not None and not target.output_styles_dir.exists():
+        trees.append((".claude/output-styles", source.output_styles))
+    for prefix, manifest in trees:
+        path = target.project_path / prefix
+        if path.is_symlink():
+            plan.operations.append(Operation(DELETE, prefix, detail="store link"))
+            current = DirManifest.empty(path)
+        else:
+            current = DirManifest(path)
+        plan.operations.extend(_plan_tree(manifest, current, prefix))
+
+    if source.env_example is not None and not target.env_example_path.exists():
+        plan.operations.append(
+            Operation(
+                ADD,
+                ".env.example",
+                source=source.env_example,
+                size=source.env_example.stat().st_size,
+            )
+        )
+    return plan
+
+
+def _plan_tree(source: DirManifest, target: DirManifest, prefix: str) -> list[Operation]:
+    """Operations that make target's tree identical to source's."""
+    operations = []
+    for rel in source:
+        st = source.stats[rel]
+        path = f"{prefix}/{rel}"
+        if rel in target:
+            if source.quick_match(rel, target):
+                continue
+            if source.same_content(rel, target):
+                operations.append(Operation(TOUCH, path, source.path(rel), detail="metadata"))
+                continue
+            operations.append(Operation(REPLACE, path, source.path(rel), st.st_size))
+        else:
+            operations.append(Operation(ADD, path, source.path(rel), st.st_size))
+    for rel in target:
+        if rel not in source:
+            operations.append(Operation(DELETE, f"{prefix}/{rel}"))
+    return operations
+
+
+def _server_changes(current: MCPConfig | None, desired: MCPConfig) -> str:
+    """Describe added (+), changed (~) and removed (-) servers."""
+    before = current.mcpServers if current is not None else {}
+    after = desired.mcpServers
+    changes = [f"+{name}" for name in after if name not in before]
+    changes += [f"~{name}" for name in after if name in before and before[name] != after[name]]
+    changes += [f"-{name}" for name in before if name not in after]
+    return ", ".join(changes)
@@ -0,0 +1,227 @@
+"""Compiled, disk-cached index of a profiles catalog."""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import jsonio
+from .dep_graph import DependencyGraph
+
+if TYPE_CHECKING:
+    from .models import ProfileConfig, ProfilesFile
+
+INDEX_VERSION = 4
+
+
+@dataclass(frozen=True)
+class ProfileEntry:
+    """A compiled profile: display data plus server and skill bitsets."""
+
+    name: str
+    description: str
+    extends: tuple[str, ...]
+    mcp_servers: tuple[str, ...]
+    skills: tuple[str, ...]  # declared skills plus the skills they need, in install order
+    env_vars: tuple[str, ...]
+    server_mask: int
+    skill_mask: int
+    required_mask: int  # servers needed by the profile's skills, transitively
+
+
+class ProfileIndex:
+    """
+    Profiles catalog compiled for constant-time lookups.
+
+    Server and skill names are interned to integer IDs shared with the
+    catalog's DependencyGraph; each profile holds bitsets of its servers,
+    its skills and the servers its skills transitively depend on. Lookups
+    and dependency checks therefore cost O(selection), not O(catalog).
+    The compiled form, including the dependency closures, is cached with
+    marshal, keyed by the catalog's content hash, so unchanged catalogs
+    are never parsed, validated or solved again.
+    """
+
+    def __init__(self, digest: str, graph: DependencyGraph, profiles: dict[str, ProfileEntry]):
+        """Initialize from compiled tables (see compile() and load())."""
+        self.digest = digest
+        self.graph = graph
+        self.profiles = profiles
+
+    @classmethod
+    def compile(cls, catalog: ProfilesFile, digest: str = "") -> ProfileIndex:
+        """Compile a validated profiles catalog."""
+        servers: dict[str, int] = {}
+        skills: dict[str, int] = {}
+
+        def intern(table: dict[str, int], names: Iterable[str]) -> list[int]:
+            return [table.setdefault(name, len(table)) for name in names]
+
+        deps = catalog.dependencies
+        for skill in [*deps.skills, *deps.requiredSkills]:
+            intern(skills, [skill])
+        direct_servers = {skills[s]: intern(servers, needed) for s, needed in deps.skills.items()}
+        direct_skills = {
+            skills[s]: intern(skills, needed) for s, needed in deps.requiredSkills.items()
+        }
+        flattened = flatten_profiles(catalog.profiles)
+        for profile_servers, profile_skills, _ in flattened.values():
+            intern(skills, profile_skills)
+            intern(servers, profile_servers)
+        graph = DependencyGraph(
+            list(skills),
+            list(servers),
+            [direct_servers.get(i, []) for i in range(len(skills))],
+            [direct_skills.get(i, []) for i in range(len(skills))],
+        )
+
+        profiles = {}
+        for name, (profile_servers, profile_skills, env_vars) in flattened.items():
+            profile = catalog.profiles[name]
+            effective = graph.install_order(profile_skills)
+            profiles[name] = ProfileEntry(
+                name=profile.name,
+                description=profile.description,
+                extends=tuple(profile.extends),
+                mcp_servers=tuple(profile_servers),
+                skills=tuple(effective),
+                env_vars=tuple(env_vars),
+                server_mask=graph.server_mask(profile_servers),
+                skill_mask=graph.skill_mask(effective),
+                required_mask=graph.required_servers_mask(effective),
+            )
+        return cls(digest, graph, profiles)
+
+    @classmethod
+    def load(cls, data: bytes, cache_dir: Path | None = None) -> ProfileIndex:
+        """
+        Return the index of a profiles.json document, compiling it on a cache miss.
+
+        Args:
+            data: Raw profiles.json content
+            cache_dir: Directory of compiled indexes (None = no disk cache)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = cache_dir / f"profiles-{digest[:16]}.idx" if cache_dir else None
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    index = cls._from_tables(marshal.load(f))
+                if index.digest == digest:
+                    return index
+            except (OSError, EOFError, ValueError, TypeError, KeyError):
+                pass
+
+        from .models import ProfilesFile  # pydantic is only needed on a cache miss
+
+        index = cls.compile(ProfilesFile.model_validate(jsonio.loads(data)), digest)
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.tmp")
+                tmp.write_bytes(marshal.dumps(index._tables()))
+                os.replace(tmp, path)
+            except OSError:
+                pass  # An unwritable cache only costs a recompile next time
+        return index
+
+    def _tables(self) -> dict:
+        """Plain containers for marshal."""
+        graph = self.graph
+        skill_closure, server_closure = graph.closures()
+        return {
+            "version": INDEX_VERSION,
+            "digest": self.digest,
+            "servers": graph.servers,
+            "skills": graph.skills,
+            "skill_servers": graph.skill_servers,
+            "skill_requires": graph.skill_requires,
+            "skill_closure": skill_closure,
+            "server_closure": server_closure,
+            "profiles": {
+                key: (
+                    e.name,
+                    e.description,
+                    e.extends,
+                    e.mcp_servers,
+                    e.skills,
+                    e.env_vars,
+                    e.server_mask,
+                    e.skill_mask,
+                    e.required_mask,
+                )
+                for key, e in self.profiles.items()
+            },
+        }
+
+    @classmethod
+    def _from_tables(cls, tables: dict) -> ProfileIndex:
+        if tables["version"] != INDEX_VERSION:
+            raise ValueError("Unsupported profile index version")
+        graph = DependencyGraph(
+            tables["skills"],
+            tables["servers"],
+            tables["skill_servers"],
+            tables["skill_requires"],
+            closures=(tables["skill_closure"], tables["server_closure"]),
+        )
+        profiles = {key: ProfileEntry(*row) for key, row in tables["profiles"].items()}
+        return cls(tables["digest"], graph, profiles)
+
+
+def flatten_profiles(
+    profiles: dict[str, ProfileConfig],
+) -> dict[str, tuple[list[str], list[str], list[str]]]:
+    """
+    Resolve ``extends`` into each profile's effective lists.
+
+    Each profile is flattened once (bases are memoized), so layered
+    catalogs resolve in time linear in their total size.
+
+    Returns:
+        Profile name -> (MCP servers, skills, required env vars)
+
+    Raises:
+        ValueError: If a profile extends an unknown profile or inheritance is cyclic
+    """
+    resolved: dict[str, tuple[list[str], list[str], list[str]]] = {}
+    visiting: list[str] = []
+
+    def resolve(name: str) -> tuple[list[str], list[str], list[str]]:
+        done = resolved.get(name)
+        if done is not None:
+            return done
+        if name in visiting:
+            cycle = " -> ".join([*visiting[visiting.index(name) :], name])
+            raise ValueError(f"Profile inheritance cycle: {cycle}")
+        profile = profiles.get(name)
+        if profile is None:
+            raise ValueError(f"Profile '{visiting[-1]}' extends unknown profile '{name}'")
+
+        servers: dict[str, None] = {}
+        skills: dict[str, None] = {}
+        env_vars: dict[str, None] = {}
+        visiting.append(name)
+        for base_name in profile.extends:
+            base_servers, base_skills, base_env_vars = resolve(base_name)
+            servers.update(dict.fromkeys(base_servers))
+            skills.update(dict.fromkeys(base_skills))
+            env_vars.update(dict.fromkeys(base_env_vars))
+        visiting.pop()
+        servers.update(dict.fromkeys(profile.mcpServers))
+        skills.update(dict.fromkeys(profile.skills))
+        env_vars.update(dict.fromkeys(profile.requiredEnvVars))
+        for server in profile.removeMcpServers:
+            servers.pop(server, None)
+        for skill in profile.removeSkills:
+            skills.pop(skill, None)
+
+        flat = resolved[name] = (list(servers), list(skills), list(env_vars))
+        return flat
+
+    return {name: resolve(name) for name in profiles}
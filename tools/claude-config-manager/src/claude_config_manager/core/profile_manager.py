@@ -2,61 +2,114 @@
 
 from __future__ import annotations
 
+import threading
 from importlib import resources
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from . import jsonio
 from .config_manager import ConfigManager
-from .models import ProfileConfig, ProfilesFile
+from .dep_graph import SERVER, MissingDependency
+from .planner import ResolvedSource
+from .profile_index import ProfileIndex
+from .skill_store import SkillStore
+from .tree_sync import SyncStats
+
+if TYPE_CHECKING:
+    from .models import ProfileConfig
+
+
+_shared: dict[str, ProfileManager] = {}
+_shared_lock = threading.Lock()
 
 
 class ProfileManager:
     """Manages configuration profiles (full, frontend, backend, algorithm)."""
 
-    def __init__(self, profiles_file: Path | None = None):
-        """Initialize with optional custom profiles file."""
-        if profiles_file and profiles_file.exists():
-            self.profiles = ProfilesFile.from_file(profiles_file)
-        else:
-            # Load bundled profiles.json
-            self.profiles = self._load_bundled_profiles()
+    def __init__(self, profiles_file: Path | None = None, cache_dir: Path | None = None):
+        """
+        Initialize with optional custom profiles file.
 
-    def _load_bundled_profiles(self) -> ProfilesFile:
-        """Load the bundled profiles.json from package."""
+        The catalog is compiled into a ProfileIndex that is cached in
+        ``~/.claude-config-manager/cache`` (or cache_dir), keyed by the
+        content hash of profiles.json.
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / ".claude-config-manager" / "cache"
+        self._data = self._read_profiles(profiles_file)
+        self.index = ProfileIndex.load(self._data, cache_dir)
+        self._configs: dict[str, ProfileConfig] = {}
+
+    @classmethod
+    def shared(cls, profiles_file: Path | None = None) -> ProfileManager:
+        """Return the process-wide manager of a profiles file (bundled by default)."""
+        key = str(profiles_file.resolve()) if profiles_file else ""
+        with _shared_lock:
+            manager = _shared.get(key)
+            if manager is None:
+                manager = _shared[key] = cls(profiles_file)
+            return manager
+
+    def _read_profiles(self, profiles_file: Path | None) -> bytes:
+        """Read a profiles.json document, defaulting to the bundled one."""
+        if profiles_file and profiles_file.exists():
+            return profiles_file.read_bytes()
         try:
-            with resources.files("claude_config_manager").joinpath(
-                "profiles.json"
-            ).open("r") as f:
-                import json
-
-                data = json.load(f)
-                return ProfilesFile.model_validate(data)
+            # Load bundled profiles.json
+            bundled = resources.files("claude_config_manager").joinpath("profiles.json")
+            return bundled.read_bytes()
         except Exception:
-            # Return empty profiles if bundled file not found
-            return ProfilesFile(
-                version="1.0.0",
-                description="Default profiles",
-                profiles={},
+            # Empty profiles if bundled file not found
+            return jsonio.dumps(
+                {"version": "1.0.0", "description": "Default profiles", "profiles": {}}
             )
 
     def list_profiles(self) -> list[str]:
         """List available profile names."""
-        return list(self.profiles.profiles.keys())
+        return list(self.index.profiles)
 
     def get_profile(self, name: str) -> ProfileConfig | None:
-        """Get profile configuration by name."""
-        return self.profiles.profiles.get(name)
+        """Get the effective profile configuration by name (inheritance resolved)."""
+        config = self._configs.get(name)
+        if config is None:
+            entry = self.index.profiles.get(name)
+            if entry is None:
+                return None
+            from .models import ProfileConfig
+
+            config = self._configs[name] = ProfileConfig(
+                name=entry.name,
+                description=entry.description,
+                extends=list(entry.extends),
+                mcpServers=list(entry.mcp_servers),
+                skills=list(entry.skills),
+                requiredEnvVars=list(entry.env_vars),
+            )
+        return config
+
+    def get_declared_profile(self, name: str) -> ProfileConfig | None:
+        """Get a profile as written in profiles.json, before inheritance is resolved."""
+        from .models import ProfilesFile
+
+        return ProfilesFile.model_validate(jsonio.loads(self._data)).profiles.get(name)
 
     def get_skill_dependencies(self, skill: str) -> list[str]:
-        """Get MCP server dependencies for a skill."""
-        return self.profiles.dependencies.skills.get(skill, [])
+        """Get MCP server dependencies for a skill, including those of skills it needs."""
+        return self.index.graph.required_servers([skill])
 
     def resolve_dependencies(self, skills: list[str]) -> list[str]:
-        """Resolve all MCP server dependencies for given skills."""
-        mcp_servers = set()
-        for skill in skills:
-            deps = self.get_skill_dependencies(skill)
-            mcp_servers.update(deps)
-        return list(mcp_servers)
+        """Resolve all MCP server dependencies for given skills, in install order."""
+        return self.index.graph.required_servers(skills)
+
+    def install_order(self, skills: list[str]) -> list[str]:
+        """Given skills plus the skills they need, dependencies first."""
+        return self.index.graph.install_order(skills)
+
+    def missing_dependencies(
+        self, mcp_servers: list[str], skills: list[str]
+    ) -> list[MissingDependency]:
+        """Servers and skills needed by a selection but absent from it, with their chains."""
+        return self.index.graph.missing(mcp_servers, skills)
 
     def validate_selection(
         self, mcp_servers: list[str], skills: list[str]
@@ -65,64 +118,71 @@ class ProfileManager:
         Validate that all skill dependencies are satisfied.
         Returns list of missing MCP servers.
         """
-        required = self.resolve_dependencies(skills)
-        missing = [s for s in required if s not in mcp_servers]
-        return missing
+        return [
+            m.name for m in self.missing_dependencies(mcp_servers, skills) if m.kind == SERVER
+        ]
 
     def create_project(
         self,
         target_path: Path,
-        source: ConfigManager,
+        source: ConfigManager | ResolvedSource,
         profile_name: str = "full",
         init_git: bool = False,
-    ) -> None:
+        copy_strategy: str = "auto",
+        commit: bool = False,
+        workers: int | None = None,
+        skill_store: SkillStore | None = None,
+    ) -> SyncStats:
         """
         Create a new project with specified profile.
 
         Args:
             target_path: Path for new project
-            source: Source configuration manager
+            source: Source configuration manager, or a source already
+                resolved for this profile (shared when creating many projects)
             profile_name: Profile to use (full, frontend, backend, algorithm)
             init_git: Whether to initialize git repository
+            copy_strategy: How skill files are copied (auto, hardlink, copy)
+            commit: Also commit the generated files (implies init_git)
+            workers: Concurrent file copies (default: the source's setting)
+            skill_store: Store to link skills from instead of copying them
+
+        Returns:
+            Statistics about the files copied
         """
         profile = self.get_profile(profile_name)
         if not profile:
             raise ValueError(f"Unknown profile: {profile_name}")
 
+        if isinstance(source, ConfigManager):
+            workers = workers or source.copier.workers
+            source = ResolvedSource.resolve(source, profile.mcpServers, profile.skills or None)
+
         # Create target directory
         target_path.mkdir(parents=True, exist_ok=True)
 
         # Create target config manager
-        target = ConfigManager(target_path)
-
-        # Merge with profile filter
-        target.merge_config(
-            source=source,
-            strategy="overwrite",
-            mcp_servers=profile.mcpServers,
-            skills=profile.skills,
+        target = ConfigManager(
+            target_path, workers=workers, copy_strategy=copy_strategy, skill_store=skill_store
         )
 
+        # Apply the profile's selection (no backup for a brand-new target)
+        stats = target.merge_config(source=source, strategy="overwrite")
+
         # Generate README documentation
         self._generate_readme(target_path, profile_name, profile)
 
         # Initialize git if requested
-        if init_git:
-            import subprocess
-
-            subprocess.run(
-                ["git", "init"],
-                cwd=target_path,
-                capture_output=True,
-                check=True,
+        if init_git or commit:
+            from .git_sync import init_repository  # GitPython is slow to import
+
+            init_repository(
+                target_path,
+                commit_message=(
+                    f"Add Claude Code configuration ({profile_name} profile)" if commit else None
+                ),
             )
-
-            # Create .gitignore
-            gitignore_path = target_path / ".gitignore"
-            if not gitignore_path.exists():
-                gitignore_path.write_text(
-                    ".env\n.backup-*\n__pycache__/\n*.pyc\nnode_modules/\n"
-                )
+        return stats
 
     def _generate_readme(
         self, target_path: Path, profile_name: str, profile: ProfileConfig
@@ -219,16 +279,20 @@ Edit files in `.claude/skills/` to customize AI behavior and workflows.
 
     def get_profile_summary(self, name: str) -> dict:
         """Get summary of a profile for display."""
-        profile = self.get_profile(name)
-        if not profile:
+        entry = self.index.profiles.get(name)
+        if entry is None:
             return {}
 
         return {
-            "name": profile.name,
-            "description": profile.description,
-            "mcp_count": len(profile.mcpServers),
-            "skill_count": len(profile.skills),
-            "env_vars": profile.requiredEnvVars,
-            "mcp_servers": profile.mcpServers,
-            "skills": profile.skills,
+            "name": entry.name,
+            "description": entry.description,
+            "extends": list(entry.extends),
+            "mcp_count": len(entry.mcp_servers),
+            "skill_count": len(entry.skills),
+            "env_vars": list(entry.env_vars),
+            "mcp_servers": list(entry.mcp_servers),
+            "skills": list(entry.skills),
+            "missing_dependencies": self.index.graph.server_names(
+                entry.required_mask & ~entry.server_mask
+            ),
         }
@@ -0,0 +1,215 @@
+"""Incremental, crash-safe restore of configuration files."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .copier import CopyEngine
+from .manifest import FileEntry, hash_file, iter_files
+from .tree_sync import SyncStats, prune_empty_dirs
+
+STAGING_DIR = ".ccm-restore"
+JOURNAL_NAME = "journal.json"
+
+
+@dataclass
+class RestoreSource:
+    """Content to restore at one relative path."""
+
+    path: Path
+    size: int
+    mode: int
+    mtime_ns: int
+    hash: str | None = None
+
+    def digest(self) -> str:
+        """Return the content hash, computing it on first use."""
+        if self.hash is None:
+            self.hash = hash_file(self.path)
+        return self.hash
+
+
+def restore_files(
+    project_path: Path,
+    sources: dict[str, RestoreSource],
+    scopes: list[str],
+    engine: CopyEngine,
+    known: dict[str, FileEntry] | None = None,
+) -> SyncStats:
+    """
+    Bring project files in line with sources, touching only what differs.
+
+    Files are compared by size first and by content hash when sizes match;
+    hashes of live files whose size and mtime match an entry in ``known``
+    are reused without reading them. Stale files are deleted only below
+    the given scope prefixes (e.g. ``".claude/"``).
+
+    Differing files are staged next to the project and a journal is
+    written before anything live is touched. The journal is the commit
+    point: once it exists the restore is rolled forward by renames, and
+    recover() completes it after a crash. Before that point the live tree
+    is untouched.
+
+    The guarantee is against crashes, not concurrent readers: each file is
+    swapped in by its own rename, so a process reading the project during
+    the roll-forward can see some files restored and others not. Swapping
+    in a rebuilt ``.claude`` directory instead would mean copying every
+    unchanged file, and without an atomic directory exchange it would
+    still leave a moment with no ``.claude`` at all.
+    """
+    start = time.perf_counter()
+    known = known or {}
+    recover(project_path)
+
+    live: dict[str, os.stat_result] = {}
+    for scope in scopes:
+        name = scope.rstrip("/")
+        for rel, _, st in iter_files(project_path / name, f"{name}/"):
+            live[rel] = st
+    for rel in sources:
+        path = project_path / rel
+        if rel not in live and path.is_file():
+            live[rel] = path.stat()
+
+    stats = SyncStats()
+    writes: list[str] = []
+    chmods: list[tuple[str, int]] = []
+    for rel, source in sources.items():
+        st = live.get(rel)
+        if st is not None and st.st_size == source.size:
+            cached = known.get(rel)
+            if (
+                cached is not None
+                and cached.size == st.st_size
+                and cached.mtime_ns == st.st_mtime_ns
+            ):
+                live_hash = cached.hash
+            else:
+                live_hash = hash_file(project_path / rel)
+            if live_hash == source.digest():
+                if st.st_mode & 0o7777 != source.mode:
+                    if st.st_nlink > 1:
+                        # The mode is shared with the other links; write a copy
+                        writes.append(rel)
+                        continue
+                    chmods.append((rel, source.mode))
+                stats.files_unchanged += 1
+                continue
+        writes.append(rel)
+
+    deletes = [
+        rel
+        for rel in live
+        if rel not in sources and any(rel.startswith(scope) for scope in scopes)
+    ]
+
+    if not writes and not deletes and not chmods:
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    staging = project_path / STAGING_DIR
+    staging.mkdir()
+    try:
+        staged = [(f"{i:06d}", rel) for i, rel in enumerate(writes)]
+        engine.map(
+            lambda item: _stage(sources[item[1]], staging / item[0], engine), staged
+        )
+        _write_journal(
+            staging, {"writes": staged, "deletes": deletes, "chmods": chmods}
+        )
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    recover(project_path)
+
+    stats.files_copied = len(writes)
+    stats.bytes_copied = sum(sources[rel].size for rel in writes)
+    stats.files_deleted = len(deletes)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def recover(project_path: Path) -> bool:
+    """
+    Finish or discard an interrupted restore.
+
+    Returns True if a committed restore was rolled forward.
+    """
+    staging = project_path / STAGING_DIR
+    if not staging.exists():
+        return False
+
+    journal_path = staging / JOURNAL_NAME
+    if not journal_path.exists():
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+
+    with open(journal_path, encoding="utf-8") as f:
+        journal = json.load(f)
+
+    for rel in journal["deletes"]:
+        path = project_path / rel
+        if not path.is_dir():
+            path.unlink(missing_ok=True)
+    prune_empty_dirs(
+        project_path, {str(Path(rel).parent) for rel in journal["deletes"]}
+    )
+
+    for name, rel in journal["writes"]:
+        staged = staging / name
+        if not staged.exists():
+            continue  # Already moved into place before the interruption
+        dest = project_path / rel
+        _clear_path(project_path, dest)
+        os.replace(staged, dest)
+
+    for rel, mode in journal["chmods"]:
+        path = project_path / rel
+        if path.exists():
+            os.chmod(path, mode)
+
+    shutil.rmtree(staging, ignore_errors=True)
+    return True
+
+
+def _stage(source: RestoreSource, dest: Path, engine: CopyEngine) -> None:
+    """Copy one source file into the staging area with its metadata."""
+    engine.copy_bytes(source.path, dest)
+    os.chmod(dest, source.mode)
+    os.utime(dest, ns=(source.mtime_ns, source.mtime_ns))
+    fd = os.open(dest, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_journal(staging: Path, journal: dict) -> None:
+    """Durably write the restore journal, committing the restore."""
+    tmp = staging / f".{JOURNAL_NAME}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(journal, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, staging / JOURNAL_NAME)
+
+
+def _clear_path(root: Path, dest: Path) -> None:
+    """Make room for a file at dest, removing conflicting entries."""
+    if dest.is_dir() and not dest.is_symlink():
+        shutil.rmtree(dest)
+    parent = dest.parent
+    missing = []
+    while parent != root and not parent.is_dir():
+        missing.append(parent)
+        parent = parent.parent
+    for directory in reversed(missing):
+        if directory.exists() or directory.is_symlink():
+            directory.unlink()
+        directory.mkdir()
@@ -0,0 +1,144 @@
+"""Create many projects from a manifest, sharing one resolved source."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import jsonio
+from .batch import DEFAULT_PARALLEL, BatchResult, TargetResult, run_batch
+from .config_manager import ConfigManager
+from .planner import ResolvedSource
+from .profile_manager import ProfileManager
+from .skill_store import SkillStore
+from .tree_sync import SyncStats
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+
+@dataclass
+class ProjectSpec:
+    """One project to create."""
+
+    path: Path
+    profile: str = "full"
+    git: bool = False
+    commit: bool = False
+
+
+def read_manifest(path: Path) -> list[ProjectSpec]:
+    """
+    Read a projects manifest (YAML or JSON).
+
+    The manifest has a ``projects`` list whose entries are paths or
+    mappings with ``path`` and optionally ``profile``, ``git`` and
+    ``commit``; ``defaults`` supplies values for omitted keys and
+    relative paths are resolved against ``root`` (default: the manifest's
+    directory)::
+
+        root: ~/src
+        defaults: {profile: backend, git: true}
+        projects:
+          - billing-api
+          - {path: web, profile: frontend, commit: true}
+
+    Raises:
+        ValueError: If the manifest is malformed
+        RuntimeError: If a YAML manifest is given and PyYAML is not installed
+    """
+    raw = path.read_bytes()
+    if path.suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise RuntimeError(
+                "YAML manifests require the 'pyyaml' package "
+                "(pip install 'claude-config-manager[yaml]'), or use a .json manifest"
+            )
+        data = yaml.safe_load(raw)
+    else:
+        data = jsonio.loads(raw)
+
+    if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+        raise ValueError(f"{path}: expected a mapping with a 'projects' list")
+    defaults = data.get("defaults") or {}
+    root = path.parent / os.path.expanduser(str(data.get("root", ".")))
+
+    specs = []
+    seen = set()
+    for entry in data["projects"]:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        if not isinstance(entry, dict) or "path" not in entry:
+            raise ValueError(f"{path}: project entries need a 'path': {entry!r}")
+        values = {**defaults, **entry}
+        target = (root / os.path.expanduser(str(values["path"]))).resolve()
+        if target in seen:
+            raise ValueError(f"{path}: duplicate project path {target}")
+        seen.add(target)
+        specs.append(
+            ProjectSpec(
+                path=target,
+                profile=str(values.get("profile", "full")),
+                git=bool(values.get("git", False)),
+                commit=bool(values.get("commit", False)),
+            )
+        )
+    return specs
+
+
+def scaffold_projects(
+    source: ConfigManager,
+    specs: list[ProjectSpec],
+    profile_manager: ProfileManager,
+    parallel: int = DEFAULT_PARALLEL,
+    workers: int | None = None,
+    copy_strategy: str = "auto",
+    skill_store: SkillStore | None = None,
+    on_result: Callable[[TargetResult], None] | None = None,
+) -> BatchResult:
+    """
+    Create every project of a manifest, several at a time.
+
+    The source is resolved once per profile and shared by all projects
+    using it. Copy workers are divided between concurrent projects as in
+    import_batch(); a failing project is recorded and does not affect the
+    others. With a skill store, each skill is stored once and linked into
+    every project.
+
+    Raises:
+        ValueError: If a spec names an unknown profile (nothing is created)
+    """
+    start = time.perf_counter()
+    resolved: dict[str, ResolvedSource] = {}
+    for spec in specs:
+        if spec.profile not in resolved:
+            profile = profile_manager.get_profile(spec.profile)
+            if profile is None:
+                raise ValueError(f"Unknown profile: {spec.profile}")
+            resolved[spec.profile] = ResolvedSource.resolve(
+                source, profile.mcpServers, profile.skills or None
+            )
+
+    by_path = {spec.path: spec for spec in specs}
+
+    def create(path: Path, project_workers: int) -> SyncStats:
+        spec = by_path[path]
+        return profile_manager.create_project(
+            spec.path,
+            resolved[spec.profile],
+            profile_name=spec.profile,
+            init_git=spec.git,
+            copy_strategy=copy_strategy,
+            commit=spec.commit,
+            workers=project_workers,
+            skill_store=skill_store,
+        )
+
+    batch = run_batch(list(by_path), create, parallel, workers, on_result)
+    batch.seconds = time.perf_counter() - start  # Including resolving the sources
+    return batch
@@ -0,0 +1,246 @@
+"""Cold-start latency benchmark of MCP servers."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import platform
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .. import __version__
+from . import jsonio
+from .mcp_probe import DEFAULT_TIMEOUT, ProbeResult, probe_async
+from .models import MCPServer
+
+BENCH_VERSION = 1
+METRICS = ("spawn", "initialize", "tools", "total")
+PERCENTILES = (50, 95, 99)
+DEFAULT_ITERATIONS = 20
+DEFAULT_THRESHOLD = 0.2
+
+# Latency increases smaller than this are noise, whatever the ratio
+MIN_DELTA_MS = 5.0
+
+
+@dataclass
+class ServerStats:
+    """Measurements of one server over all runs."""
+
+    name: str
+    runs: int = 0
+    failures: int = 0
+    errors: list[str] = field(default_factory=list)  # distinct failure messages
+    tool_count: int | None = None
+    peak_rss_kb: int | None = None  # highest over all runs
+    samples: dict[str, list[float]] = field(default_factory=lambda: {m: [] for m in METRICS})
+
+    def add(self, result: ProbeResult) -> None:
+        """Record one probe."""
+        self.runs += 1
+        if not result.ok:
+            self.failures += 1
+            if result.error not in self.errors:
+                self.errors.append(result.error)
+            return
+        for metric, value in zip(
+            METRICS, (result.spawn_ms, result.initialize_ms, result.tools_ms, result.total_ms)
+        ):
+            self.samples[metric].append(round(value, 3))
+        self.tool_count = len(result.tools)
+        if result.peak_rss_kb is not None:
+            self.peak_rss_kb = max(self.peak_rss_kb or 0, result.peak_rss_kb)
+
+    def percentiles(self, metric: str) -> dict[str, float]:
+        """p50/p95/p99 of a metric in milliseconds (empty if every run failed)."""
+        values = sorted(self.samples[metric])
+        if not values:
+            return {}
+        return {f"p{p}": round(percentile(values, p), 3) for p in PERCENTILES}
+
+
+@dataclass
+class ServerBenchmark:
+    """Results of a benchmark run, saved as JSON for later comparison."""
+
+    iterations: int
+    concurrency: int
+    servers: dict[str, ServerStats] = field(default_factory=dict)
+    seconds: float = 0.0
+    created: str = ""
+    host: str = ""
+    profile: str | None = None
+
+    def to_dict(self) -> dict:
+        """Serialize, including the percentiles of every metric."""
+        data = asdict(self)
+        data["version"] = BENCH_VERSION
+        data["ccm_version"] = __version__
+        for name, stats in self.servers.items():
+            data["servers"][name]["percentiles"] = {m: stats.percentiles(m) for m in METRICS}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ServerBenchmark:
+        """
+        Load a saved benchmark.
+
+        Raises:
+            ValueError: If the data is not a benchmark of a supported version
+        """
+        if not isinstance(data, dict) or data.get("version") != BENCH_VERSION:
+            raise ValueError("Not a server benchmark, or of an unsupported version")
+        fields = ServerStats.__dataclass_fields__
+        servers = {
+            name: ServerStats(**{k: v for k, v in raw.items() if k in fields})
+            for name, raw in data.get("servers", {}).items()
+        }
+        return cls(
+            iterations=data["iterations"],
+            concurrency=data["concurrency"],
+            servers=servers,
+            seconds=data.get("seconds", 0.0),
+            created=data.get("created", ""),
+            host=data.get("host", ""),
+            profile=data.get("profile"),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the benchmark to a JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(jsonio.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: Path) -> ServerBenchmark:
+        """
+        Read a benchmark saved with save().
+
+        Raises:
+            ValueError: If the file is not a benchmark
+        """
+        return cls.from_dict(jsonio.loads(path.read_bytes()))
+
+    def ranked(self) -> list[ServerStats]:
+        """Servers from slowest to fastest median startup, failing servers first."""
+
+        def key(stats: ServerStats) -> tuple[bool, float]:
+            p50 = stats.percentiles("total").get("p50")
+            return (p50 is not None, -(p50 or 0.0))
+
+        return sorted(self.servers.values(), key=key)
+
+
+@dataclass
+class Regression:
+    """A measurement that got worse than in the baseline."""
+
+    server: str
+    metric: str  # e.g. "total p95", "peak RSS", "failures"
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative increase (0.25 = 25% worse)."""
+        return (self.current - self.baseline) / self.baseline if self.baseline else float("inf")
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Percentile of sorted values, interpolating linearly between ranks."""
+    rank = (len(values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def bench_servers(
+    servers: dict[str, MCPServer],
+    iterations: int = DEFAULT_ITERATIONS,
+    concurrency: int = 1,
+    timeout: float = DEFAULT_TIMEOUT,
+    warmup: int = 1,
+    cwd: Path | None = None,
+    on_round: Callable[[int, list[ProbeResult]], None] | None = None,
+) -> ServerBenchmark:
+    """
+    Cold-start every server repeatedly and collect latency and memory statistics.
+
+    Each round starts every server once as a fresh process (see
+    mcp_probe.probe()), running ``concurrency`` at a time, and stops it
+    after tools/list; rounds interleave the servers so that slow periods
+    of the machine affect all of them alike. Warm-up rounds fill caches
+    such as npx's package cache and are not recorded.
+
+    Args:
+        servers: Server name -> configuration
+        iterations: Recorded rounds
+        concurrency: Servers started at the same time (1 measures each in isolation)
+        timeout: Seconds allowed per server start
+        warmup: Unrecorded rounds run first
+        cwd: Working directory of the servers
+        on_round: Called after each recorded round with its number and results
+    """
+    start = time.perf_counter()
+    benchmark = ServerBenchmark(
+        iterations=iterations,
+        concurrency=concurrency,
+        servers={name: ServerStats(name) for name in servers},
+        created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        host=f"{platform.node()} {platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+    )
+
+    async def run() -> None:
+        for i in range(warmup + iterations):
+            results = await probe_async(servers, concurrency, timeout, cwd, memory=True)
+            if i < warmup:
+                continue
+            for result in results:
+                benchmark.servers[result.name].add(result)
+            if on_round is not None:
+                on_round(i - warmup + 1, results)
+
+    asyncio.run(run())
+    benchmark.seconds = time.perf_counter() - start
+    return benchmark
+
+
+def compare(
+    current: ServerBenchmark,
+    baseline: ServerBenchmark,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """
+    Find servers that start slower, use more memory or fail more than in a baseline.
+
+    A latency percentile regresses when it grows by more than ``threshold``
+    (relative) and by more than MIN_DELTA_MS; peak RSS when it grows by
+    more than ``threshold``. Servers missing from either run are ignored.
+    """
+    regressions = []
+    for name, stats in current.servers.items():
+        base = baseline.servers.get(name)
+        if base is None:
+            continue
+        if stats.runs and base.runs and stats.failures / stats.runs > base.failures / base.runs:
+            regressions.append(
+                Regression(name, "failures", base.failures / base.runs, stats.failures / stats.runs)
+            )
+        for metric in METRICS:
+            before = base.percentiles(metric)
+            after = stats.percentiles(metric)
+            for key, value in after.items():
+                old = before.get(key)
+                if old is None:
+                    continue
+                if value > old * (1 + threshold) and value - old > MIN_DELTA_MS:
+                    regressions.append(Regression(name, f"{metric} {key}", old, value))
+        if (
+            stats.peak_rss_kb is not None
+            and base.peak_rss_kb
+            and stats.peak_rss_kb > base.peak_rss_kb * (1 + threshold)
+        ):
+            regressions.append(Regression(name, "peak RSS", base.peak_rss_kb, stats.peak_rss_kb))
+    return regressions
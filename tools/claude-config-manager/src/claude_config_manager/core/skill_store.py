@@ -0,0 +1,536 @@
+"""Content-addressed store of skill trees shared by all projects."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import jsonio
+from .backup_store import disk_size
+from .copier import CopyEngine
+from .fingerprint import tree_hash
+from .locking import store_lock
+from .manifest import INTERNAL_PREFIX, DirManifest, hash_file, iter_files
+
+STORE_DIR = Path.home() / ".claude-config-manager" / "store"
+TREE_VERSION = 1
+
+# How stored trees are materialized in projects:
+#   hardlink - a real skill directory whose files are hard links into the store
+#   symlink  - the skill directory is a symlink to the stored tree
+LINK_MODES = ("hardlink", "symlink")
+
+_EXEC_SUFFIX = "-x"
+
+# Trees stored or reused this recently survive gc: the project linking
+# them may not be registered yet
+TREE_GRACE_SECONDS = 3600
+
+
+@dataclass
+class StoreGCResult:
+    """Result of a store garbage collection run."""
+
+    dropped_refs: int = 0
+    removed_trees: list[str] = field(default_factory=list)
+    removed_objects: int = 0
+    freed_bytes: int = 0
+
+
+@dataclass
+class StoreVerifyResult:
+    """Result of a store integrity check."""
+
+    objects: int = 0
+    trees: int = 0
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether no problem was found."""
+        return not self.problems
+
+
+@dataclass
+class StoreInfo:
+    """Size and usage of the store."""
+
+    trees: int
+    objects: int
+    projects: int
+    disk_bytes: int
+
+
+class SkillStore:
+    """
+    Global, content-addressed store of skill trees (pnpm style).
+
+    Layout::
+
+        <root>/files/ab/cdef...[-x]    one read-only blob per unique content
+                                       (-x: the executable variant)
+        <root>/trees/<tree>/           a skill tree, files hard-linked to blobs
+        <root>/trees/<tree>.json       its manifest: relative path -> blob key
+        <root>/refs/<project>.json     skills a project links, for gc
+
+    A tree is keyed by the hash of its paths, contents and executable
+    bits, so each distinct skill version is stored once however many
+    projects use it. Projects get hard links to the stored files (or one
+    symlink per skill), which makes importing a skill cost a directory of
+    links instead of a copy. Stored files and tree directories are
+    read-only, so editing a linked file in a project cannot alter the
+    store. Adding trees, registering projects and gc hold a lock file in
+    the root, so threads and concurrent ccm processes can share a store.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        link_mode: str = "hardlink",
+        engine: CopyEngine | None = None,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory (default: ~/.claude-config-manager/store)
+            link_mode: 'hardlink' or 'symlink' (see LINK_MODES)
+            engine: Copy engine for blob writes and cross-device fallbacks
+        """
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link_mode}")
+        self.root = root or STORE_DIR
+        self.link_mode = link_mode
+        self.engine = engine or CopyEngine(strategy="auto")
+        self.files_dir = self.root / "files"
+        self.trees_dir = self.root / "trees"
+        self.refs_dir = self.root / "refs"
+        self._lock = threading.Lock()
+        self._trees: dict[str, dict[str, str]] = {}
+        self._tree_ids: weakref.WeakKeyDictionary[DirManifest, str] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def blob_path(self, key: str) -> Path:
+        """Return the path of a blob by key (content hash, optionally ``-x``)."""
+        return self.files_dir / key[:2] / key[2:]
+
+    def tree_path(self, tree: str) -> Path:
+        """Return the directory of a stored tree."""
+        return self.trees_dir / tree
+
+    def has_tree(self, tree: str) -> bool:
+        """Check whether a tree is stored (its manifest is written last)."""
+        return (self.trees_dir / f"{tree}.json").exists()
+
+    def read_tree(self, tree: str) -> dict[str, str]:
+        """Return a stored tree's relative path -> blob key mapping (memoized; trees never change)."""
+        files = self._trees.get(tree)
+        if files is None:
+            files = jsonio.read_json(self.trees_dir / f"{tree}.json")["files"]
+            self._trees[tree] = files
+        return files
+
+    def tree_id(self, manifest: DirManifest) -> str:
+        """
+        Compute the key a directory would be stored under.
+
+        Hashes every file of the manifest on the copy engine's pool. The
+        key is memoized per manifest, so a source shared between targets
+        is only read and hashed once.
+        """
+        tree = self._tree_ids.get(manifest)
+        if tree is None:
+            self.engine.map(manifest.hash, list(manifest))
+            tree = tree_hash(_blob_keys(manifest))
+            self._tree_ids[manifest] = tree
+        return tree
+
+    def add_tree(self, manifest: DirManifest) -> str:
+        """
+        Store a directory tree and return its key.
+
+        Only blobs not already in the store are written; storing an
+        unchanged tree again costs a lookup.
+        """
+        tree = self.tree_id(manifest)
+        path = self.trees_dir / f"{tree}.json"
+        with self._lock, store_lock(self.root):
+            if self.has_tree(tree):
+                os.utime(path)  # Restart its gc grace period
+                return tree
+            keys = _blob_keys(manifest)
+            self.trees_dir.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(dir=self.trees_dir, prefix=".tmp-"))
+            try:
+                for rel, key in keys.items():
+                    blob = self._put_blob(manifest.path(rel), key)
+                    dest = staging / rel
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(blob, dest)
+                _make_read_only(staging)
+                final = self.tree_path(tree)
+                if final.exists():
+                    # No manifest, and nobody else can be adding it: left
+                    # over by an interrupted add
+                    _remove_tree(final)
+                os.replace(staging, final)
+            except BaseException:
+                _remove_tree(staging)
+                raise
+            tmp = path.with_name(f".{path.name}.tmp")
+            tmp.write_bytes(jsonio.dumps({"version": TREE_VERSION, "files": keys}))
+            os.replace(tmp, path)
+        return tree
+
+    def _put_blob(self, source: Path, key: str) -> Path:
+        """Write a read-only blob for a source file unless it exists."""
+        blob = self.blob_path(key)
+        if blob.exists():
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=blob.parent, prefix=".tmp-")
+        os.close(fd)
+        try:
+            self.engine.copy_bytes(source, tmp)
+            os.chmod(tmp, 0o555 if key.endswith(_EXEC_SUFFIX) else 0o444)
+            os.replace(tmp, blob)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return blob
+
+    def is_linked(self, tree: str, dest: Path) -> bool:
+        """
+        Check whether dest is already a materialization of a stored tree.
+
+        Compares symlink targets or inodes only; no file is read.
+        """
+        if not self.has_tree(tree):
+            return False
+        source = self.tree_path(tree)
+        if dest.is_symlink():
+            return self.link_mode == "symlink" and os.readlink(dest) == os.fspath(source)
+        if self.link_mode != "hardlink" or not dest.is_dir():
+            return False
+        files = self.read_tree(tree)
+        linked = 0
+        for rel, _, st in iter_files(dest):
+            try:
+                if rel not in files or not os.path.samestat(st, os.stat(source / rel)):
+                    return False
+            except FileNotFoundError:
+                return False
+            linked += 1
+        return linked == len(files)
+
+    def link(self, tree: str, dest: Path) -> int:
+        """
+        Materialize a stored tree at dest, replacing what is there.
+
+        In hardlink mode the tree is linked into a staging directory next
+        to dest and swapped in; files on another filesystem are copied
+        instead. In symlink mode dest becomes a symlink to the tree.
+
+        Returns:
+            Number of links created
+        """
+        source = self.tree_path(tree)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        staging = dest.with_name(f"{INTERNAL_PREFIX}tmp-{dest.name}")
+        _remove_entry(staging)
+        try:
+            if self.link_mode == "symlink":
+                os.symlink(source, staging, target_is_directory=True)
+                count = 1
+            else:
+                staging.mkdir()
+                count = 0
+                for rel in self.read_tree(tree):
+                    target = staging / rel
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        os.link(source / rel, target)
+                    except OSError:
+                        self.engine.copy_bytes(source / rel, os.fspath(target))
+                        shutil.copymode(source / rel, target)
+                    count += 1
+            if dest.is_dir() and not dest.is_symlink():
+                old = dest.with_name(f"{INTERNAL_PREFIX}old-{dest.name}")
+                _remove_entry(old)
+                os.replace(dest, old)
+                os.replace(staging, dest)
+                _remove_entry(old)
+            else:
+                if self.link_mode == "hardlink":
+                    _remove_entry(dest)  # a directory cannot be renamed over a link
+                os.replace(staging, dest)
+        except BaseException:
+            _remove_entry(staging)
+            raise
+        return count
+
+    def register(self, project_path: Path, skills: dict[str, str]) -> None:
+        """Record that a project links the given skill -> tree mapping."""
+        project = os.fspath(project_path.resolve())
+        path = self._ref_path(project)
+        with self._lock, store_lock(self.root):
+            try:
+                links = jsonio.read_json(path).get("skills", {})
+            except (OSError, ValueError):
+                links = {}
+            links.update(skills)
+            data = {"project": project, "skills": dict(sorted(links.items()))}
+            jsonio.write_if_changed(path, jsonio.dumps(data))
+
+    def _ref_path(self, project: str) -> Path:
+        digest = hashlib.sha256(project.encode("utf-8")).hexdigest()
+        return self.refs_dir / f"{digest[:24]}.json"
+
+    def _read_refs(self) -> list[tuple[Path, dict]]:
+        """Return (ref file, data) for every registered project."""
+        if not self.refs_dir.exists():
+            return []
+        refs = []
+        for path in sorted(self.refs_dir.glob("*.json")):
+            try:
+                refs.append((path, jsonio.read_json(path)))
+            except (OSError, ValueError):
+                refs.append((path, {}))
+        return refs
+
+    def _stored_trees(self) -> list[str]:
+        if not self.trees_dir.exists():
+            return []
+        return sorted(
+            p.name[: -len(".json")]
+            for p in self.trees_dir.glob("*.json")
+            if not p.name.startswith(".")
+        )
+
+    def info(self) -> StoreInfo:
+        """Count trees, blobs and registered projects and measure disk use."""
+        objects = 0
+        disk_bytes = 0
+        if self.files_dir.exists():
+            for _, _, st in iter_files(self.files_dir):
+                objects += 1
+                disk_bytes += disk_size(st)
+        return StoreInfo(
+            trees=len(self._stored_trees()),
+            objects=objects,
+            projects=len(self._read_refs()),
+            disk_bytes=disk_bytes,
+        )
+
+    def gc(self, dry_run: bool = False) -> StoreGCResult:
+        """
+        Remove trees no project links any more, then orphaned blobs.
+
+        A project's reference to a tree holds while its skill directory
+        still is that tree's symlink or hard links; references of removed
+        projects and replaced skills are dropped. A blob is orphaned when
+        no stored tree and no project file links it (link count 1). Holds
+        the store lock, so a concurrent add_tree() never sees its new blobs
+        or tree removed, and keeps trees stored or reused within
+        TREE_GRACE_SECONDS for imports that have not registered yet.
+        """
+        result = StoreGCResult()
+        live: set[str] = set()
+        with self._lock, store_lock(self.root):
+            for path, data in self._read_refs():
+                project = Path(data.get("project", ""))
+                skills = {
+                    skill: tree
+                    for skill, tree in data.get("skills", {}).items()
+                    if self._still_linked(tree, project / ".claude" / "skills" / skill)
+                }
+                live.update(skills.values())
+                if skills == data.get("skills"):
+                    continue
+                result.dropped_refs += len(data.get("skills", {})) - len(skills)
+                if dry_run:
+                    continue
+                if skills:
+                    jsonio.write_if_changed(
+                        path, jsonio.dumps({"project": data["project"], "skills": skills})
+                    )
+                else:
+                    path.unlink(missing_ok=True)
+
+            recent = time.time() - TREE_GRACE_SECONDS
+            for tree in self._stored_trees():
+                if tree in live or self._tree_mtime(tree) > recent:
+                    continue
+                result.removed_trees.append(tree)
+                if not dry_run:
+                    (self.trees_dir / f"{tree}.json").unlink(missing_ok=True)
+                    _remove_tree(self.tree_path(tree))
+
+            # A dry run keeps the trees, so discount their links by hand
+            pending: Counter[str] = Counter()
+            if dry_run:
+                for tree in result.removed_trees:
+                    pending.update(self.read_tree(tree).values())
+            if self.files_dir.exists():
+                for rel, blob, st in iter_files(self.files_dir):
+                    if st.st_nlink - 1 > pending[rel.replace("/", "")]:
+                        continue
+                    result.removed_objects += 1
+                    result.freed_bytes += disk_size(st)
+                    if not dry_run:
+                        blob.unlink(missing_ok=True)
+        return result
+
+    def _tree_mtime(self, tree: str) -> float:
+        try:
+            return (self.trees_dir / f"{tree}.json").stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def _still_linked(self, tree: str, dest: Path) -> bool:
+        """Check a project path still materializes a tree in either link mode."""
+        if not self.has_tree(tree):
+            return False
+        if dest.is_symlink():
+            return os.readlink(dest) == os.fspath(self.tree_path(tree))
+        try:
+            return any(
+                os.path.samestat(st, os.stat(self.tree_path(tree) / rel))
+                for rel, _, st in iter_files(dest)
+            )
+        except FileNotFoundError:
+            return False
+
+    def verify(self) -> StoreVerifyResult:
+        """
+        Check every blob against its content hash and every tree against its manifest.
+
+        Also reports blobs that became writable (and could be modified
+        through a project's hard link).
+        """
+        result = StoreVerifyResult()
+        if self.files_dir.exists():
+            results = self.engine.map(self._verify_blob, list(iter_files(self.files_dir)))
+            result.objects = len(results)
+            result.problems.extend(p for p in results if p)
+
+        for tree in self._stored_trees():
+            result.trees += 1
+            try:
+                files = self.read_tree(tree)
+            except (OSError, ValueError, KeyError) as e:
+                result.problems.append(f"tree {tree[:12]}: unreadable manifest ({e})")
+                continue
+            root = self.tree_path(tree)
+            actual = {rel: st for rel, _, st in iter_files(root)}
+            for rel, key in files.items():
+                st = actual.pop(rel, None)
+                if st is None:
+                    result.problems.append(f"tree {tree[:12]}: missing {rel}")
+                    continue
+                try:
+                    blob_st = os.stat(self.blob_path(key))
+                except FileNotFoundError:
+                    result.problems.append(f"tree {tree[:12]}: {rel} has no blob {key[:12]}")
+                    continue
+                if not os.path.samestat(st, blob_st):
+                    result.problems.append(f"tree {tree[:12]}: {rel} is not linked to its blob")
+            for rel in actual:
+                result.problems.append(f"tree {tree[:12]}: unexpected file {rel}")
+            if tree_hash(files) != tree:
+                result.problems.append(f"tree {tree[:12]}: manifest does not match its key")
+        return result
+
+    def _verify_blob(self, item: tuple[str, Path, os.stat_result]) -> str | None:
+        rel, blob, st = item
+        if rel.rsplit("/", 1)[-1].startswith(".tmp-"):
+            return None  # interrupted write, removed by gc
+        key = rel.replace("/", "")
+        digest = key.removesuffix(_EXEC_SUFFIX)
+        if hash_file(blob) != digest:
+            return f"blob {key[:12]}: content does not match its hash"
+        if st.st_mode & 0o222:
+            return f"blob {key[:12]}: writable (mode {stat.S_IMODE(st.st_mode):o})"
+        return None
+
+
+def is_store_link(path: Path) -> bool:
+    """Check whether a path is a symlink to a tree of a skill store."""
+    if not path.is_symlink():
+        return False
+    target = Path(os.readlink(path))
+    return (target.parent / f"{target.name}.json").exists()
+
+
+def detach(path: Path) -> int:
+    """
+    Replace a symlink to a stored tree with a directory of hard links.
+
+    Used before writing files into a symlinked skill, which would
+    otherwise write into the store. Files stay read-only and shared; they
+    are replaced, never modified, by later writes.
+
+    Returns:
+        Number of files linked
+    """
+    source = Path(os.readlink(path))
+    staging = path.with_name(f"{INTERNAL_PREFIX}tmp-{path.name}")
+    _remove_entry(staging)
+    count = 0
+    try:
+        staging.mkdir()
+        for rel, file, _ in iter_files(source):
+            dest = staging / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(file, dest)
+            except OSError:
+                shutil.copy2(file, dest)
+            count += 1
+        path.unlink()
+        os.replace(staging, path)
+    except BaseException:
+        _remove_entry(staging)
+        raise
+    return count
+
+
+def _blob_keys(manifest: DirManifest) -> dict[str, str]:
+    """Blob key of every file: content hash plus the executable marker."""
+    return {
+        rel: manifest.hash(rel) + (_EXEC_SUFFIX if st.st_mode & 0o111 else "")
+        for rel, st in manifest.stats.items()
+    }
+
+
+def _make_read_only(root: Path) -> None:
+    """Remove write permission from a directory tree's directories."""
+    for dirpath, _, _ in os.walk(root, topdown=False):
+        os.chmod(dirpath, 0o555)
+
+
+def _remove_tree(root: Path) -> None:
+    """Delete a read-only directory tree."""
+    if not root.exists():
+        return
+    for dirpath, _, _ in os.walk(root):
+        os.chmod(dirpath, 0o755)
+    shutil.rmtree(root)
+
+
+def _remove_entry(path: Path) -> None:
+    """Delete a file, symlink or directory if it exists."""
+    if path.is_symlink() or path.is_file():
+        path.unlink()
+    elif path.is_dir():
+        _remove_tree(path)
@@ -0,0 +1,166 @@
+"""Cached single-pass scan of a project's configuration layout."""
+
+from __future__ import annotations
+
+import os
+import stat
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .manifest import INTERNAL_PREFIX
+
+# Top-level files captured alongside the .claude/ tree
+ROOT_FILES = (".mcp.json", ".env.example")
+
+
+@dataclass(frozen=True)
+class EntryInfo:
+    """Type and stat metadata of one scanned entry."""
+
+    is_dir: bool
+    size: int
+    mode: int
+    mtime_ns: int
+    nlink: int = 1
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result) -> EntryInfo:
+        """Build entry info from a stat result."""
+        return cls(
+            is_dir=stat.S_ISDIR(st.st_mode),
+            size=st.st_size,
+            mode=st.st_mode,
+            mtime_ns=st.st_mtime_ns,
+            nlink=st.st_nlink,
+        )
+
+
+@dataclass
+class ProjectSnapshot:
+    """
+    Entries of a project's configuration captured by one os.scandir walk.
+
+    Covers ``.mcp.json``, ``.env.example`` and everything below
+    ``.claude/`` (internal ``.ccm-*`` entries excluded). Paths are relative
+    posix paths such as ``.claude/skills/foo/SKILL.md``.
+
+    The snapshot records the mtime of every directory it listed and is
+    considered stale once any of them changes, i.e. when entries are added,
+    removed or renamed. In-place edits of existing files do not change
+    directory mtimes; writers in this package invalidate explicitly.
+    """
+
+    project_path: Path
+    entries: dict[str, EntryInfo] = field(default_factory=dict)
+    children: dict[str, list[str]] = field(default_factory=dict)
+    dir_mtimes: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def scan(cls, project_path: Path) -> ProjectSnapshot:
+        """Scan a project's configuration files."""
+        snapshot = cls(project_path=project_path)
+        try:
+            snapshot.dir_mtimes[""] = os.stat(project_path).st_mtime_ns
+        except FileNotFoundError:
+            return snapshot
+
+        for name in ROOT_FILES:
+            try:
+                st = os.stat(project_path / name)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            snapshot.entries[name] = EntryInfo.from_stat(st)
+
+        claude_dir = project_path / ".claude"
+        try:
+            st = os.stat(claude_dir)
+        except FileNotFoundError:
+            return snapshot
+        if stat.S_ISDIR(st.st_mode):
+            snapshot.entries[".claude"] = EntryInfo.from_stat(st)
+            snapshot._walk(claude_dir, ".claude", st.st_mtime_ns)
+        return snapshot
+
+    def _walk(self, path: Path, rel: str, mtime_ns: int) -> None:
+        """Record the entries of one directory and recurse into subdirectories."""
+        self.dir_mtimes[rel] = mtime_ns
+        names: list[str] = []
+        try:
+            it = os.scandir(path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            self.children[rel] = names
+            return
+        with it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            if entry.name.startswith(INTERNAL_PREFIX):
+                continue
+            try:
+                info = EntryInfo.from_stat(entry.stat())
+            except FileNotFoundError:
+                continue
+            child = f"{rel}/{entry.name}"
+            self.entries[child] = info
+            names.append(entry.name)
+            if info.is_dir:
+                self._walk(Path(entry.path), child, info.mtime_ns)
+        self.children[rel] = names
+
+    def is_stale(self) -> bool:
+        """Check whether any scanned directory changed since the scan."""
+        for rel, mtime_ns in self.dir_mtimes.items():
+            try:
+                if os.stat(self.project_path / rel).st_mtime_ns != mtime_ns:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def get(self, rel: str) -> EntryInfo | None:
+        """Return info for a relative path, if it exists."""
+        return self.entries.get(rel)
+
+    def exists(self, rel: str) -> bool:
+        """Check whether a relative path exists."""
+        return rel in self.entries
+
+    def is_dir(self, rel: str) -> bool:
+        """Check whether a relative path is a directory."""
+        info = self.entries.get(rel)
+        return info is not None and info.is_dir
+
+    def list_dir(self, rel: str) -> list[tuple[str, EntryInfo]]:
+        """List (name, info) pairs of a scanned directory."""
+        return [(name, self.entries[f"{rel}/{name}"]) for name in self.children.get(rel, [])]
+
+    def list_dirs(self, rel: str) -> list[str]:
+        """List names of subdirectories of a scanned directory."""
+        return [name for name, info in self.list_dir(rel) if info.is_dir]
+
+    def list_files(self, rel: str) -> list[str]:
+        """List names of files in a scanned directory."""
+        return [name for name, info in self.list_dir(rel) if not info.is_dir]
+
+    def skills(self) -> list[str]:
+        """List installed skill names."""
+        return [
+            name for name in self.list_dirs(".claude/skills") if not name.startswith(".")
+        ]
+
+    def hooks(self) -> list[str]:
+        """List hook file names."""
+        return self.list_files(".claude/hooks")
+
+    def output_styles(self) -> list[str]:
+        """List output style file names."""
+        return self.list_files(".claude/output-styles")
+
+    def walk_files(self, rel: str) -> Iterator[tuple[str, EntryInfo]]:
+        """Yield (relative path, info) for all files below a directory."""
+        for name, info in self.list_dir(rel):
+            child = f"{rel}/{name}"
+            if info.is_dir:
+                yield from self.walk_files(child)
+            else:
+                yield child, info
@@ -0,0 +1,219 @@
+"""Streaming export format for piping configuration between machines."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import os
+import struct
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from . import jsonio
+from .manifest import CHUNK_SIZE
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+STREAM_MAGIC = b"CCMS\x00\x01\x00\x00"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Record header: type (1 byte) and length of the JSON header that follows
+RECORD = struct.Struct("<cI")
+RECORD_MANIFEST = b"M"
+RECORD_FILE = b"F"
+RECORD_END = b"E"
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+
+def available_compressions() -> list[str]:
+    """List compressions usable in this environment."""
+    return [c for c in COMPRESSIONS if c != "zstd" or zstandard is not None]
+
+
+def is_stream(path: Path) -> bool:
+    """Check whether a file holds a (possibly compressed) configuration stream."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(len(STREAM_MAGIC))
+    except OSError:
+        return False
+    return head == STREAM_MAGIC or head.startswith((GZIP_MAGIC, ZSTD_MAGIC))
+
+
+@dataclass(frozen=True)
+class StreamFile:
+    """A file record in a stream; its content follows the header."""
+
+    path: str
+    size: int
+    mode: int
+    mtime_ns: int
+
+
+class StreamWriter:
+    """
+    Writes a configuration stream to a binary file object.
+
+    Layout (optionally wrapped in gzip or zstd)::
+
+        STREAM_MAGIC
+        M record: manifest JSON
+        F record: file JSON header, then exactly ``size`` content bytes
+        ...
+        E record
+
+    Records are written as soon as they are added, so a reader on the
+    other end of a pipe can apply files while the export is still running.
+    """
+
+    def __init__(self, fp: BinaryIO, compression: str = "gzip"):
+        """Start a stream on fp with the given compression."""
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError(
+                "zstd compression requires the 'zstandard' package "
+                "(pip install claude-config-manager[fast])"
+            )
+        self._raw = fp
+        if compression == "gzip":
+            self._fp: BinaryIO = gzip.GzipFile(fileobj=fp, mode="wb", compresslevel=6)
+        elif compression == "zstd":
+            self._fp = zstandard.ZstdCompressor().stream_writer(fp, closefd=False)
+        else:
+            self._fp = fp
+        self._fp.write(STREAM_MAGIC)
+
+    def _record(self, kind: bytes, header: dict[str, Any] | None = None) -> None:
+        data = json.dumps(header, separators=(",", ":")).encode() if header else b""
+        self._fp.write(RECORD.pack(kind, len(data)))
+        self._fp.write(data)
+
+    def write_manifest(self, manifest: dict[str, Any]) -> None:
+        """Write the manifest record; must come first."""
+        self._record(RECORD_MANIFEST, manifest)
+
+    def add_file(self, rel: str, path: Path) -> StreamFile:
+        """Stream a file from disk under a relative path."""
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            entry = StreamFile(
+                path=rel,
+                size=st.st_size,
+                mode=st.st_mode & 0o7777,
+                mtime_ns=st.st_mtime_ns,
+            )
+            self._record(RECORD_FILE, asdict(entry))
+            remaining = entry.size
+            while remaining:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise RuntimeError(f"File shrank while exporting: {path}")
+                self._fp.write(chunk)
+                remaining -= len(chunk)
+        return entry
+
+    def close(self) -> None:
+        """Write the end record and flush the stream (fp itself stays open)."""
+        self._record(RECORD_END)
+        if self._fp is not self._raw:
+            self._fp.close()
+        self._raw.flush()
+
+
+class StreamReader:
+    """
+    Reads a configuration stream incrementally.
+
+    The compression is detected from the first bytes. Iterating yields
+    file records as they arrive; call extract() to write the current
+    file, otherwise its content is skipped when iteration continues.
+    """
+
+    def __init__(self, fp: BinaryIO):
+        """Open a stream and read its manifest record."""
+        if not hasattr(fp, "peek"):
+            fp = io.BufferedReader(fp)
+        head = fp.peek(len(ZSTD_MAGIC))[: len(ZSTD_MAGIC)]
+        if head.startswith(GZIP_MAGIC):
+            self._fp: BinaryIO = gzip.GzipFile(fileobj=fp, mode="rb")
+        elif head == ZSTD_MAGIC:
+            if zstandard is None:
+                raise RuntimeError(
+                    "Stream is zstd-compressed; install the 'zstandard' package"
+                )
+            self._fp = zstandard.ZstdDecompressor().stream_reader(fp, closefd=False)
+        else:
+            self._fp = fp
+
+        if self._read_exact(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise ValueError("Not a configuration stream")
+        kind, header = self._next_record()
+        if kind != RECORD_MANIFEST:
+            raise ValueError("Configuration stream does not start with a manifest")
+        self.manifest: dict[str, Any] = header
+        self._pending = 0
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self._fp.read(size)
+        while len(data) < size:
+            chunk = self._fp.read(size - len(data))
+            if not chunk:
+                raise ValueError("Configuration stream ended unexpectedly")
+            data += chunk
+        return data
+
+    def _next_record(self) -> tuple[bytes, dict[str, Any]]:
+        kind, length = RECORD.unpack(self._read_exact(RECORD.size))
+        header = jsonio.loads(self._read_exact(length)) if length else {}
+        return kind, header
+
+    def __iter__(self) -> Iterator[StreamFile]:
+        """Yield file records until the end record."""
+        while True:
+            self._skip()
+            kind, header = self._next_record()
+            if kind == RECORD_END:
+                return
+            if kind != RECORD_FILE:
+                raise ValueError(f"Unexpected record in configuration stream: {kind!r}")
+            entry = StreamFile(**header)
+            self._pending = entry.size
+            yield entry
+
+    def _skip(self) -> None:
+        while self._pending:
+            self._pending -= len(self._read_exact(min(CHUNK_SIZE, self._pending)))
+
+    def extract(self, entry: StreamFile, dest: Path) -> int:
+        """
+        Write the current file's content to dest with its mode and mtime.
+
+        The file is written under a temporary name and renamed into place.
+        Returns the number of bytes written.
+        """
+        if self._pending != entry.size:
+            raise RuntimeError(f"Content of {entry.path} was already consumed")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".ccm-tmp-{dest.name}")
+        try:
+            with open(tmp, "wb") as f:
+                while self._pending:
+                    chunk = self._read_exact(min(CHUNK_SIZE, self._pending))
+                    f.write(chunk)
+                    self._pending -= len(chunk)
+            os.chmod(tmp, entry.mode)
+            os.utime(tmp, ns=(entry.mtime_ns, entry.mtime_ns))
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return entry.size
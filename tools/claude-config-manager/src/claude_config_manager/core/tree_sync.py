@@ -0,0 +1,59 @@
+"""Statistics and helpers shared by plan-driven syncs, imports and restores."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class SyncStats:
+    """Counters describing the work done by a sync."""
+
+    files_copied: int = 0
+    files_deleted: int = 0
+    files_unchanged: int = 0
+    files_linked: int = 0
+    bytes_copied: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes copied per second."""
+        return self.bytes_copied / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def files_written(self) -> int:
+        """Number of files created, replaced, linked or removed."""
+        return self.files_copied + self.files_linked + self.files_deleted
+
+    def __iadd__(self, other: SyncStats) -> SyncStats:
+        self.files_copied += other.files_copied
+        self.files_deleted += other.files_deleted
+        self.files_unchanged += other.files_unchanged
+        self.files_linked += other.files_linked
+        self.bytes_copied += other.bytes_copied
+        self.seconds += other.seconds
+        return self
+
+    def summary(self) -> str:
+        """Generate summary string."""
+        linked = f"{self.files_linked} linked, " if self.files_linked else ""
+        return (
+            f"{self.files_copied} files copied ({self.bytes_copied} bytes), {linked}"
+            f"{self.files_deleted} removed, {self.files_unchanged} unchanged "
+            f"in {self.seconds:.2f}s ({self.throughput / 1024 / 1024:.1f} MB/s)"
+        )
+
+
+def prune_empty_dirs(root: Path, candidates: set[str]) -> None:
+    """Remove directories left empty by deletions, deepest first."""
+    for rel in sorted(candidates, key=lambda p: p.count("/"), reverse=True):
+        path = root / rel
+        while path != root and path.is_dir():
+            try:
+                os.rmdir(path)
+            except OSError:
+                break
+            path = path.parent
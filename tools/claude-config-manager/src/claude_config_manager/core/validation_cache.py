@@ -0,0 +1,90 @@
+"""Persistent cache of validation results keyed by input fingerprints."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from . import jsonio
+from .fingerprint import tree_hash
+from .hash_cache import CACHE_DIR
+
+VALIDATION_FILE = "validation.json"
+CACHE_VERSION = 1
+
+
+class ValidationCache:
+    """
+    Validation results of a project, reused while the inputs they were derived from are unchanged.
+
+    Each check's result is stored with a fingerprint of the inputs it read
+    (file hashes, directory listings and modes, the profiles catalog
+    digest, ...) in ``.claude/.ccm-cache/validation.json``. A check re-runs
+    only when its fingerprint differs. Safe to share between threads; call
+    save() to persist new entries.
+    """
+
+    def __init__(self, project_path: Path):
+        """Load the cache of a project, if any."""
+        self.path = project_path / CACHE_DIR / VALIDATION_FILE
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        try:
+            data = jsonio.read_json(self.path)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("checks", {})
+        except (OSError, ValueError):
+            pass
+
+    def env_keys(self, category: str) -> list[str]:
+        """Environment variable names recorded with a check's last result."""
+        entry = self._entries.get(category)
+        return entry.get("env", []) if entry else []
+
+    def get(self, category: str, inputs: dict[str, str]) -> dict | None:
+        """Return the stored result of a check if its inputs are unchanged."""
+        entry = self._entries.get(category)
+        if entry is not None and entry["inputs"] == tree_hash(inputs):
+            return entry["result"]
+        return None
+
+    def put(
+        self,
+        category: str,
+        inputs: dict[str, str],
+        result: dict,
+        env: list[str] | None = None,
+    ) -> None:
+        """
+        Store the result of a check.
+
+        Args:
+            category: Check category
+            inputs: Input name -> hash the result was derived from
+            result: Serialized result
+            env: Environment variables the inputs include (see env_keys())
+        """
+        entry = {"inputs": tree_hash(inputs), "result": result}
+        if env:
+            entry["env"] = sorted(env)
+        with self._lock:
+            if self._entries.get(category) != entry:
+                self._entries[category] = entry
+                self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache if it changed."""
+        if not self._dirty or not self.path.parent.parent.is_dir():
+            return
+        with self._lock:
+            data = {"version": CACHE_VERSION, "checks": dict(sorted(self._entries.items()))}
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{VALIDATION_FILE}.tmp")
+            tmp.write_bytes(jsonio.dumps(data))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # A read-only project just doesn't get a persistent cache
@@ -4,12 +4,29 @@ from __future__ import annotations
 
 import os
 import stat
-import subprocess
-from dataclasses import dataclass, field
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .config_manager import ConfigManager
+from .fingerprint import value_hash
+from .manifest import hash_file
 from .profile_manager import ProfileManager
+from .snapshot import EntryInfo, ProjectSnapshot
+from .validation_cache import ValidationCache
+
+if TYPE_CHECKING:
+    from .models import MCPConfig
+
+
+SKILLS_DIR = ".claude/skills"
+HOOKS_DIR = ".claude/hooks"
+OUTPUT_STYLES_DIR = ".claude/output-styles"
+SKILL_CONTENT_SUFFIXES = (".md", ".txt", ".yaml", ".yml", ".json")
+ENV_CATEGORY = "Environment Variables"
 
 
 @dataclass
@@ -49,6 +66,28 @@ class ValidationReport:
         return f"Validation: {self.success_count} passed, {self.error_count} failed"
 
 
+@dataclass
+class ValidationBatch:
+    """Reports of validating many projects."""
+
+    reports: list[ValidationReport] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> list[ValidationReport]:
+        """Reports with at least one failed check."""
+        return [r for r in self.reports if not r.passed]
+
+    def summary(self) -> str:
+        """Generate summary string."""
+        total = len(self.reports)
+        rate = total / self.seconds if self.seconds > 0 else 0.0
+        return (
+            f"{total} projects validated, {total - len(self.failed)} passed, "
+            f"{len(self.failed)} failed in {self.seconds:.2f}s ({rate:.1f} projects/s)"
+        )
+
+
 class Validator:
     """Validates Claude Code configuration integrity."""
 
@@ -59,29 +98,134 @@ class Validator:
     ):
         """Initialize with configuration manager."""
         self.config = config_manager
-        self.profiles = profile_manager or ProfileManager()
+        self.profiles = profile_manager or ProfileManager.shared()
+        self._snapshot: ProjectSnapshot | None = None
+        self._digests: dict[str, str] = {}
 
-    def validate_all(self) -> ValidationReport:
-        """Run all validation checks."""
+    @property
+    def snapshot(self) -> ProjectSnapshot:
+        """Layout scan shared by all checks of the current run."""
+        if self._snapshot is None:
+            self._snapshot = self.config.snapshot()
+        return self._snapshot
+
+    def checks(self) -> list[tuple[str, Callable[[], ValidationResult]]]:
+        """All checks with their categories, in report order."""
+        return [
+            ("MCP Configuration", self._validate_mcp_config),
+            (ENV_CATEGORY, self._validate_env_vars),
+            ("Skills", self._validate_skills),
+            ("Hooks", self._validate_hooks),
+            ("Skill Dependencies", self._validate_skill_dependencies),
+            ("Linked Files", self._validate_linked_files),
+        ]
+
+    def validate_all(self, concurrent: bool = True, use_cache: bool = True) -> ValidationReport:
+        """
+        Run all validation checks.
+
+        The project is scanned once and the snapshot is shared (read-only)
+        by every check. Checks run concurrently on a thread pool unless
+        ``concurrent`` is False; a check that raises is reported as failed
+        without affecting the others.
+
+        With ``use_cache``, results are reused from the project's
+        validation cache while the inputs of their check are unchanged
+        (see _inputs()), and only the other checks run.
+        """
         report = ValidationReport(project_path=self.config.project_path)
+        self._snapshot = self.config.snapshot()
+        self._digests = {}
+        cache = ValidationCache(self.config.project_path) if use_cache else None
+
+        checks = self.checks()
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+                report.results = list(
+                    pool.map(lambda check: self._run(*check, cache), checks)
+                )
+        else:
+            report.results = [self._run(*check, cache) for check in checks]
 
-        # Check MCP configuration
-        report.results.append(self._validate_mcp_config())
-
-        # Check environment variables
-        report.results.append(self._validate_env_vars())
-
-        # Check skills directory
-        report.results.append(self._validate_skills())
-
-        # Check hooks
-        report.results.append(self._validate_hooks())
-
-        # Check skill dependencies
-        report.results.append(self._validate_skill_dependencies())
-
+        if cache is not None:
+            cache.save()
         return report
 
+    def _run(
+        self,
+        category: str,
+        check: Callable[[], ValidationResult],
+        cache: ValidationCache | None,
+    ) -> ValidationResult:
+        """Run one check unless the cache holds its result for the current inputs."""
+        if cache is None:
+            return _run_check(category, check)[0]
+
+        inputs = self._inputs(category, cache.env_keys(category))
+        cached = cache.get(category, inputs)
+        if cached is not None:
+            return ValidationResult(**cached)
+
+        result, ok = _run_check(category, check)
+        if ok:
+            env = None
+            if category == ENV_CATEGORY:
+                env = sorted(_required_env_vars(self.config.read_mcp_config()))
+                inputs = self._inputs(category, env)
+            cache.put(category, inputs, asdict(result), env)
+        return result
+
+    def _inputs(self, category: str, env_keys: list[str]) -> dict[str, str]:
+        """
+        Fingerprint of everything a check reads.
+
+        Args:
+            category: Check category
+            env_keys: Environment variables the environment check depends on
+        """
+        mcp = self._digest(".mcp.json")
+        if category == "MCP Configuration":
+            return {"mcp": mcp}
+        if category == ENV_CATEGORY:
+            environ = dict(os.environ)  # one decode instead of one per lookup
+            return {"mcp": mcp, "env": value_hash({k: bool(environ.get(k)) for k in env_keys})}
+        if category == "Skills":
+            return {"skills": self._listing(SKILLS_DIR)}
+        if category == "Hooks":
+            return {"hooks": self._listing(HOOKS_DIR)}
+        if category == "Skill Dependencies":
+            return {
+                "mcp": mcp,
+                "profiles": self.profiles.index.digest,
+                "skills": value_hash(self.snapshot.skills()),
+            }
+        return {
+            "state": self._digest(".claude/.ccm-state.json"),
+            "files": self._listing(SKILLS_DIR, HOOKS_DIR, OUTPUT_STYLES_DIR, links=True),
+        }
+
+    def _digest(self, rel: str) -> str:
+        """Content hash of a project file ('-' if missing), memoized for the run."""
+        digest = self._digests.get(rel)
+        if digest is None:
+            try:
+                digest = hash_file(self.config.project_path / rel)
+            except (FileNotFoundError, NotADirectoryError):
+                digest = "-"
+            self._digests[rel] = digest
+        return digest
+
+    def _listing(self, *directories: str, links: bool = False) -> str:
+        """Hash of the paths, types and modes (and whether files are linked) below directories."""
+        items = []
+        for directory in directories:
+            for rel, info in _walk_entries(self.snapshot, directory):
+                item = [rel, info.is_dir, info.mode]
+                if links:
+                    item.append(info.nlink > 1)
+                items.append(item)
+        return value_hash(items)
+
     def _validate_mcp_config(self) -> ValidationResult:
         """Validate .mcp.json exists and is valid."""
         if not self.config.mcp_config_path.exists():
@@ -109,25 +253,7 @@ class Validator:
 
     def _validate_env_vars(self) -> ValidationResult:
         """Validate required environment variables are set."""
-        mcp = self.config.read_mcp_config()
-
-        # Collect all env vars referenced in config
-        required_vars = set()
-        for server in mcp.mcpServers.values():
-            for value in server.env.values():
-                # Extract ${VAR_NAME} or ${VAR_NAME:-default}
-                if value.startswith("${") and "}" in value:
-                    var_name = value[2:].split(":")[0].split("}")[0]
-                    # Skip vars with defaults
-                    if ":-" not in value:
-                        required_vars.add(var_name)
-
-            # Also check args for env var references
-            for arg in server.args:
-                if arg.startswith("${") and "}" in arg:
-                    var_name = arg[2:].split(":")[0].split("}")[0]
-                    if ":-" not in arg:
-                        required_vars.add(var_name)
+        required_vars = _required_env_vars(self.config.read_mcp_config())
 
         # Check which are set
         missing = [v for v in required_vars if not os.environ.get(v)]
@@ -150,14 +276,15 @@ class Validator:
 
     def _validate_skills(self) -> ValidationResult:
         """Validate skills directory structure."""
-        if not self.config.skills_dir.exists():
+        snapshot = self.snapshot
+        if not snapshot.is_dir(SKILLS_DIR):
             return ValidationResult(
                 passed=False,
                 category="Skills",
                 message="Skills directory not found",
             )
 
-        skills = self.config.list_skills()
+        skills = snapshot.skills()
         if not skills:
             return ValidationResult(
                 passed=True,
@@ -170,24 +297,15 @@ class Validator:
         invalid_skills = []
 
         for skill in skills:
-            skill_dir = self.config.skills_dir / skill
+            skill_dir = f"{SKILLS_DIR}/{skill}"
             # A skill should have at least a markdown file or instruction file
             # Check direct files first
-            has_content = any(
-                f.suffix in [".md", ".txt", ".yaml", ".yml", ".json"]
-                for f in skill_dir.iterdir()
-                if f.is_file()
-            )
+            has_content = _has_content_file(snapshot, skill_dir)
             # Also check subdirectories (nested skill structure)
             if not has_content:
                 has_content = any(
-                    d.is_dir() and any(
-                        f.suffix in [".md", ".txt", ".yaml", ".yml", ".json"]
-                        for f in d.iterdir()
-                        if f.is_file()
-                    )
-                    for d in skill_dir.iterdir()
-                    if d.is_dir()
+                    _has_content_file(snapshot, f"{skill_dir}/{d}")
+                    for d in snapshot.list_dirs(skill_dir)
                 )
             if has_content:
                 valid_skills.append(skill)
@@ -211,14 +329,15 @@ class Validator:
 
     def _validate_hooks(self) -> ValidationResult:
         """Validate hooks are executable."""
-        if not self.config.hooks_dir.exists():
+        snapshot = self.snapshot
+        if not snapshot.is_dir(HOOKS_DIR):
             return ValidationResult(
                 passed=True,
                 category="Hooks",
                 message="No hooks directory (optional)",
             )
 
-        hooks = self.config.list_hooks()
+        hooks = snapshot.hooks()
         if not hooks:
             return ValidationResult(
                 passed=True,
@@ -229,9 +348,8 @@ class Validator:
         # Check executability for shell scripts
         non_executable = []
         for hook in hooks:
-            hook_path = self.config.hooks_dir / hook
-            if hook_path.suffix in ["", ".sh", ".bash"]:
-                mode = hook_path.stat().st_mode
+            if Path(hook).suffix in ["", ".sh", ".bash"]:
+                mode = snapshot.entries[f"{HOOKS_DIR}/{hook}"].mode
                 if not (mode & stat.S_IXUSR):
                     non_executable.append(hook)
 
@@ -251,23 +369,28 @@ class Validator:
         )
 
     def _validate_skill_dependencies(self) -> ValidationResult:
-        """Validate that all skill dependencies are satisfied."""
-        skills = self.config.list_skills()
+        """Validate that all skill dependencies are satisfied, transitively."""
+        skills = self.snapshot.skills()
         mcp = self.config.read_mcp_config()
-        installed_servers = set(mcp.mcpServers.keys())
+        graph = self.profiles.index.graph
 
-        missing_deps = []
-        for skill in skills:
-            deps = self.profiles.get_skill_dependencies(skill)
-            for dep in deps:
-                if dep not in installed_servers:
-                    missing_deps.append(f"{skill} -> {dep}")
+        installed = set(skills)
+        cycles = [c for c in graph.cycles() if installed.intersection(c)]
+        missing_deps = [m.explain() for m in graph.missing(mcp.mcpServers, skills)]
+
+        if cycles:
+            return ValidationResult(
+                passed=False,
+                category="Skill Dependencies",
+                message=f"{len(cycles)} skill dependency cycles",
+                details=[" <-> ".join(c) for c in cycles] + missing_deps,
+            )
 
         if missing_deps:
             return ValidationResult(
                 passed=False,
                 category="Skill Dependencies",
-                message=f"{len(missing_deps)} missing MCP server dependencies",
+                message=f"{len(missing_deps)} missing dependencies",
                 details=missing_deps,
             )
 
@@ -277,23 +400,180 @@ class Validator:
             message="All skill dependencies satisfied",
         )
 
-    def test_mcp_connectivity(self, server_name: str) -> bool:
-        """Test if an MCP server can be started."""
+    def _validate_linked_files(self) -> ValidationResult:
+        """Validate files installed with the 'hardlink' copy strategy or from the skill store."""
+        strategy = self.config.copy_strategy
+        store_mode = self.config.read_state().get("skill_store")
+        if strategy != "hardlink" and store_mode is None:
+            return ValidationResult(
+                passed=True,
+                category="Linked Files",
+                message=f"Installed files are independent copies (strategy: {strategy})",
+            )
+
+        linked = []
+        writable = []
+        for directory in (SKILLS_DIR, HOOKS_DIR, OUTPUT_STYLES_DIR):
+            for rel, info in self.snapshot.walk_files(directory):
+                if info.nlink > 1:
+                    linked.append(rel.removeprefix(".claude/"))
+                    if info.mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+                        writable.append(rel.removeprefix(".claude/"))
+
+        if writable:
+            return ValidationResult(
+                passed=True,  # Warning, not failure
+                category="Linked Files",
+                message=(
+                    f"{len(writable)} of {len(linked)} hard-linked files are writable; "
+                    "editing them in place also changes the source"
+                ),
+                details=writable,
+            )
+
+        return ValidationResult(
+            passed=True,
+            category="Linked Files",
+            message=(
+                f"{len(linked)} files hard-linked to the source configuration"
+                + (f" (skills linked from the skill store: {store_mode})" if store_mode else "")
+            ),
+        )
+
+    def test_mcp_connectivity(self, server_name: str, timeout: float = 10.0) -> bool:
+        """Test if an MCP server starts and completes the MCP handshake (see mcp_probe)."""
+        from .mcp_probe import probe  # asyncio is only needed here
+
         mcp = self.config.read_mcp_config()
         server = mcp.mcpServers.get(server_name)
 
         if not server:
             return False
 
-        # Try to run the command with --version or --help
-        try:
-            cmd = [server.command] + server.args[:2]  # Just first few args
-            result = subprocess.run(
-                cmd + ["--version"],
-                capture_output=True,
-                timeout=5,
-                env={**os.environ, **server.env},
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-            return False
+        [result] = probe({server_name: server}, timeout=timeout, cwd=self.config.project_path)
+        return result.ok
+
+
+def validate_projects(
+    projects: list[Path],
+    processes: int | None = None,
+    on_report: Callable[[ValidationReport], None] | None = None,
+    use_cache: bool = True,
+) -> ValidationBatch:
+    """
+    Validate many projects on a process pool.
+
+    Each worker process loads the profiles catalog once and validates
+    projects one at a time; reports are passed to ``on_report`` as soon
+    as each project finishes and returned in the order given.
+
+    Args:
+        projects: Project directories
+        processes: Worker processes (default: CPU count)
+        on_report: Called with each report as it completes
+        use_cache: Reuse each project's cached results for unchanged inputs
+    """
+    start = time.perf_counter()
+    batch = ValidationBatch()
+    processes = max(1, min(processes or os.cpu_count() or 1, len(projects) or 1))
+
+    if processes == 1:
+        for project in projects:
+            report = _validate_project(project, use_cache)
+            batch.reports.append(report)
+            if on_report is not None:
+                on_report(report)
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(_validate_project, project, use_cache) for project in projects
+            ]
+            for future in as_completed(futures):
+                report = future.result()
+                batch.reports.append(report)
+                if on_report is not None:
+                    on_report(report)
+
+    order = {project: i for i, project in enumerate(projects)}
+    batch.reports.sort(key=lambda r: order[r.project_path])
+    batch.seconds = time.perf_counter() - start
+    return batch
+
+
+def _validate_project(project: Path, use_cache: bool = True) -> ValidationReport:
+    """Validate one project (worker process entry point)."""
+    try:
+        return Validator(ConfigManager(project)).validate_all(
+            concurrent=False, use_cache=use_cache
+        )
+    except Exception as e:
+        return ValidationReport(
+            project_path=project,
+            results=[
+                ValidationResult(
+                    passed=False, category="Validation", message=str(e) or type(e).__name__
+                )
+            ],
+        )
+
+
+def _run_check(
+    category: str, check: Callable[[], ValidationResult]
+) -> tuple[ValidationResult, bool]:
+    """
+    Run one check, turning an unexpected error into a failed result.
+
+    Returns:
+        The result, and whether the check completed (errors are not cached)
+    """
+    try:
+        return check(), True
+    except Exception as e:
+        return (
+            ValidationResult(
+                passed=False,
+                category=category,
+                message=f"Check failed: {str(e).splitlines()[0] if str(e) else type(e).__name__}",
+            ),
+            False,
+        )
+
+
+def _required_env_vars(mcp: MCPConfig) -> set[str]:
+    """Environment variables referenced without a default by server env values and args."""
+    required_vars = set()
+    for server in mcp.mcpServers.values():
+        for value in server.env.values():
+            # Extract ${VAR_NAME} or ${VAR_NAME:-default}
+            if value.startswith("${") and "}" in value:
+                var_name = value[2:].split(":")[0].split("}")[0]
+                # Skip vars with defaults
+                if ":-" not in value:
+                    required_vars.add(var_name)
+
+        # Also check args for env var references
+        for arg in server.args:
+            if arg.startswith("${") and "}" in arg:
+                var_name = arg[2:].split(":")[0].split("}")[0]
+                if ":-" not in arg:
+                    required_vars.add(var_name)
+    return required_vars
+
+
+def _walk_entries(snapshot: ProjectSnapshot, rel: str) -> Iterator[tuple[str, EntryInfo]]:
+    """Yield (relative path, info) for all entries below a directory, parents first."""
+    for name, info in snapshot.list_dir(rel):
+        child = f"{rel}/{name}"
+        yield child, info
+        if info.is_dir:
+            yield from _walk_entries(snapshot, child)
+
+
+def _has_content_file(snapshot: ProjectSnapshot, directory: str) -> bool:
+    """Check a directory directly contains a skill content file."""
+    return any(
+        Path(name).suffix in SKILL_CONTENT_SUFFIXES
+        for name in snapshot.list_files(directory)
+    )
@@ -0,0 +1,393 @@
+"""Watch a source project and propagate configuration changes to targets."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .config_manager import ConfigManager
+from .manifest import INTERNAL_PREFIX, iter_files
+from .planner import ResolvedSource
+from .skill_store import SkillStore
+from .tree_sync import SyncStats
+
+# Pause after the last event before syncing, and the longest a burst may delay a sync
+DEFAULT_DEBOUNCE = 0.2
+MAX_DELAY = 0.8
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Relative path reported when events were lost and everything must be rescanned
+ALL = "*"
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+EVENT = struct.Struct("iIII")
+
+
+@dataclass
+class WatchTarget:
+    """A target project kept in sync with a source project."""
+
+    path: str
+    source: str
+    profile: str = "full"
+    strategy: str = "overwrite"
+
+
+@dataclass
+class WatchResult:
+    """Outcome of propagating one batch of changes to one target."""
+
+    target: Path
+    stats: SyncStats | None = None
+    error: str | None = None
+
+
+class WatchRegistry:
+    """Registered watch targets, stored in ~/.claude-config-manager/watch.json."""
+
+    def __init__(self, base_path: Path | None = None):
+        """Initialize with base path for storing the registry."""
+        self.base_path = base_path or Path.home()
+        self.config_dir = self.base_path / ".claude-config-manager"
+        self.watch_path = self.config_dir / "watch.json"
+
+    def list_targets(self, source: Path | None = None) -> list[WatchTarget]:
+        """List registered targets, optionally only those of one source."""
+        if not self.watch_path.exists():
+            return []
+
+        with open(self.watch_path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        targets = [WatchTarget(**t) for t in data.get("targets", [])]
+        if source is not None:
+            targets = [t for t in targets if t.source == str(source.resolve())]
+        return targets
+
+    def add_target(
+        self, path: Path, source: Path, profile: str = "full", strategy: str = "overwrite"
+    ) -> WatchTarget:
+        """Register a target, replacing an existing registration of the same path."""
+        target = WatchTarget(
+            path=str(path.resolve()),
+            source=str(source.resolve()),
+            profile=profile,
+            strategy=strategy,
+        )
+        if target.path == target.source:
+            raise ValueError("A project cannot watch itself")
+        targets = [t for t in self.list_targets() if t.path != target.path]
+        targets.append(target)
+        self._save(targets)
+        return target
+
+    def remove_target(self, path: Path) -> bool:
+        """Unregister a target."""
+        targets = self.list_targets()
+        remaining = [t for t in targets if t.path != str(path.resolve())]
+        if len(remaining) == len(targets):
+            return False
+        self._save(remaining)
+        return True
+
+    def _save(self, targets: list[WatchTarget]) -> None:
+        """Save targets to the registry file."""
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.watch_path, "w", encoding="utf-8") as f:
+            json.dump({"targets": [asdict(t) for t in targets]}, f, indent=2)
+            f.write("\n")
+
+
+class PollingDetector:
+    """
+    Detects changes by periodically comparing stat data.
+
+    Used where inotify is unavailable. Each poll is a single scandir walk
+    of ``.claude/`` plus a stat of ``.mcp.json``.
+    """
+
+    def __init__(self, project_path: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        """Take the initial picture of the project."""
+        self.project_path = project_path
+        self.interval = interval
+        self._state = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int, int]]:
+        state = {}
+        for rel, _, st in iter_files(self.project_path / ".claude", ".claude/"):
+            state[rel] = (st.st_size, st.st_mtime_ns, st.st_mode)
+        try:
+            st = os.stat(self.project_path / ".mcp.json")
+            state[".mcp.json"] = (st.st_size, st.st_mtime_ns, st.st_mode)
+        except FileNotFoundError:
+            pass
+        return state
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Return relative paths changed within timeout (empty if none)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+            state = self._scan()
+            changed = {
+                rel
+                for rel in state.keys() | self._state.keys()
+                if state.get(rel) != self._state.get(rel)
+            }
+            self._state = state
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        """Release resources (nothing to do for polling)."""
+
+
+class InotifyDetector:
+    """
+    Detects changes with Linux inotify, through ctypes.
+
+    Watches the project root (for ``.mcp.json``) and every directory below
+    ``.claude/``; directories created later are added as they appear.
+    Waiting blocks in select(), so an idle watcher uses no CPU.
+    """
+
+    def __init__(self, project_path: Path):
+        """Create the inotify instance and add watches."""
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.project_path = project_path
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, str] = {}
+        self._add_watch(project_path, "")
+        self._add_tree(project_path / ".claude", ".claude")
+
+    def _add_watch(self, path: Path, rel: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = rel
+
+    def _add_tree(self, path: Path, rel: str) -> None:
+        if not path.is_dir():
+            return
+        self._add_watch(path, rel)
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir() and not entry.name.startswith(INTERNAL_PREFIX):
+                self._add_tree(Path(entry.path), f"{rel}/{entry.name}")
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Return relative paths changed within timeout (empty if none)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0").decode(
+                    "utf-8", "surrogateescape"
+                )
+                offset += length
+                rel = self._handle(wd, mask, name)
+                if rel is not None:
+                    changed.add(rel)
+
+    def _handle(self, wd: int, mask: int, name: str) -> str | None:
+        """Update watches for one event and return the changed path, if relevant."""
+        if mask & IN_Q_OVERFLOW:
+            return ALL
+        if mask & IN_IGNORED:
+            self._dirs.pop(wd, None)
+            return None
+        parent = self._dirs.get(wd)
+        if parent is None or name.startswith(INTERNAL_PREFIX):
+            return None
+        if parent == "":
+            if name not in (".mcp.json", ".claude"):
+                return None
+            rel = name
+        else:
+            rel = f"{parent}/{name}" if name else parent
+        if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+            self._add_tree(self.project_path / rel, rel)
+        return rel
+
+    def close(self) -> None:
+        """Close the inotify instance."""
+        os.close(self._fd)
+
+
+def create_detector(project_path: Path, poll: bool = False):
+    """Create an inotify detector, or a polling one if requested or unavailable."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyDetector(project_path)
+        except (OSError, AttributeError):
+            pass
+    return PollingDetector(project_path)
+
+
+class Watcher:
+    """
+    Propagates source changes to registered targets.
+
+    Bursts of events are coalesced: a sync starts once no event arrived
+    for ``debounce`` seconds, or at the latest ``MAX_DELAY`` seconds after
+    the first event. Only skills touched by the burst are planned, and
+    each target receives exactly the operations its plan lists.
+    """
+
+    def __init__(
+        self,
+        source: ConfigManager,
+        targets: list[WatchTarget],
+        profiles: dict[str, tuple[list[str], list[str]]],
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll: bool = False,
+        copy_strategy: str = "auto",
+        skill_store: SkillStore | None = None,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            source: Source project
+            targets: Targets to keep in sync
+            profiles: Profile name -> (MCP servers, skills); empty lists select all
+            debounce: Quiet period before a sync, in seconds
+            poll: Use polling instead of inotify
+            copy_strategy: Copy strategy used for the targets
+            skill_store: Store to link skills from instead of copying them
+        """
+        self.source = source
+        self.targets = targets
+        self.profiles = profiles
+        self.debounce = debounce
+        self.copy_strategy = copy_strategy
+        self.skill_store = skill_store
+        self.detector = create_detector(source.project_path, poll=poll)
+
+    def sync(self, changed: set[str] | None = None) -> list[WatchResult]:
+        """
+        Apply changes to every target.
+
+        Args:
+            changed: Relative source paths that changed (None = everything)
+        """
+        skills = _changed_skills(changed)
+        results = []
+        resolved: dict[str, ResolvedSource] = {}
+        for target in self.targets:
+            try:
+                if target.profile not in resolved:
+                    mcp_servers, selected = self.profiles.get(target.profile, ([], []))
+                    selected = selected or self.source.list_skills()
+                    if skills is not None:
+                        selected = [s for s in selected if s in skills]
+                    resolved[target.profile] = ResolvedSource.resolve(
+                        self.source, mcp_servers, selected
+                    )
+                manager = ConfigManager(
+                    Path(target.path),
+                    workers=self.source.copier.workers,
+                    copy_strategy=self.copy_strategy,
+                    skill_store=self.skill_store,
+                )
+                plan = manager.plan_merge(resolved[target.profile], strategy=target.strategy)
+                if plan:
+                    results.append(WatchResult(Path(target.path), stats=manager.apply_plan(plan)))
+            except Exception as e:
+                results.append(WatchResult(Path(target.path), error=str(e) or type(e).__name__))
+        return results
+
+    def run(
+        self,
+        on_sync: Callable[[set[str], list[WatchResult]], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        """Watch until stopped (or interrupted), syncing after each burst of changes."""
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                changed = self.detector.wait(timeout=1.0)
+                if not changed:
+                    continue
+                deadline = time.monotonic() + MAX_DELAY
+                while time.monotonic() < deadline:
+                    more = self.detector.wait(
+                        timeout=min(self.debounce, deadline - time.monotonic())
+                    )
+                    if not more:
+                        break
+                    changed |= more
+                self.source.invalidate_snapshot()
+                results = self.sync(None if ALL in changed else changed)
+                if on_sync is not None:
+                    on_sync(changed, results)
+        finally:
+            self.detector.close()
+
+
+def _changed_skills(changed: set[str] | None) -> set[str] | None:
+    """
+    Skill names affected by changed paths; None if all skills must be checked.
+
+    Changes to ``.mcp.json``, hooks or output styles need no skill at all.
+    """
+    if changed is None:
+        return None
+    skills = set()
+    for rel in changed:
+        parts = rel.split("/")
+        if rel in (".claude", ".claude/skills"):
+            return None
+        if len(parts) >= 3 and parts[:2] == [".claude", "skills"]:
+            skills.add(parts[2])
+    return skills
@@ -103,7 +103,7 @@ class ValidationScreen(Screen):
             yield Label("配置完整性验证", classes="screen-title")
             yield Label("", classes="spacer")
 
-            validator = Validator(self.config_manager, ProfileManager())
+            validator = Validator(self.config_manager, ProfileManager.shared())
             report = validator.validate_all()
 
             for result in report.results:
@@ -442,7 +442,7 @@ class ClaudeConfigManagerApp(App):
         super().__init__(*args, **kwargs)
         self.source_path = source_path or Path.cwd()
         self.config_manager = ConfigManager(self.source_path)
-        self.profile_manager = ProfileManager()
+        self.profile_manager = ProfileManager.shared()
 
     def compose(self) -> ComposeResult:
         """Create application layout."""
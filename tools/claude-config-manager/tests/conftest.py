@@ -0,0 +1,40 @@
+"""Shared fixtures."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from claude_config_manager.core.models import MCPServer
+
+FAKE_SERVER = Path(__file__).parent / "fake_servers" / "mcp_server.py"
+
+
+@pytest.fixture
+def fake_server():
+    """Build the configuration of a fake stdio MCP server in a given mode."""
+
+    def make(mode: str = "ok", **env: str) -> MCPServer:
+        return MCPServer(command=sys.executable, args=[str(FAKE_SERVER), mode], env=env)
+
+    return make
+
+
+@pytest.fixture
+def source_project(tmp_path):
+    """A project with two MCP servers, two skills and a .env.example."""
+    root = tmp_path / "source"
+    root.mkdir()
+    servers = {
+        "filesystem": {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-fs"]},
+        "time-mcp": {"command": "uvx", "args": ["time-mcp"], "env": {"TZ": "${TZ:-UTC}"}},
+    }
+    (root / ".mcp.json").write_text(json.dumps({"mcpServers": servers}))
+    for skill in ("testing-specialist", "skill-creator"):
+        skill_dir = root / ".claude" / "skills" / skill
+        (skill_dir / "scripts").mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(f"# {skill}\n")
+        (skill_dir / "scripts" / "run.sh").write_text("#!/bin/sh\necho run\n")
+    (root / ".env.example").write_text("TZ=UTC\n")
+    return root
@@ -0,0 +1,77 @@
+"""
+Fake MCP server speaking newline-delimited JSON-RPC on stdio.
+
+Usage: mcp_server.py MODE, where MODE is one of
+
+    ok              answer initialize and a two-page tools/list
+    slow            like ok, after sleeping FAKE_MCP_DELAY seconds (default 0.5)
+    crash           print to stderr and exit with status 3
+    hang            read requests but never answer
+    protocol-error  answer tools/list with a JSON-RPC error
+    garbage         print a line that is not JSON-RPC
+
+The server name reported in serverInfo is taken from FAKE_MCP_NAME.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def send(message: dict) -> None:
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def main() -> int:
+    mode = sys.argv[1] if len(sys.argv) > 1 else "ok"
+    if mode == "crash":
+        print("fatal: missing API key", file=sys.stderr)
+        return 3
+    if mode == "slow":
+        time.sleep(float(os.environ.get("FAKE_MCP_DELAY", "0.5")))
+    if mode == "garbage":
+        print("Starting server on stdio...", flush=True)
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message or mode == "hang":
+            continue
+        if message["method"] == "initialize":
+            # A notification first: clients must skip it
+            send({"jsonrpc": "2.0", "method": "notifications/message", "params": {}})
+            result = {
+                "protocolVersion": message["params"]["protocolVersion"],
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": os.environ.get("FAKE_MCP_NAME", "fake"), "version": "1.0"},
+            }
+        elif message["method"] == "tools/list":
+            if mode == "protocol-error":
+                send(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": message["id"],
+                        "error": {"code": -32603, "message": "tools unavailable"},
+                    }
+                )
+                continue
+            if message["params"].get("cursor") == "page-2":
+                result = {"tools": [{"name": "write"}]}
+            else:
+                result = {"tools": [{"name": "read"}, {"name": "list"}], "nextCursor": "page-2"}
+        else:
+            send(
+                {
+                    "jsonrpc": "2.0",
+                    "id": message["id"],
+                    "error": {"code": -32601, "message": "Method not found"},
+                }
+            )
+            continue
+        send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Tests for the deduplicating backup store."""
+
+import multiprocessing
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from claude_config_manager.cli import main
+from claude_config_manager.core import ConfigManager
+from claude_config_manager.core.backup_store import BackupStore
+
+
+def make_config(path):
+    (path / ".claude" / "skills" / "demo").mkdir(parents=True)
+    (path / ".claude" / "skills" / "demo" / "SKILL.md").write_text("# demo\n")
+    (path / ".claude" / "skills" / "demo" / "copy.md").write_text("# demo\n")
+    (path / ".mcp.json").write_text("{}")
+    return [(".claude", path / ".claude"), (".mcp.json", path / ".mcp.json")]
+
+
+def objects(store):
+    return sorted(p for p in store.objects_dir.rglob("*") if p.is_file())
+
+
+def test_snapshots_share_blobs(tmp_path):
+    store = BackupStore(tmp_path / "backups")
+    sources = make_config(tmp_path / "project")
+
+    first = store.create_snapshot(sources)
+    assert len(first.files) == 3
+    assert len(objects(store)) == 2  # SKILL.md and copy.md have one blob
+
+    (tmp_path / "project" / ".mcp.json").write_text('{"mcpServers": {}}')
+    second = store.create_snapshot(sources)
+
+    assert second.id != first.id
+    assert len(objects(store)) == 3
+    assert second.files[".claude/skills/demo/SKILL.md"].hash == (
+        first.files[".claude/skills/demo/SKILL.md"].hash
+    )
+
+
+def test_unchanged_snapshot_is_not_repeated(tmp_path):
+    store = BackupStore(tmp_path / "backups")
+    sources = make_config(tmp_path / "project")
+
+    first = store.create_snapshot(sources)
+
+    assert store.create_snapshot(sources).id == first.id
+    assert len(store.list_snapshots()) == 1
+
+
+def test_gc_removes_unreferenced_blobs(tmp_path):
+    store = BackupStore(tmp_path / "backups")
+    sources = make_config(tmp_path / "project")
+    store.create_snapshot(sources, "one")
+    (tmp_path / "project" / ".mcp.json").write_text('{"a": 1}')
+    store.create_snapshot(sources, "two")
+
+    result = store.gc(keep_last=1)
+
+    assert result.removed_snapshots == ["one"]
+    assert result.removed_objects == 1
+    assert [s.id for s in store.list_snapshots()] == ["two"]
+    assert len(objects(store)) == 2
+
+
+def test_gc_keep_zero_requires_force(tmp_path):
+    store = BackupStore(tmp_path / "backups")
+    store.create_snapshot(make_config(tmp_path / "project"))
+
+    with pytest.raises(ValueError, match="at least 1"):
+        store.gc(keep_last=0)
+    assert len(store.list_snapshots()) == 1
+
+    result = store.gc(keep_last=0, force=True)
+    assert len(result.removed_snapshots) == 1
+    assert store.list_snapshots() == []
+    assert objects(store) == []
+
+
+def test_cli_gc_keep_zero_requires_force(source_project):
+    ConfigManager(source_project).backup()
+    runner = CliRunner()
+    command = ["--source", str(source_project), "backups", "gc", "--keep", "0"]
+
+    result = runner.invoke(main, command)
+    assert result.exit_code == 2
+    assert "unless --force is given" in result.output
+    assert len(ConfigManager(source_project).backup_store.list_snapshots()) == 1
+
+    result = runner.invoke(main, [*command, "--force"])
+    assert result.exit_code == 0, result.output
+    assert ConfigManager(source_project).backup_store.list_snapshots() == []
+
+
+def test_gc_keeps_temp_files(tmp_path):
+    store = BackupStore(tmp_path / "backups")
+    store.create_snapshot(make_config(tmp_path / "project"))
+    tmp = store.objects_dir / "ab" / ".tmp-123"
+    tmp.parent.mkdir(exist_ok=True)
+    tmp.write_text("partial")
+
+    store.gc(keep_last=1)
+
+    assert tmp.exists()
+
+
+def _snapshot(root, project, rounds):
+    store = BackupStore(root)
+    sources = [(".mcp.json", project / ".mcp.json")]
+    for i in range(rounds):
+        (project / ".mcp.json").write_text(f'{{"round": {i % 3}}}')
+        store.create_snapshot(sources)
+
+
+def _collect(root, rounds):
+    store = BackupStore(root)
+    for _ in range(rounds):
+        store.gc(keep_last=1)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork and flock")
+def test_gc_concurrent_with_snapshots(tmp_path):
+    root = tmp_path / "backups"
+    context = multiprocessing.get_context("fork")
+    workers = []
+    for i in range(3):
+        project = tmp_path / f"p{i}"
+        project.mkdir()
+        workers.append(context.Process(target=_snapshot, args=(root, project, 40)))
+    workers.append(context.Process(target=_collect, args=(root, 80)))
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+
+    assert [p.exitcode for p in workers] == [0] * len(workers)
+    store = BackupStore(root)
+    for snapshot in store.list_snapshots():
+        for entry in snapshot.files.values():
+            assert store.has_object(entry.hash), f"{snapshot.id} lost {entry.path}"
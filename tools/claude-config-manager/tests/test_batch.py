@@ -0,0 +1,58 @@
+"""Tests for batch imports and project scaffolding."""
+
+import json
+import time
+
+from claude_config_manager.core import ConfigManager, ProfileManager
+from claude_config_manager.core.batch import import_batch, run_batch
+from claude_config_manager.core.planner import ResolvedSource
+from claude_config_manager.core.scaffold import read_manifest, scaffold_projects
+from claude_config_manager.core.tree_sync import SyncStats
+
+
+def test_run_batch_keeps_order_and_records_failures(tmp_path):
+    targets = [tmp_path / name for name in ("slow", "broken", "fast")]
+    seen_workers = []
+
+    def apply(target, workers):
+        seen_workers.append(workers)
+        if target.name == "broken":
+            raise RuntimeError("disk full")
+        time.sleep(0.05 if target.name == "slow" else 0)
+        return SyncStats(files_copied=1)
+
+    finished = []
+    batch = run_batch(targets, apply, parallel=3, workers=7, on_result=finished.append)
+
+    assert [r.target for r in batch.results] == targets
+    assert [r.error for r in batch.results] == [None, "disk full", None]
+    assert finished[-1].target.name == "slow"
+    assert seen_workers == [2, 2, 2]
+    assert batch.totals.files_copied == 2
+
+
+def test_import_batch(source_project, tmp_path):
+    targets = [tmp_path / f"t{i}" for i in range(3)]
+    for target in targets:
+        target.mkdir()
+    source = ResolvedSource.resolve(ConfigManager(source_project))
+
+    batch = import_batch(source, targets, parallel=2)
+
+    assert not batch.failed
+    for target in targets:
+        assert ConfigManager(target).list_skills() == ["skill-creator", "testing-specialist"]
+
+
+def test_scaffold_projects(source_project, tmp_path):
+    manifest = tmp_path / "projects.json"
+    manifest.write_text(
+        json.dumps({"root": "out", "projects": ["a", {"path": "b", "profile": "backend"}]})
+    )
+    specs = read_manifest(manifest)
+
+    batch = scaffold_projects(ConfigManager(source_project), specs, ProfileManager(), parallel=2)
+
+    assert [r.target.name for r in batch.results] == ["a", "b"]
+    assert not batch.failed, [r.error for r in batch.failed]
+    assert (tmp_path / "out" / "b" / ".mcp.json").exists()
@@ -0,0 +1,181 @@
+"""Tests for the copy engine's strategies and fallbacks."""
+
+import errno
+import os
+
+import pytest
+
+from claude_config_manager.core import copier
+from claude_config_manager.core.copier import CopyEngine
+
+DATA = b"0123456789" * 1000
+
+
+@pytest.fixture
+def src(tmp_path):
+    path = tmp_path / "src.bin"
+    path.write_bytes(DATA)
+    path.chmod(0o640)
+    return path
+
+
+class FakeFcntl:
+    """Stands in for fcntl; the FICLONE ioctl copies the bytes or fails."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def ioctl(self, dest_fd, request, src_fd):
+        assert request == copier.FICLONE
+        self.calls += 1
+        if self.error is not None:
+            raise OSError(self.error, os.strerror(self.error))
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        os.write(dest_fd, os.read(src_fd, len(DATA)))
+
+
+def fail_copy_file_range(code, calls):
+    def copy_file_range(src_fd, dest_fd, count):
+        calls.append(count)
+        raise OSError(code, os.strerror(code))
+
+    return copy_file_range
+
+
+def engine(monkeypatch, fake=None, copy_file_range=None):
+    monkeypatch.setattr(copier, "fcntl", fake)
+    if copy_file_range is not None:
+        monkeypatch.setattr(os, "copy_file_range", copy_file_range, raising=False)
+    engine = CopyEngine(1, "auto")
+    engine._reflink = fake is not None
+    engine._copy_file_range = hasattr(os, "copy_file_range")
+    return engine
+
+
+def test_reflink_is_tried_first(monkeypatch, src, tmp_path):
+    fake = FakeFcntl()
+    calls = []
+    copy = engine(monkeypatch, fake, fail_copy_file_range(errno.EIO, calls))
+
+    assert copy.copy_bytes(src, tmp_path / "dest") == len(DATA)
+    assert (tmp_path / "dest").read_bytes() == DATA
+    assert fake.calls == 1
+    assert calls == []
+
+
+def test_falls_back_to_copy_file_range(monkeypatch, src, tmp_path):
+    if not hasattr(os, "copy_file_range"):
+        pytest.skip("os.copy_file_range not available")
+    fake = FakeFcntl(errno.EOPNOTSUPP)
+    copy = engine(monkeypatch, fake)
+
+    assert copy.copy_bytes(src, tmp_path / "one") == len(DATA)
+    assert copy.copy_bytes(src, tmp_path / "two") == len(DATA)
+
+    assert (tmp_path / "one").read_bytes() == DATA
+    assert (tmp_path / "two").read_bytes() == DATA
+    assert fake.calls == 1  # Not retried once known to be unsupported
+    assert copy._copy_file_range
+
+
+@pytest.mark.parametrize("code", [errno.EXDEV, errno.ENOSYS, errno.EINVAL])
+def test_falls_back_to_user_space_copy(monkeypatch, src, tmp_path, code):
+    calls = []
+    copy = engine(monkeypatch, FakeFcntl(errno.EXDEV), fail_copy_file_range(code, calls))
+
+    assert copy.copy_bytes(src, tmp_path / "one") == len(DATA)
+    assert copy.copy_bytes(src, tmp_path / "two") == len(DATA)
+
+    assert (tmp_path / "one").read_bytes() == DATA
+    assert (tmp_path / "two").read_bytes() == DATA
+    assert len(calls) == 1
+    assert not copy._reflink and not copy._copy_file_range
+
+
+def test_short_copy_file_range_is_finished_in_user_space(monkeypatch, src, tmp_path):
+    real = getattr(os, "copy_file_range", None)
+    if real is None:
+        pytest.skip("os.copy_file_range not available")
+    calls = []
+
+    def once_then_eof(src_fd, dest_fd, count):
+        calls.append(count)
+        return real(src_fd, dest_fd, 100) if len(calls) == 1 else 0
+
+    copy = engine(monkeypatch, None, once_then_eof)
+
+    assert copy.copy_bytes(src, tmp_path / "dest") == len(DATA)
+    assert (tmp_path / "dest").read_bytes() == DATA
+    assert len(calls) == 2
+
+
+def test_unexpected_errors_are_raised(monkeypatch, src, tmp_path):
+    copy = engine(monkeypatch, FakeFcntl(errno.EIO))
+
+    with pytest.raises(OSError) as error:
+        copy.copy_bytes(src, tmp_path / "dest")
+    assert error.value.errno == errno.EIO
+    assert copy._reflink
+
+
+def test_copy_file_keeps_metadata(src, tmp_path):
+    os.utime(src, ns=(1_000_000_000, 1_000_000_000))
+
+    CopyEngine(1, "auto").copy_file(src, tmp_path / "dest")
+
+    st = (tmp_path / "dest").stat()
+    assert (tmp_path / "dest").read_bytes() == DATA
+    assert st.st_mode & 0o777 == 0o640
+    assert st.st_mtime_ns == 1_000_000_000
+    assert not list(tmp_path.glob(".ccm-tmp-*"))
+
+
+def test_copy_replaces_hard_linked_destination(src, tmp_path):
+    shared = tmp_path / "shared"
+    shared.write_bytes(b"store content")
+    dest = tmp_path / "dest"
+    os.link(shared, dest)
+
+    CopyEngine(1, "copy").copy_file(src, dest)
+
+    assert dest.read_bytes() == DATA
+    assert shared.read_bytes() == b"store content"
+
+
+def test_hardlink_strategy_links(src, tmp_path):
+    dest = tmp_path / "dest"
+    dest.write_bytes(b"old")
+    copy = CopyEngine(1, "hardlink")
+
+    assert copy.copy_file(src, dest) == len(DATA)
+    assert os.path.samestat(src.stat(), dest.stat())
+    assert copy.copy_file(src, dest) == len(DATA)  # Already linked
+    assert src.stat().st_nlink == 2
+
+
+@pytest.mark.parametrize("code", [errno.EXDEV, errno.EMLINK, errno.EPERM])
+def test_hardlink_strategy_falls_back_to_copy(monkeypatch, src, tmp_path, code):
+    def refuse(*args, **kwargs):
+        raise OSError(code, os.strerror(code))
+
+    monkeypatch.setattr(os, "link", refuse)
+
+    assert CopyEngine(1, "hardlink").copy_file(src, tmp_path / "dest") == len(DATA)
+    assert (tmp_path / "dest").read_bytes() == DATA
+    assert src.stat().st_nlink == 1
+
+
+def test_copy_tree_skips_internal_entries(tmp_path):
+    src = tmp_path / "src"
+    (src / "a" / "b").mkdir(parents=True)
+    (src / "a" / "b" / "file").write_text("x")
+    (src / "top").write_text("y")
+    (src / ".ccm-cache").mkdir()
+    (src / ".ccm-cache" / "hashes.json").write_text("{}")
+
+    stats = CopyEngine(4, "auto").copy_tree(src, tmp_path / "dest")
+
+    assert (stats.files, stats.bytes) == (2, 2)
+    assert (tmp_path / "dest" / "a" / "b" / "file").read_text() == "x"
+    assert not (tmp_path / "dest" / ".ccm-cache").exists()
@@ -0,0 +1,70 @@
+"""Tests for Merkle fingerprints and 'ccm drift'."""
+
+from click.testing import CliRunner
+
+from claude_config_manager.cli import main
+from claude_config_manager.core import ConfigManager
+from claude_config_manager.core.fingerprint import MerkleNode
+
+
+def test_diff_names_items_below_an_empty_node():
+    expected = MerkleNode.from_items({"servers/a": "1", "skills/s/SKILL.md": "2"})
+    actual = MerkleNode.from_items({}, dirs=("servers", "skills"))
+
+    assert expected.diff(actual) == [("servers/a", "missing"), ("skills/s", "missing")]
+    assert actual.diff(expected) == [("servers/a", "extra"), ("skills/s", "extra")]
+
+
+def test_diff_reports_changed_leaves():
+    expected = MerkleNode.from_items({"servers/a": "1", "servers/b": "2"})
+    actual = MerkleNode.from_items({"servers/a": "1", "servers/b": "3"})
+
+    assert expected.diff(actual) == [("servers/b", "changed")]
+    assert expected.diff(expected) == []
+
+
+def test_merkle_of_empty_projects_match(tmp_path):
+    one, two = tmp_path / "one", tmp_path / "two"
+    one.mkdir()
+    two.mkdir()
+
+    assert ConfigManager(one).merkle().diff(ConfigManager(two).merkle()) == []
+
+
+def test_drift_on_empty_project(source_project, tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+
+    result = CliRunner().invoke(
+        main, ["--source", str(source_project), "drift", "-p", "backend", str(target)]
+    )
+
+    assert result.exit_code == 1
+    lines = result.output.splitlines()
+    assert lines[1:-1] == [
+        "    - servers/filesystem",
+        "    - servers/time-mcp",
+        "    - skills/skill-creator",
+        "    - skills/testing-specialist",
+    ]
+    assert lines[-1] == "0 of 1 projects match 'backend'"
+
+
+def test_drift_reports_changed_and_extra_items(source_project, tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+    runner = CliRunner()
+    assert runner.invoke(
+        main, ["--source", str(source_project), "create", "-t", str(target), "--no-git"]
+    ).exit_code == 0
+    (target / ".claude" / "skills" / "skill-creator" / "SKILL.md").write_text("edited\n")
+    (target / ".claude" / "skills" / "rogue").mkdir()
+    (target / ".claude" / "skills" / "rogue" / "SKILL.md").write_text("# rogue\n")
+
+    result = runner.invoke(main, ["--source", str(source_project), "drift", str(target)])
+
+    assert result.exit_code == 1
+    assert result.output.splitlines()[1:-1] == [
+        "    + skills/rogue",
+        "    ~ skills/skill-creator/SKILL.md",
+    ]
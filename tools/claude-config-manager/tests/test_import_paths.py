@@ -0,0 +1,222 @@
+"""Tests for bundle, stream and delta imports, and their path guards."""
+
+import io
+import shutil
+
+import pytest
+
+from claude_config_manager.core import ConfigManager
+from claude_config_manager.core.bundle import BundleReader, BundleWriter
+from claude_config_manager.core.config_manager import BaseMismatchError
+from claude_config_manager.core.stream import StreamWriter
+
+SKILL_FILE = ".claude/skills/testing-specialist/SKILL.md"
+
+
+def read(root):
+    """All files of a project except the hash cache."""
+    return {
+        str(p.relative_to(root)): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file() and ".ccm-cache" not in p.parts
+    }
+
+
+@pytest.fixture
+def outside(tmp_path):
+    """A directory next to the project that no import may write to."""
+    path = tmp_path / "outside"
+    path.mkdir()
+    (path / "victim").write_text("keep me\n")
+    return path
+
+
+@pytest.fixture
+def target(tmp_path):
+    path = tmp_path / "target"
+    path.mkdir()
+    return path
+
+
+def rewrite_bundle(source, dest, extra=None, **manifest):
+    """Copy a bundle, adding files (rel -> local path) and overriding manifest keys."""
+    with BundleReader(source) as reader, BundleWriter(dest) as writer:
+        scratch = dest.with_suffix(".files")
+        for i, rel in enumerate(reader.files):
+            local = scratch / str(i)
+            reader.extract(rel, local)
+            writer.add_file(rel, local)
+        for rel, path in (extra or {}).items():
+            writer.add_file(rel, path)
+        writer.close({**reader.manifest, **manifest})
+    return dest
+
+
+def unsafe_paths(outside):
+    return [
+        "../outside/pwned",
+        ".claude/skills/testing-specialist/../../../../outside/pwned",
+        str(outside / "pwned"),
+        "./.claude/skills/testing-specialist/x",
+    ]
+
+
+def test_bundle_round_trip(source_project, target, tmp_path):
+    bundle = tmp_path / "config.ccmb"
+    ConfigManager(source_project).export_config(bundle)
+
+    stats = ConfigManager(target).import_config(bundle)
+
+    assert stats.files_copied == 4
+    assert (target / SKILL_FILE).read_bytes() == (source_project / SKILL_FILE).read_bytes()
+    assert set(ConfigManager(target).read_mcp_config().mcpServers) == {"filesystem", "time-mcp"}
+
+
+@pytest.mark.parametrize("index", range(4))
+def test_bundle_rejects_unsafe_paths(source_project, target, outside, tmp_path, index):
+    bundle = tmp_path / "config.ccmb"
+    ConfigManager(source_project).export_config(bundle)
+    rel = unsafe_paths(outside)[index]
+    evil = rewrite_bundle(bundle, tmp_path / "evil.ccmb", {rel: source_project / SKILL_FILE})
+
+    with pytest.raises(ValueError, match="Unsafe path|outside"):
+        ConfigManager(target).import_config(evil)
+
+    assert read(target) == {}
+    assert sorted(p.name for p in outside.iterdir()) == ["victim"]
+
+
+@pytest.mark.parametrize("name", ["..", "../../outside", "a/b", ""])
+def test_bundle_rejects_unsafe_skill_names(source_project, target, tmp_path, name):
+    bundle = tmp_path / "config.ccmb"
+    ConfigManager(source_project).export_config(bundle)
+    evil = rewrite_bundle(bundle, tmp_path / "evil.ccmb", skills=[name])
+
+    with pytest.raises(ValueError, match="Invalid skill name"):
+        ConfigManager(target).import_config(evil)
+    assert read(target) == {}
+
+
+def test_bundle_rejects_symlinked_parent(source_project, target, outside, tmp_path):
+    bundle = tmp_path / "config.ccmb"
+    ConfigManager(source_project).export_config(bundle)
+    (target / ".claude" / "skills").mkdir(parents=True)
+    (target / ".claude" / "skills" / "testing-specialist").symlink_to(outside)
+
+    with pytest.raises(ValueError, match="outside"):
+        ConfigManager(target).import_config(bundle)
+    assert sorted(p.name for p in outside.iterdir()) == ["victim"]
+
+
+def export_stream(project, extra=None):
+    buffer = io.BytesIO()
+    writer = StreamWriter(buffer)
+    exported = ConfigManager(project)._build_export(None, None, None)
+    writer.write_manifest(exported.model_dump(mode="json"))
+    for rel, path in ConfigManager(project)._export_files(exported.skills):
+        writer.add_file(rel, path)
+    for rel, path in (extra or {}).items():
+        writer.add_file(rel, path)
+    writer.close()
+    buffer.seek(0)
+    return buffer
+
+
+def test_stream_round_trip(source_project, target):
+    buffer = io.BytesIO()
+    ConfigManager(source_project).export_stream(buffer)
+    buffer.seek(0)
+
+    stats = ConfigManager(target).import_stream(buffer)
+
+    assert stats.files_copied == 4
+    assert (target / SKILL_FILE).read_bytes() == (source_project / SKILL_FILE).read_bytes()
+
+
+@pytest.mark.parametrize("index", range(4))
+def test_stream_rejects_unsafe_paths(source_project, target, outside, index):
+    rel = unsafe_paths(outside)[index]
+    stream = export_stream(source_project, {rel: source_project / SKILL_FILE})
+
+    with pytest.raises(ValueError, match="Unsafe path|outside"):
+        ConfigManager(target).import_stream(stream)
+    assert sorted(p.name for p in outside.iterdir()) == ["victim"]
+
+
+def test_stream_rejects_symlinked_parent(source_project, target, outside):
+    (target / ".claude" / "skills").mkdir(parents=True)
+    (target / ".claude" / "skills" / "testing-specialist").symlink_to(outside)
+
+    with pytest.raises(ValueError, match="outside"):
+        ConfigManager(target).import_stream(export_stream(source_project))
+    assert sorted(p.name for p in outside.iterdir()) == ["victim"]
+
+
+@pytest.fixture
+def delta_setup(source_project, target, tmp_path):
+    """A target imported from a base bundle, and a delta from that base."""
+    base = tmp_path / "base.ccmb"
+    ConfigManager(source_project).export_config(base)
+    ConfigManager(target).import_config(base)
+    (source_project / SKILL_FILE).write_text("# testing-specialist v2\n")
+    shutil.rmtree(source_project / ".claude" / "skills" / "skill-creator" / "scripts")
+    delta = tmp_path / "delta.ccmb"
+    ConfigManager(source_project).export_config(delta, base=base)
+    return delta
+
+
+def test_delta_round_trip(delta_setup, target):
+    stats = ConfigManager(target).import_config(delta_setup)
+
+    assert stats.files_copied == 1
+    assert stats.files_deleted == 1
+    assert (target / SKILL_FILE).read_text() == "# testing-specialist v2\n"
+    assert not (target / ".claude" / "skills" / "skill-creator" / "scripts").exists()
+
+
+def test_delta_against_wrong_base_changes_nothing(delta_setup, target):
+    (target / ".claude" / "skills" / "skill-creator" / "SKILL.md").write_text("local edit\n")
+    before = read(target)
+
+    with pytest.raises(BaseMismatchError) as error:
+        ConfigManager(target).import_config(delta_setup)
+
+    assert error.value.groups == [".claude/skills/skill-creator"]
+    assert read(target) == before
+
+
+@pytest.mark.parametrize("index", range(4))
+def test_delta_rejects_unsafe_writes(delta_setup, target, outside, tmp_path, index):
+    rel = unsafe_paths(outside)[index]
+    evil = rewrite_bundle(delta_setup, tmp_path / "evil.ccmb", {rel: outside / "victim"})
+    before = read(target)
+
+    with pytest.raises(ValueError, match="Unsafe path|outside"):
+        ConfigManager(target).import_config(evil)
+
+    assert read(target) == before
+    assert sorted(p.name for p in outside.iterdir()) == ["victim"]
+
+
+def test_delta_rejects_unsafe_removals(delta_setup, target, outside, tmp_path):
+    with BundleReader(delta_setup) as reader:
+        remove = reader.manifest["remove"]
+    for rel in ("../outside/victim", str(outside / "victim")):
+        evil = rewrite_bundle(delta_setup, tmp_path / "evil.ccmb", remove=[*remove, rel])
+        before = read(target)
+
+        with pytest.raises(ValueError, match="Unsafe path"):
+            ConfigManager(target).import_config(evil)
+
+        assert read(target) == before
+        assert (outside / "victim").exists()
+
+
+def test_delta_rejects_symlinked_parent(delta_setup, target, outside):
+    skill = target / ".claude" / "skills" / "testing-specialist"
+    shutil.rmtree(skill)
+    skill.symlink_to(outside)
+
+    with pytest.raises(ValueError, match="outside"):
+        ConfigManager(target).import_config(delta_setup)
+    assert sorted(p.name for p in outside.iterdir()) == ["victim"]
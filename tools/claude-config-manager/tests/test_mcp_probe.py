@@ -0,0 +1,122 @@
+"""Tests for probing MCP servers over stdio."""
+
+import time
+
+from claude_config_manager.core import ConfigManager, MCPConfig, Validator
+from claude_config_manager.core.mcp_probe import expand_env, probe
+from claude_config_manager.core.models import MCPServer
+
+
+def test_probe_handshake(fake_server):
+    [result] = probe({"fake": fake_server("ok")})
+
+    assert result.ok, result.error
+    assert result.tools == ["read", "list", "write"]  # both pages
+    assert result.server_info == "fake 1.0"
+    assert result.protocol_version
+    assert result.spawn_ms is not None
+    assert result.initialize_ms is not None
+    assert result.tools_ms is not None
+    assert result.total_ms >= result.initialize_ms
+
+
+def test_probe_expands_env(fake_server, monkeypatch):
+    monkeypatch.setenv("PROBE_TEST_NAME", "from-env")
+    monkeypatch.delenv("PROBE_TEST_UNSET", raising=False)
+
+    results = probe(
+        {
+            "set": fake_server(FAKE_MCP_NAME="${PROBE_TEST_NAME}"),
+            "default": fake_server(FAKE_MCP_NAME="${PROBE_TEST_UNSET:-fallback}"),
+        }
+    )
+
+    assert [r.server_info for r in results] == ["from-env 1.0", "fallback 1.0"]
+
+
+def test_expand_env():
+    environ = {"A": "1", "EMPTY": ""}
+    assert expand_env("${A}-${B:-x}-${EMPTY:-y}-${B}", environ) == "1-x-y-"
+
+
+def test_probe_crash_reports_status_and_stderr(fake_server):
+    [result] = probe({"crash": fake_server("crash")})
+
+    assert not result.ok
+    assert result.error == "initialize: exited with status 3"
+    assert result.stderr == ["fatal: missing API key"]
+    assert result.initialize_ms is None
+
+
+def test_probe_timeout(fake_server):
+    start = time.perf_counter()
+    [result] = probe({"hang": fake_server("hang")}, timeout=0.5)
+
+    assert not result.ok
+    assert result.error == "timed out after 0.5s waiting for initialize"
+    assert time.perf_counter() - start < 5
+
+
+def test_probe_protocol_error(fake_server):
+    [result] = probe({"broken": fake_server("protocol-error")})
+
+    assert not result.ok
+    assert result.initialize_ms is not None
+    assert result.error == "tools/list: tools unavailable (-32603)"
+
+
+def test_probe_rejects_non_json_output(fake_server):
+    [result] = probe({"noisy": fake_server("garbage")})
+
+    assert not result.ok
+    assert result.error.startswith("initialize: not JSON-RPC on stdout")
+
+
+def test_probe_missing_command():
+    [result] = probe({"missing": MCPServer(command="ccm-no-such-command")})
+
+    assert not result.ok
+    assert result.spawn_ms is None
+    assert result.error.startswith("cannot start ccm-no-such-command")
+
+
+def test_probe_skips_remote_servers():
+    [result] = probe({"remote": MCPServer(command="", type="http")})
+
+    assert result.skipped
+    assert not result.ok
+
+
+def test_probe_runs_servers_concurrently(fake_server):
+    servers = {f"slow-{i}": fake_server("slow", FAKE_MCP_DELAY="1") for i in range(4)}
+    reported = []
+
+    start = time.perf_counter()
+    results = probe(servers, concurrency=4, on_result=lambda r: reported.append(r.name))
+    elapsed = time.perf_counter() - start
+
+    assert all(r.ok for r in results)
+    assert [r.name for r in results] == list(servers)  # input order
+    assert sorted(reported) == sorted(servers)
+    assert elapsed < 4 * 1.0  # faster than one at a time
+
+
+def test_probe_honours_concurrency_limit(fake_server):
+    servers = {f"slow-{i}": fake_server("slow", FAKE_MCP_DELAY="0.5") for i in range(4)}
+
+    start = time.perf_counter()
+    results = probe(servers, concurrency=2)
+
+    assert all(r.ok for r in results)
+    assert time.perf_counter() - start >= 2 * 0.5  # two batches
+
+
+def test_validator_connectivity(tmp_path, fake_server):
+    MCPConfig(
+        mcpServers={"ok": fake_server("ok"), "crash": fake_server("crash")}
+    ).to_file(tmp_path / ".mcp.json")
+    validator = Validator(ConfigManager(tmp_path))
+
+    assert validator.test_mcp_connectivity("ok")
+    assert not validator.test_mcp_connectivity("crash")
+    assert not validator.test_mcp_connectivity("unknown")
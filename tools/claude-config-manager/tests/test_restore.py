@@ -0,0 +1,137 @@
+"""Tests for journaled, crash-safe restores."""
+
+import os
+
+import pytest
+
+from claude_config_manager.core import restore
+from claude_config_manager.core.copier import CopyEngine
+from claude_config_manager.core.restore import STAGING_DIR, RestoreSource, recover, restore_files
+
+
+class Crash(BaseException):
+    """Stands in for the process dying."""
+
+
+def write(root, files):
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def read(root):
+    return {
+        str(p.relative_to(root)): p.read_text()
+        for p in sorted(root.rglob("*"))
+        if p.is_file() and STAGING_DIR not in p.parts
+    }
+
+
+def sources_of(root):
+    sources = {}
+    for path in root.rglob("*"):
+        if path.is_file():
+            st = path.stat()
+            sources[str(path.relative_to(root))] = RestoreSource(
+                path=path, size=st.st_size, mode=st.st_mode & 0o7777, mtime_ns=st.st_mtime_ns
+            )
+    return sources
+
+
+BACKUP = {
+    ".mcp.json": '{"mcpServers": {}}',
+    ".claude/skills/a/SKILL.md": "# a v1\n",
+    ".claude/skills/b/SKILL.md": "# b\n",
+    ".claude/hooks/pre.sh": "echo pre\n",
+}
+LIVE = {
+    ".mcp.json": '{"mcpServers": {"x": {}}}',
+    ".claude/skills/a/SKILL.md": "# a v2 (edited)\n",
+    ".claude/skills/c/SKILL.md": "# c\n",
+    ".claude/hooks/pre.sh": "echo pre\n",
+}
+
+
+@pytest.fixture
+def setup(tmp_path):
+    backup = tmp_path / "backup"
+    project = tmp_path / "project"
+    write(backup, BACKUP)
+    write(project, LIVE)
+    return project, sources_of(backup)
+
+
+def test_restore(setup):
+    project, sources = setup
+
+    stats = restore_files(project, sources, [".claude/"], CopyEngine(2))
+
+    assert read(project) == BACKUP
+    assert (stats.files_copied, stats.files_deleted, stats.files_unchanged) == (3, 1, 1)
+    assert not (project / STAGING_DIR).exists()
+
+
+def test_crash_after_journal_is_rolled_forward(setup, monkeypatch):
+    project, sources = setup
+    real_recover = restore.recover
+    calls = []
+
+    def crash_on_commit(path):
+        calls.append(path)
+        if len(calls) == 2:  # The roll-forward right after the journal is written
+            raise Crash
+        return real_recover(path)
+
+    monkeypatch.setattr(restore, "recover", crash_on_commit)
+    with pytest.raises(Crash):
+        restore_files(project, sources, [".claude/"], CopyEngine(2))
+    assert read(project) == LIVE  # Committed, but nothing swapped in yet
+    assert (project / STAGING_DIR / restore.JOURNAL_NAME).exists()
+
+    assert recover(project) is True
+    assert read(project) == BACKUP
+    assert not (project / STAGING_DIR).exists()
+
+
+def test_crash_during_roll_forward_is_completed(setup, monkeypatch):
+    project, sources = setup
+    real_replace = os.replace
+    moved = []
+
+    def crash_after_one(src, dst):
+        if STAGING_DIR in str(src) and not str(src).endswith(".tmp"):
+            if moved:
+                raise Crash
+            moved.append(dst)
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash_after_one)
+    with pytest.raises(Crash):
+        restore_files(project, sources, [".claude/"], CopyEngine(2))
+    monkeypatch.setattr(os, "replace", real_replace)
+    assert len(moved) == 1
+    assert read(project) != BACKUP  # Half-restored on disk
+
+    assert recover(project) is True
+    assert read(project) == BACKUP
+    assert recover(project) is False
+
+
+def test_crash_before_journal_leaves_project_untouched(setup, monkeypatch):
+    project, sources = setup
+
+    def crash(*args):
+        raise Crash
+
+    monkeypatch.setattr(restore, "_write_journal", crash)
+    with pytest.raises(Crash):
+        restore_files(project, sources, [".claude/"], CopyEngine(2))
+    assert read(project) == LIVE
+
+    # A crash that left staged files but no journal is discarded
+    (project / STAGING_DIR).mkdir()
+    (project / STAGING_DIR / "000000").write_text("staged")
+    assert recover(project) is False
+    assert read(project) == LIVE
+    assert not (project / STAGING_DIR).exists()
@@ -0,0 +1,111 @@
+"""Tests for the content-addressed skill store."""
+
+import multiprocessing
+import sys
+
+import pytest
+
+from claude_config_manager.core import skill_store
+from claude_config_manager.core.manifest import DirManifest
+from claude_config_manager.core.skill_store import SkillStore
+
+
+def make_skill(path, text="# skill\n"):
+    (path / "scripts").mkdir(parents=True)
+    (path / "SKILL.md").write_text(text)
+    (path / "scripts" / "run.sh").write_text("echo run\n")
+    (path / "scripts" / "run.sh").chmod(0o755)
+    return path
+
+
+def test_add_tree_deduplicates(tmp_path):
+    store = SkillStore(tmp_path / "store")
+    one = make_skill(tmp_path / "one")
+    two = make_skill(tmp_path / "two")
+
+    tree = store.add_tree(DirManifest(one))
+
+    assert store.add_tree(DirManifest(two)) == tree
+    assert store.info().trees == 1
+    assert store.info().objects == 2
+    assert store.verify().ok
+
+
+def test_add_tree_replaces_interrupted_add(tmp_path):
+    store = SkillStore(tmp_path / "store")
+    manifest = DirManifest(make_skill(tmp_path / "skill"))
+    leftover = store.tree_path(store.tree_id(manifest))
+    leftover.mkdir(parents=True)
+    (leftover / "partial").write_text("")
+
+    tree = store.add_tree(manifest)
+
+    assert sorted(p.name for p in store.tree_path(tree).iterdir()) == ["SKILL.md", "scripts"]
+    assert store.verify().ok
+
+
+def test_gc_keeps_unregistered_trees_during_grace(tmp_path, monkeypatch):
+    store = SkillStore(tmp_path / "store")
+    tree = store.add_tree(DirManifest(make_skill(tmp_path / "skill")))
+
+    result = store.gc()
+    assert result.removed_trees == []
+    assert store.has_tree(tree)
+
+    monkeypatch.setattr(skill_store, "TREE_GRACE_SECONDS", -1)
+    result = store.gc()
+    assert result.removed_trees == [tree]
+    assert result.removed_objects == 2
+    assert store.info().objects == 0
+
+
+def test_gc_keeps_linked_trees(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_store, "TREE_GRACE_SECONDS", -1)
+    store = SkillStore(tmp_path / "store")
+    project = tmp_path / "project"
+    tree = store.add_tree(DirManifest(make_skill(tmp_path / "skill")))
+    store.link(tree, project / ".claude" / "skills" / "skill")
+    store.register(project, {"skill": tree})
+
+    assert store.gc().removed_trees == []
+    assert store.has_tree(tree)
+
+
+def _add_and_link(root, source, project, rounds):
+    store = SkillStore(root)
+    for i in range(rounds):
+        (source / "SKILL.md").write_text(f"# version {i % 5}\n")
+        tree = store.add_tree(DirManifest(source))
+        store.link(tree, project / ".claude" / "skills" / "skill")
+        store.register(project, {"skill": tree})
+
+
+def _collect(root, rounds):
+    store = SkillStore(root)
+    for _ in range(rounds):
+        store.gc()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork and flock")
+def test_concurrent_processes_share_store(tmp_path):
+    root = tmp_path / "store"
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(
+            target=_add_and_link,
+            args=(root, make_skill(tmp_path / f"src{i}"), tmp_path / f"p{i}", 30),
+        )
+        for i in range(4)
+    ]
+    workers.append(context.Process(target=_collect, args=(root, 60)))
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+
+    assert [p.exitcode for p in workers] == [0] * len(workers)
+    store = SkillStore(root)
+    assert store.verify().ok, store.verify().problems
+    for i in range(4):
+        skill = tmp_path / f"p{i}" / ".claude" / "skills" / "skill"
+        assert (skill / "SKILL.md").read_text() == "# version 4\n"